@@ -13,16 +13,64 @@ class Settings(BaseSettings):
     base_url: str = "https://jsonplaceholder.typicode.com"
     cat_facts_base_url: str = "https://catfact.ninja"
     api_timeout: int = 30
+    test_deadline: float = 0  # seconds of HTTP time per test; 0 disables
+    http2_enabled: bool = False  # multiplex requests over HTTP/2; needs httpx[http2]
+    connection_pool_size: int = 10  # keep-alive connections per host; match the threads sharing a client
+    compression_enabled: bool = True
+    compression_encodings: str = "zstd, br, gzip, deflate"  # preference order; br/zstd only if installed
     max_retries: int = 3
-    retry_delay: int = 1
+    retry_delay: float = 1
+    retry_max_delay: float = 10.0
+    retry_after_max: float = 30.0
+    retry_budget_ratio: float = 0.1
+    retry_budget_burst: int = 10
+    idempotency_keys_enabled: bool = True
+    idempotency_header: str = "Idempotency-Key"
+    
+    # Circuit Breaker
+    circuit_breaker_enabled: bool = True
+    circuit_failure_threshold: int = 5
+    circuit_recovery_timeout: float = 30.0
+    circuit_half_open_max_calls: int = 1
+    circuit_open_action: str = "fail"  # "fail" or "skip" tests hitting an open circuit; skips still fail the run
+    
+    # Request Hedging
+    hedging_enabled: bool = False
+    hedge_percentile: float = 95
+    hedge_min_delay_ms: float = 50
+    hedge_min_samples: int = 20
+    hedge_max_rate: float = 0.05
+    
+    # Client-side Rate Limiting (shared by all xdist workers of a run)
+    rate_limit_enabled: bool = False
+    rate_limit_per_second: float = 10.0
+    rate_limit_burst: int = 10
+    rate_limit_min_factor: float = 0.1
+    rate_limit_recovery_seconds: float = 30.0
+    rate_limit_state_dir: str = ""
     
     # Test Data
     test_user_id: int = 1
     test_post_id: int = 1
     test_comment_id: int = 1
     
+    # Test Data Cleanup
+    # Off by default so runs against the public API never send it DELETEs; enable for your own backend
+    cleanup_enabled: bool = False  # delete entities created through the services when each test ends
+    cleanup_concurrency: int = 8
+    cleanup_budget: float = 30.0  # seconds for one test's (or the session's) deletes
+    
+    # Response Shape Baselines
+    shape_baselines_file: str = "shape_baselines.json"
+    shape_update_baselines: bool = False  # re-record each endpoint's accepted shapes from this run
+    
+    # Dataset Diffs
+    dataset_index_dir: str = ".dataset_index"  # per-record hash indexes kept between runs
+    
     # Reporting
     allure_results_dir: str = "allure-results"
+    allure_attachment_dedup: bool = True  # write each distinct attachment once, referenced by content hash
+    allure_compress_min_bytes: int = 0  # gzip attachments at least this large; 0 disables
     log_level: str = "INFO"
     
     # Headers
@@ -3,39 +3,132 @@ API client for making HTTP requests with proper error handling and logging
 """
 import json
 import time
+import uuid
 import logging
+import threading
+import weakref
 from typing import Dict, Any, Optional, Union
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from requests.adapters import BaseAdapter
+from urllib.parse import urlsplit
 from config.settings import settings
+from core.metrics import metrics
+from core.retry_policy import RetryPolicy, retry_budget, parse_retry_after, NON_IDEMPOTENT_METHODS
+from core.circuit_breaker import circuit_breaker
+from core.hedging import HedgePolicy, Hedger
+from core.rate_limiter import rate_limiter
+from core.deadline import DeadlineExceeded, clamp_timeout, remaining
+from core.http2_adapter import HTTP2Adapter
+from core.compression import AccountingAdapter, accept_encoding
+from core.body import preview
+
+
+# Transport adapters of every live client, for resource sampling during soak runs
+_adapters: "weakref.WeakSet[BaseAdapter]" = weakref.WeakSet()
+_adapters_lock = threading.Lock()
+
+
+def connection_pool_stats() -> Dict[str, int]:
+    """Pools and keep-alive connections held by live clients' HTTP/1.1 adapters"""
+    stats = {"pools": 0, "idle_connections": 0, "connections_created": 0}
+    with _adapters_lock:
+        adapters = list(_adapters)
+    for adapter in adapters:
+        pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+        if pools is None:
+            continue
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["pools"] += 1
+            stats["connections_created"] += pool.num_connections
+            idle = pool.pool
+            if idle is not None:
+                stats["idle_connections"] += sum(connection is not None for connection in list(idle.queue))
+    return stats
 
 
 class APIClient:
-    """HTTP client with retry logic and proper error handling"""
+    """HTTP client with retry logic and proper error handling
+    
+    With ``thread_safe=True`` every thread gets its own session, so the client can be
+    shared by a thread pool; all sessions use the client's one connection pool. Cookies
+    are then per thread, and a thread's session goes away with the thread.
+    """
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.base_url = settings.base_url
+    def __init__(self, base_url: Optional[str] = None, thread_safe: bool = False,
+                 pool_size: Optional[int] = None):
+        self.base_url = base_url or settings.base_url
         self.timeout = settings.api_timeout
+        self.thread_safe = thread_safe
+        self.pool_size = pool_size or settings.connection_pool_size
+        self._local = threading.local()
+        # Held weakly: a worker thread's session lives in its thread-local storage and is
+        # dropped (not closed, as that would close the shared adapter) when the thread ends
+        self._sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
+        self._sessions_lock = threading.Lock()
         self._setup_session()
         self._setup_logging()
     
     def _setup_session(self):
-        """Configure session with retry strategy"""
-        retry_strategy = Retry(
-            total=settings.max_retries,
-            backoff_factor=settings.retry_delay,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE", "POST"]
-        )
+        """Configure session and retry policy"""
+        # Retries are driven by _make_request so they can be budgeted and measured
+        self.retry_policy = RetryPolicy.from_settings()
+        
+        # One adapter, and so one connection pool, behind every session of this client
+        adapter = self._transport_adapter(self.pool_size)
+        self._mounts = {"http://": adapter, "https://": adapter}
+        with _adapters_lock:
+            _adapters.add(adapter)
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        # Set default headers, negotiating every compression we can decode
+        self._headers = dict(settings.default_headers, **{"Accept-Encoding": accept_encoding()})
+        self._session = self._local.session = self._new_session()
         
-        # Set default headers
-        self.session.headers.update(settings.default_headers)
+        # Hedged GETs race on a second session so they never share the primary's connection
+        self.hedger = None
+        if settings.hedging_enabled:
+            hedge_session = requests.Session()
+            hedge_adapter = self._transport_adapter(self.pool_size)
+            hedge_session.mount("http://", hedge_adapter)
+            hedge_session.mount("https://", hedge_adapter)
+            hedge_session.headers.update(self._headers)
+            self.hedger = Hedger(HedgePolicy.from_settings(), hedge_session)
+    
+    def _new_session(self) -> requests.Session:
+        """Session with this client's adapters and default headers"""
+        session = requests.Session()
+        with self._sessions_lock:
+            for prefix, adapter in self._mounts.items():
+                session.mount(prefix, adapter)
+            session.headers.update(self._headers)
+            self._sessions.add(session)
+        return session
+    
+    @property
+    def session(self) -> requests.Session:
+        """The client's session, or in thread-safe mode the calling thread's"""
+        if not self.thread_safe:
+            return self._session
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+    
+    def mount(self, prefix: str, adapter: BaseAdapter):
+        """Mount a transport adapter on every session of this client, including later ones"""
+        with self._sessions_lock:
+            self._mounts[prefix] = adapter
+            for session in list(self._sessions):
+                session.mount(prefix, adapter)
+    
+    @staticmethod
+    def _transport_adapter(pool_size: int):
+        """HTTP/1.1 keep-alive pool, or one multiplexed HTTP/2 connection per host"""
+        if settings.http2_enabled:
+            return HTTP2Adapter()
+        return AccountingAdapter(pool_maxsize=pool_size, max_retries=0)
     
     def _setup_logging(self):
         """Setup logging for API requests"""
@@ -53,36 +146,173 @@ class APIClient:
     def _log_response(self, response: requests.Response):
         """Log API response details"""
         self.logger.info(f"Response: {response.status_code} {response.reason}")
-        try:
-            if response.headers.get('content-type', '').startswith('application/json'):
-                self.logger.debug(f"Response body: {json.dumps(response.json(), indent=2)}")
-        except (ValueError, json.JSONDecodeError):
-            self.logger.debug(f"Response body: {response.text[:500]}...")
+        # Only bodies already read are logged, and only their first bytes are decoded
+        if self.logger.isEnabledFor(logging.DEBUG) and response._content_consumed:
+            self.logger.debug(f"Response body: {preview(response.content)}")
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
-        """Make HTTP request with logging and error handling"""
+        """Make HTTP request with logging, adaptive retries and error handling"""
         url = f"{self.base_url}{endpoint}"
         
         # Add timeout if not specified
         if 'timeout' not in kwargs:
             kwargs['timeout'] = self.timeout
         
+        timeout = kwargs['timeout']
+        idempotency_key = self._apply_idempotency_key(method, kwargs)
         self._log_request(method, url, **kwargs)
         
+        host = urlsplit(url).netloc
+        budget = retry_budget(host)
+        breaker = circuit_breaker(host) if settings.circuit_breaker_enabled else None
+        limiter = rate_limiter(host) if settings.rate_limit_enabled else None
+        budget.deposit()
+        metrics.increment("requests")
+        attempt = 0
+        retry_started = None
         try:
-            response = self.session.request(method, url, **kwargs)
-            self._log_response(response)
-            return response
+            while True:
+                if breaker is not None:
+                    self._check_circuit(breaker)
+                try:
+                    if limiter is not None:
+                        metrics.increment("rate_limit_wait_seconds", limiter.acquire())
+                    kwargs['timeout'], shortened = self._deadline_timeout(timeout)
+                except BaseException:
+                    self._release_circuit(breaker)
+                    raise
+                metrics.increment("attempts")
+                try:
+                    response = self._send(method, url, **kwargs)
+                except requests.exceptions.RequestException as e:
+                    # A timeout we shortened to meet the deadline says nothing about the backend
+                    if shortened and isinstance(e, requests.exceptions.Timeout):
+                        self._release_circuit(breaker)
+                    else:
+                        self._record_outcome(breaker, failed=True)
+                    delay = self._retry_delay(method, attempt, idempotency_key, error=e)
+                    if delay is None or not self._fits_deadline(delay) or not self._spend_retry(budget):
+                        self.logger.error(f"Request failed: {e}")
+                        raise
+                    reason = str(e)
+                except BaseException:
+                    self._release_circuit(breaker)
+                    raise
+                else:
+                    self._record_outcome(breaker, failed=response.status_code >= 500)
+                    if limiter is not None and response.status_code == 429:
+                        limiter.penalize(parse_retry_after(response.headers.get("Retry-After")))
+                        metrics.increment("rate_limited")
+                    delay = self._retry_delay(method, attempt, idempotency_key, response=response)
+                    if delay is None or not self._fits_deadline(delay) or not self._spend_retry(budget):
+                        self._log_response(response)
+                        return response
+                    reason = f"{response.status_code} {response.reason}"
+                    response.close()
+                
+                if retry_started is None:
+                    retry_started = time.monotonic()
+                attempt += 1
+                self.logger.warning(f"Retrying {method.upper()} {url} in {delay:.2f}s "
+                                    f"(attempt {attempt}/{self.retry_policy.max_retries}): {reason}")
+                metrics.increment("retries")
+                metrics.increment(f"retries.{method.upper()}")
+                metrics.increment("retry_wait_seconds", delay)
+                time.sleep(delay)
+        finally:
+            if retry_started is not None:
+                metrics.increment("retry_seconds", time.monotonic() - retry_started)
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send one attempt, hedging idempotent GETs when enabled"""
+        if self.hedger is not None and method.upper() == "GET" and not kwargs.get('stream'):
+            return self.hedger.request(self.session, method, url, **kwargs)
+        return self.session.request(method, url, **kwargs)
+    
+    def _check_circuit(self, breaker):
+        """Fail fast while the host's circuit is open"""
+        try:
+            breaker.before_request()
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"Request failed: {e}")
+            self.logger.error(str(e))
+            metrics.increment("circuit_rejections")
             raise
     
+    @staticmethod
+    def _release_circuit(breaker):
+        """Free the breaker's probe slot for an attempt abandoned without an outcome"""
+        if breaker is not None:
+            breaker.release()
+    
+    def _record_outcome(self, breaker, failed: bool):
+        """Feed an attempt's outcome to the host's circuit breaker"""
+        if breaker is None:
+            return
+        if not failed:
+            breaker.record_success()
+        elif breaker.record_failure():
+            self.logger.error(f"Circuit opened for {breaker.host} after repeated failures")
+            metrics.increment("circuit_opened")
+    
+    def _retry_delay(self, method: str, attempt: int, idempotency_key: Optional[str],
+                     response: Optional[requests.Response] = None,
+                     error: Optional[Exception] = None) -> Optional[float]:
+        """Ask the retry policy for a delay, counting writes it refused to replay"""
+        delay = self.retry_policy.delay(method, attempt, response=response, error=error,
+                                        idempotency_key=idempotency_key)
+        if delay is None and not self.retry_policy.is_replay_safe(method, idempotency_key, error):
+            failed = error is not None or response.status_code in self.retry_policy.retry_statuses
+            if failed and attempt < self.retry_policy.max_retries:
+                self.logger.warning(f"Not replaying {method.upper()} without an idempotency key")
+                metrics.increment("retries_unsafe_skipped")
+        return delay
+    
+    def _apply_idempotency_key(self, method: str, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Attach one idempotency key per logical write, reused by all of its retries"""
+        key = kwargs.pop('idempotency_key', None)
+        if method.upper() not in NON_IDEMPOTENT_METHODS:
+            return None
+        headers = dict(kwargs.get('headers') or {})
+        key = key or headers.get(settings.idempotency_header)
+        if key is None and settings.idempotency_keys_enabled:
+            key = str(uuid.uuid4())
+        if key:
+            headers[settings.idempotency_header] = key
+            kwargs['headers'] = headers
+        return key
+    
+    def _deadline_timeout(self, timeout):
+        """Shrink the attempt's timeouts to the time left before the current deadline"""
+        try:
+            return clamp_timeout(timeout)
+        except DeadlineExceeded as e:
+            self.logger.error(str(e))
+            metrics.increment("deadline_exceeded")
+            raise
+    
+    def _fits_deadline(self, delay: float) -> bool:
+        """Whether a retry after delay still leaves time before the current deadline"""
+        left = remaining()
+        if left is None or delay < left:
+            return True
+        self.logger.warning(f"Deadline {max(left, 0):.2f}s away, cancelling retry")
+        metrics.increment("retries_cancelled_by_deadline")
+        return False
+    
+    def _spend_retry(self, budget) -> bool:
+        """Withdraw a retry from the host budget, recording when it is exhausted"""
+        if budget.try_withdraw():
+            return True
+        self.logger.warning("Retry budget exhausted, not retrying")
+        metrics.increment("retries_denied_by_budget")
+        return False
+    
     def get(self, endpoint: str, params: Optional[Dict] = None, **kwargs) -> requests.Response:
         """Make GET request"""
         return self._make_request('GET', endpoint, params=params, **kwargs)
     
     def post(self, endpoint: str, json_data: Optional[Dict] = None, data: Optional[Dict] = None, **kwargs) -> requests.Response:
-        """Make POST request"""
+        """Make POST request; pass idempotency_key to reuse a key across logical retries"""
         return self._make_request('POST', endpoint, json=json_data, data=data, **kwargs)
     
     def put(self, endpoint: str, json_data: Optional[Dict] = None, data: Optional[Dict] = None, **kwargs) -> requests.Response:
@@ -90,7 +320,7 @@ class APIClient:
         return self._make_request('PUT', endpoint, json=json_data, data=data, **kwargs)
     
     def patch(self, endpoint: str, json_data: Optional[Dict] = None, data: Optional[Dict] = None, **kwargs) -> requests.Response:
-        """Make PATCH request"""
+        """Make PATCH request; pass idempotency_key to reuse a key across logical retries"""
         return self._make_request('PATCH', endpoint, json=json_data, data=data, **kwargs)
     
     def delete(self, endpoint: str, **kwargs) -> requests.Response:
@@ -106,5 +336,11 @@ class APIClient:
         return self._make_request('OPTIONS', endpoint, **kwargs)
     
     def close(self):
-        """Close the session"""
-        self.session.close()
+        """Close every session"""
+        with self._sessions_lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+        if self.hedger is not None:
+            self.hedger.close()
@@ -0,0 +1,167 @@
+"""
+Content-addressed Allure attachments: each distinct payload is written to the results directory once
+"""
+import os
+import gzip
+import inspect
+import logging
+import shutil
+import hashlib
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+from allure_commons.reporter import AllureReporter
+from allure_commons.types import AttachmentType
+from core.body import digest
+
+
+GZIP_MIME_TYPE = "application/gzip"
+# AllureReporter._attach is private: it records the reference and names the file. The public
+# allure.attach always names its own file, so it cannot point at a stored one. allure-commons
+# is pinned in requirements.txt, and install() falls back to Allure's own writer on a mismatch.
+REPORTER_ATTACH_PARAMETERS = ("self", "uuid", "name", "attachment_type", "extension", "parent_uuid")
+
+
+def reporter_supported() -> bool:
+    """Whether the installed allure-commons has the AllureReporter._attach this module calls"""
+    attach = getattr(AllureReporter, "_attach", None)
+    return attach is not None and tuple(inspect.signature(attach).parameters) == REPORTER_ATTACH_PARAMETERS
+
+
+class AttachmentStore:
+    """Attachment files named by the hash of their content
+
+    Identical payloads map to the same file, so later attachments only add a reference to
+    the test result. Files already present, e.g. written by another xdist worker, are not
+    rewritten. Payloads of at least ``compress_min_bytes`` are gzipped when it is set;
+    Allure then offers them as downloads instead of rendering them inline.
+    """
+
+    def __init__(self, directory: str, compress_min_bytes: int = 0):
+        self.directory = directory
+        self.compress_min_bytes = compress_min_bytes
+        self._lock = threading.Lock()
+        self._written: set = set()
+        self.counts = {"attachments": 0, "stored": 0, "bytes_attached": 0, "bytes_written": 0}
+
+    def _compressed(self, size: int) -> bool:
+        return 0 < self.compress_min_bytes <= size
+
+    @staticmethod
+    def file_name(key: str, extension: str) -> str:
+        return f"{key}-attachment.{extension}"
+
+    def _record(self, name: str, size: int) -> bool:
+        """Count an attachment and claim its file; False when it is already stored"""
+        with self._lock:
+            self.counts["attachments"] += 1
+            self.counts["bytes_attached"] += size
+            if name in self._written or os.path.exists(os.path.join(self.directory, name)):
+                self._written.add(name)
+                return False
+            self._written.add(name)
+            return True
+
+    def _publish(self, name: str, write):
+        """Write through a temporary file and rename, so no reader sees a partial attachment"""
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix=".attachment-")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                write(f)
+            os.replace(temporary, os.path.join(self.directory, name))
+        except BaseException:
+            os.unlink(temporary)
+            with self._lock:
+                self._written.discard(name)
+            raise
+        size = os.path.getsize(os.path.join(self.directory, name))
+        with self._lock:
+            self.counts["stored"] += 1
+            self.counts["bytes_written"] += size
+
+    def put(self, body: bytes, extension: str) -> Tuple[str, bool]:
+        """Store a payload once; returns its file name and whether it was gzipped"""
+        compressed = self._compressed(len(body))
+        name = self.file_name(digest(body), extension + (".gz" if compressed else ""))
+        if self._record(name, len(body)):
+            self._publish(name, lambda f: f.write(gzip.compress(body, mtime=0) if compressed else body))
+        return name, compressed
+
+    def put_file(self, source: str, extension: str) -> Tuple[str, bool]:
+        """Store a file's content once, hashing and copying it in chunks"""
+        hasher = hashlib.sha256()
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+        size = os.path.getsize(source)
+        compressed = self._compressed(size)
+        name = self.file_name(hasher.hexdigest(), extension + (".gz" if compressed else ""))
+        if self._record(name, size):
+            def write(f):
+                with open(source, "rb") as original:
+                    if compressed:
+                        with gzip.GzipFile(fileobj=f, mode="wb", mtime=0) as packed:
+                            shutil.copyfileobj(original, packed)
+                    else:
+                        shutil.copyfileobj(original, f)
+            self._publish(name, write)
+        return name, compressed
+
+    def stats(self) -> Dict[str, Any]:
+        """Attachment counts and bytes, with what deduplication and compression saved"""
+        with self._lock:
+            counts = dict(self.counts)
+        counts["bytes_saved"] = counts["bytes_attached"] - counts["bytes_written"]
+        return counts
+
+
+class ContentAddressedReporter(AllureReporter):
+    """AllureReporter whose attachments go through an AttachmentStore instead of the file logger"""
+
+    def __init__(self, store: AttachmentStore):
+        super().__init__()
+        self.store = store
+
+    @staticmethod
+    def _type(attachment_type: Any, extension: Optional[str]) -> Tuple[Optional[str], str]:
+        if isinstance(attachment_type, AttachmentType):
+            return attachment_type.mime_type, attachment_type.extension
+        return attachment_type, extension or "attach"
+
+    def _reference(self, file_name: str, compressed: bool, name: Optional[str], mime_type: Optional[str],
+                   parent_uuid: Optional[str]):
+        # Allure's own naming is "<uuid>-attachment.<ext>"; the content hash stands in for the uuid
+        prefix, extension = file_name.split("-attachment.", 1)
+        if compressed:
+            name, mime_type = f"{name or 'attachment'} (gzip)", GZIP_MIME_TYPE
+        self._attach(prefix, name=name, attachment_type=mime_type, extension=extension, parent_uuid=parent_uuid)
+
+    def attach_data(self, uuid, body, name=None, attachment_type=None, extension=None, parent_uuid=None):
+        mime_type, extension = self._type(attachment_type, extension)
+        data = body.encode("utf-8") if isinstance(body, str) else bytes(body)
+        file_name, compressed = self.store.put(data, extension)
+        self._reference(file_name, compressed, name, mime_type, parent_uuid)
+
+    def attach_file(self, uuid, source, name=None, attachment_type=None, extension=None, parent_uuid=None):
+        mime_type, extension = self._type(attachment_type, extension)
+        file_name, compressed = self.store.put_file(source, extension)
+        self._reference(file_name, compressed, name, mime_type, parent_uuid)
+
+
+def install(config, compress_min_bytes: int = 0) -> Optional[AttachmentStore]:
+    """Route the allure-pytest listener's attachments through a store in its results directory
+
+    Call from ``pytest_configure`` after allure-pytest has configured, before any test
+    runs. Returns None when Allure results are not being written, or when the installed
+    allure-commons is not one this module supports.
+    """
+    listener = config.pluginmanager.get_plugin("allure_listener")
+    directory = getattr(config.option, "allure_report_dir", None)
+    if listener is None or not directory:
+        return None
+    if not reporter_supported():
+        logging.getLogger(__name__).warning("Unsupported allure-commons version, attachments are not deduplicated")
+        return None
+    store = AttachmentStore(os.path.abspath(directory), compress_min_bytes=compress_min_bytes)
+    listener.allure_logger = ContentAddressedReporter(store)
+    return store
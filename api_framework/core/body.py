@@ -0,0 +1,104 @@
+"""
+Response bodies read into one preallocated buffer and parsed, hashed and previewed in place
+"""
+import json
+import codecs
+import hashlib
+from typing import Any, Iterable, Optional, Union
+import requests
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Most bytes requested per read, and the initial buffer size when the length is unknown.
+# Transports such as urllib3 implement readinto as read-then-copy, so this bounds their temporaries.
+CHUNK_SIZE = 256 * 1024
+
+
+def content_length(headers) -> Optional[int]:
+    """Declared body length, or None when absent or invalid"""
+    try:
+        length = int(headers.get("Content-Length", ""))
+    except ValueError:
+        return None
+    return length if length >= 0 else None
+
+
+def read_into(raw, length: Optional[int] = None) -> bytearray:
+    """Read a file-like body with ``readinto`` into a single buffer sized from ``length``"""
+    buffer = bytearray(length if length is not None else CHUNK_SIZE)
+    filled = 0
+    while True:
+        if filled == len(buffer):
+            if length is not None:
+                break  # the transport enforces Content-Length
+            buffer.extend(bytes(len(buffer)))
+        with memoryview(buffer) as view, view[filled:filled + CHUNK_SIZE] as window:
+            count = raw.readinto(window)
+        if not count:
+            break
+        filled += count
+    del buffer[filled:]
+    return buffer
+
+
+def join_into(chunks: Iterable[bytes], length: Optional[int] = None) -> bytearray:
+    """Copy body chunks into a single buffer sized from ``length``, without joining intermediates"""
+    buffer = bytearray(length if length is not None else CHUNK_SIZE)
+    filled = 0
+    for chunk in chunks:
+        while filled + len(chunk) > len(buffer):
+            buffer.extend(bytes(max(len(buffer), len(chunk))))
+        buffer[filled:filled + len(chunk)] = chunk
+        filled += len(chunk)
+    del buffer[filled:]
+    return buffer
+
+
+def loads(buffer: Buffer) -> Any:
+    """Parse JSON straight from a bytes-like buffer
+
+    With orjson installed no ``str`` copy of the body is made (integers beyond 64 bits
+    come back as floats); the standard library decodes the buffer once internally.
+    Both raise ``json.JSONDecodeError`` on invalid input.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(buffer)
+        except orjson.JSONDecodeError:
+            pass  # orjson rejects escaped lone surrogates ("\ud800"), which are valid JSON
+    return json.loads(bytes(buffer) if isinstance(buffer, memoryview) else buffer)
+
+
+def json_body(response: requests.Response) -> Any:
+    """``response.json()`` without building ``response.text`` first
+
+    Bodies in a charset other than UTF-8 (per Content-Type) go through ``response.json()``,
+    which decodes them with that charset.
+    """
+    if response.encoding is not None and not _is_utf8(response.encoding):
+        return response.json()
+    return loads(response.content)
+
+
+def _is_utf8(encoding: str) -> bool:
+    try:
+        return codecs.lookup(encoding).name == "utf-8"
+    except LookupError:
+        return False  # let requests deal with the unknown charset
+
+
+def digest(buffer: Buffer, algorithm: str = "sha256") -> str:
+    """Hex digest of a body, hashed from the buffer without copying it"""
+    return hashlib.new(algorithm, buffer).hexdigest()
+
+
+def preview(buffer: Buffer, limit: int = 500) -> str:
+    """First ``limit`` bytes of a body as text, decoding only that slice"""
+    with memoryview(buffer) as view, view[:limit] as head:
+        text = str(head, "utf-8", "replace")
+        return text + "..." if len(view) > limit else text
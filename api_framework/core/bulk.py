@@ -0,0 +1,163 @@
+"""
+Bulk create/update/delete through the services with bounded concurrency and backpressure
+"""
+import time
+import threading
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from core.histogram import LatencyHistogram
+
+
+PERCENTILES = [50, 90, 99]
+
+
+class Operation:
+    """One write: a service call with its arguments, e.g. ``Operation(posts.create_post, data)``"""
+
+    def __init__(self, call: Callable[..., Dict[str, Any]], *args, key: Any = None,
+                 expected_status: Union[int, List[int], None] = None, **kwargs):
+        self.call = call
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key if key is not None else (args[0] if args else None)
+        self.expected_status = expected_status
+
+    @property
+    def name(self) -> str:
+        return getattr(self.call, "__name__", repr(self.call))
+
+    def is_success(self, result: Dict[str, Any]) -> bool:
+        """Check a service result against the expected status, any 2xx by default"""
+        status = result["status_code"]
+        if self.expected_status is None:
+            return 200 <= status < 300
+        if isinstance(self.expected_status, int):
+            return status == self.expected_status
+        return status in self.expected_status
+
+
+class OperationResult:
+    """Outcome of one operation; ``error`` holds the exception or unexpected status"""
+
+    def __init__(self, index: int, operation: Operation, result: Optional[Dict[str, Any]],
+                 error: Optional[str], elapsed: float):
+        self.index = index
+        self.operation = operation
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def status_code(self) -> Optional[int]:
+        return self.result["status_code"] if self.result is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"index": self.index, "operation": self.operation.name, "key": self.operation.key,
+                "status_code": self.status_code, "error": self.error, "elapsed_ms": round(self.elapsed * 1000, 2)}
+
+
+class BulkWriter:
+    """Run operations from an iterable with at most ``concurrency`` in flight
+
+    Operations are pulled from the iterable only as slots free up, so a generator of
+    thousands of records is never held in memory, and a slow API slows the producer
+    instead of queueing work. ``run`` yields results as they complete; ``summary()``
+    reports throughput for everything run so far. Share one ``APIClient(thread_safe=True)``
+    between the services the operations call.
+    """
+
+    def __init__(self, concurrency: int = 8, max_pending: Optional[int] = None):
+        if concurrency <= 0:
+            raise ValueError(f"Concurrency must be positive, got {concurrency}")
+        self.concurrency = concurrency
+        # Operations submitted but not yet completed; the backpressure bound
+        self.max_pending = max(max_pending or concurrency, concurrency)
+        self._lock = threading.Lock()
+        self._histogram = LatencyHistogram(highest_trackable_us=600_000_000)
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._elapsed = 0.0
+        self.max_in_flight = 0
+
+    def _execute(self, index: int, operation: Operation) -> OperationResult:
+        started = time.perf_counter()
+        result, error = None, None
+        try:
+            result = operation.call(*operation.args, **operation.kwargs)
+            if not operation.is_success(result):
+                error = f"Unexpected status {result['status_code']}"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        return OperationResult(index, operation, result, error, time.perf_counter() - started)
+
+    def _record(self, outcome: OperationResult):
+        with self._lock:
+            self._histogram.record_seconds(outcome.elapsed)
+            counts = self._counts.setdefault(outcome.operation.name, {"succeeded": 0, "failed": 0})
+            counts["succeeded" if outcome.ok else "failed"] += 1
+
+    def run(self, operations: Iterable[Operation]) -> Iterator[OperationResult]:
+        """Execute operations, yielding each result as soon as it completes"""
+        context = contextvars.copy_context()
+        source = enumerate(operations)
+        pending: set = set()
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bulk-writer") as executor:
+            try:
+                exhausted = False
+                while True:
+                    while not exhausted and len(pending) < self.max_pending:
+                        try:
+                            index, operation = next(source)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        # Each call gets its own copy: a context is entered by one thread at a time
+                        pending.add(executor.submit(context.copy().run, self._execute, index, operation))
+                    self.max_in_flight = max(self.max_in_flight, len(pending))
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        outcome: OperationResult = future.result()
+                        self._record(outcome)
+                        yield outcome
+            finally:
+                # Abandoned by the consumer: drop queued operations, let running ones finish
+                for future in pending:
+                    future.cancel()
+                self._elapsed += time.monotonic() - started
+
+    def run_all(self, operations: Iterable[Operation],
+                on_result: Optional[Callable[[OperationResult], None]] = None) -> Dict[str, Any]:
+        """Execute operations for their side effects, returning the summary and failures"""
+        failures: List[Dict[str, Any]] = []
+        for outcome in self.run(operations):
+            if on_result is not None:
+                on_result(outcome)
+            if not outcome.ok:
+                failures.append(outcome.to_dict())
+        return dict(self.summary(), failures=failures)
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts per operation, throughput and latency percentiles"""
+        with self._lock:
+            succeeded = sum(counts["succeeded"] for counts in self._counts.values())
+            completed = succeeded + sum(counts["failed"] for counts in self._counts.values())
+            report = {
+                "operations": completed,
+                "succeeded": succeeded,
+                "failed": completed - succeeded,
+                "by_operation": {name: dict(counts) for name, counts in self._counts.items()},
+                "concurrency": self.concurrency,
+                "max_in_flight": self.max_in_flight,
+                "elapsed_s": round(self._elapsed, 3),
+                "operations_per_second": round(completed / self._elapsed, 1) if self._elapsed > 0 else 0.0,
+            }
+            if completed:
+                report.update(self._histogram.percentiles_ms(PERCENTILES))
+            return report
@@ -0,0 +1,123 @@
+"""
+Per-host circuit breaker to fail fast on dead backends
+"""
+import time
+import threading
+from typing import Callable, Dict
+import requests
+from config.settings import settings
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while a host's circuit is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for {host}: backend considered down, next probe in {retry_in:.1f}s")
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker counting consecutive failed attempts
+
+    After ``failure_threshold`` consecutive failures the circuit opens and every request
+    is rejected for ``recovery_timeout`` seconds. It then turns half-open and lets
+    ``half_open_max_calls`` probes through: a successful probe closes it, a failed one
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, host: str) -> "CircuitBreaker":
+        """Build a breaker with the thresholds configured in settings"""
+        return cls(
+            host,
+            failure_threshold=settings.circuit_failure_threshold,
+            recovery_timeout=settings.circuit_recovery_timeout,
+            half_open_max_calls=settings.circuit_half_open_max_calls,
+        )
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may be sent now"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return
+            retry_in = max(0.0, self.recovery_timeout - (self.clock() - self._opened_at))
+        raise CircuitOpenError(self.host, retry_in)
+
+    def release(self):
+        """A request let through ended before it produced an outcome; free its probe slot
+
+        Call this when an attempt admitted by ``before_request`` is abandoned, e.g. by its
+        deadline or the rate limiter, so a half-open circuit is not left waiting for a
+        probe that never reports.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self):
+        """A request reached a healthy backend"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> bool:
+        """A request failed; returns True if this opened the circuit"""
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+            if state == self.HALF_OPEN or (state == self.CLOSED and self._failures >= self.failure_threshold):
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                return True
+            return False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(host: str) -> CircuitBreaker:
+    """Process-wide circuit breaker for a host, shared by every client"""
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker.from_settings(host)
+        return _breakers[host]
+
+
+def reset_circuit_breakers():
+    """Forget all breaker state"""
+    with _breakers_lock:
+        _breakers.clear()
@@ -0,0 +1,108 @@
+"""
+Registry of entities created through the services, deleted in concurrent batches within a time budget
+"""
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from core.bulk import BulkWriter, Operation
+from core.deadline import deadline
+
+
+# Already gone counts as deleted
+DELETED_STATUSES = [200, 202, 204, 404, 410]
+
+_tracker: ContextVar[Optional["ResourceTracker"]] = ContextVar("resource_tracker", default=None)
+
+
+def record_created(resource: str, item_id: Any, delete: Callable[[Any], Dict[str, Any]],
+                   concurrent: bool = True):
+    """Register a created entity with the active tracker, if any
+
+    ``delete`` is the service call that removes it; ``concurrent`` says whether that
+    call may run from several threads, i.e. whether its client is thread-safe.
+    """
+    tracker = _tracker.get()
+    if tracker is not None and item_id is not None:
+        tracker.record(resource, item_id, delete, concurrent)
+
+
+class ResourceTracker:
+    """Entities created while the tracker is active, and their teardown
+
+    Services report what they create through ``record_created``; threads started with
+    ``run_parallel`` or ``BulkWriter`` inherit the active tracker. ``cleanup()`` deletes
+    resources in the reverse of the order their kinds were first created (comments before
+    the posts they belong to), each kind as one concurrent batch, all within ``budget``
+    seconds. Whatever could not be deleted in time is reported as leftovers.
+    """
+
+    def __init__(self, concurrency: int = 8, budget: float = 30.0):
+        self.concurrency = concurrency
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, Any], Tuple[Callable[[Any], Dict[str, Any]], bool]] = {}
+
+    @contextmanager
+    def activate(self) -> Iterator["ResourceTracker"]:
+        """Record entities created inside the block; nested trackers take precedence"""
+        token = _tracker.set(self)
+        try:
+            yield self
+        finally:
+            _tracker.reset(token)
+
+    def record(self, resource: str, item_id: Any, delete: Callable[[Any], Dict[str, Any]], concurrent: bool = True):
+        with self._lock:
+            self._entries.setdefault((resource, item_id), (delete, concurrent))
+
+    @property
+    def pending(self) -> List[Tuple[str, Any]]:
+        """Recorded (resource, id) pairs not yet cleaned up, in creation order"""
+        with self._lock:
+            return list(self._entries)
+
+    def _batches(self, entries: Dict[Tuple[str, Any], Tuple[Callable, bool]]) -> List[List[Tuple[str, Any]]]:
+        order: List[str] = []
+        for resource, _ in entries:
+            if resource not in order:
+                order.append(resource)
+        return [[key for key in entries if key[0] == resource] for resource in reversed(order)]
+
+    def cleanup(self, budget: Optional[float] = None) -> Dict[str, Any]:
+        """Delete everything recorded, returning counts, elapsed time and leftovers"""
+        budget = self.budget if budget is None else budget
+        with self._lock:
+            entries, self._entries = self._entries, {}
+        started = time.monotonic()
+        expires = started + budget
+        leftovers: List[Dict[str, Any]] = []
+        deleted = 0
+
+        def operations(batch: List[Tuple[str, Any]]) -> Iterator[Operation]:
+            for resource, item_id in batch:
+                if time.monotonic() >= expires:
+                    leftovers.append({"resource": resource, "id": item_id, "error": "Cleanup budget exhausted"})
+                    continue
+                delete, _ = entries[(resource, item_id)]
+                yield Operation(delete, item_id, key=(resource, item_id), expected_status=DELETED_STATUSES)
+
+        # One deadline for the whole teardown: requests still in flight when it passes are cut short
+        with deadline(budget):
+            for batch in self._batches(entries):
+                concurrent = all(entries[key][1] for key in batch)
+                writer = BulkWriter(concurrency=self.concurrency if concurrent else 1)
+                for outcome in writer.run(operations(batch)):
+                    if outcome.ok:
+                        deleted += 1
+                    else:
+                        resource, item_id = outcome.operation.key
+                        leftovers.append({"resource": resource, "id": item_id, "error": outcome.error})
+        return {
+            "tracked": len(entries),
+            "deleted": deleted,
+            "leftovers": leftovers,
+            "elapsed_s": round(time.monotonic() - started, 3),
+            "budget_s": budget,
+        }
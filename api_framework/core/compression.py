@@ -0,0 +1,216 @@
+"""
+Response compression negotiation, decoding and per-endpoint bandwidth accounting
+"""
+import re
+import time
+import zlib
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+from config.settings import settings
+from core.metrics import metrics
+from core.body import Buffer, content_length, read_into
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:  # optional: pip install brotli
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+
+def available_encodings() -> List[str]:
+    """Content codings this process can decode"""
+    encodings = ["gzip", "deflate"]
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    return encodings
+
+
+def accept_encoding() -> str:
+    """Accept-Encoding value from the configured preference order, limited to what can be decoded"""
+    if not settings.compression_enabled:
+        return "identity"
+    available = available_encodings()
+    preferred = [coding.strip().lower() for coding in settings.compression_encodings.split(",")]
+    return ", ".join(coding for coding in preferred if coding in available) or "identity"
+
+
+def decompress(data: Buffer, coding: str) -> bytes:
+    """Undo one content coding"""
+    if coding in ("gzip", "x-gzip"):
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    if coding == "deflate":
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib wrapper
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+    if coding == "br" and brotli is not None:
+        return brotli.decompress(data)
+    if coding == "zstd" and zstandard is not None:
+        # Streaming decoder: frames need not declare their content size
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    raise ValueError(f"Unsupported content coding {coding!r}")
+
+
+def compress(data: bytes, accepted: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Encode with the first coding in an Accept-Encoding value that is available (for stand-ins)"""
+    available = available_encodings()
+    for coding in (part.split(";")[0].strip().lower() for part in (accepted or "").split(",")):
+        if coding not in available:
+            continue
+        if coding == "gzip":
+            return zlib.compress(data, 6, 16 + zlib.MAX_WBITS), coding
+        if coding == "deflate":
+            return zlib.compress(data, 6), coding
+        if coding == "br":
+            return brotli.compress(data), coding
+        if coding == "zstd":
+            return zstandard.ZstdCompressor().compress(data), coding
+    return data, None
+
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """Group URLs by method, host and path with numeric ids folded to {id}"""
+    parts = urlsplit(url)
+    path = _ID_SEGMENT.sub("/{id}", parts.path)
+    return f"{method.upper()} {parts.netloc}{path}"
+
+
+class BandwidthLedger:
+    """Thread-safe per-endpoint counters of bytes on the wire, decoded bytes and decode CPU time"""
+
+    FIELDS = ("responses", "compressed_responses", "wire_bytes", "decoded_bytes", "decompress_ms")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, float]] = {}
+
+    def record(self, endpoint: str, wire_bytes: int, decoded_bytes: int, decompress_seconds: float,
+               compressed: bool):
+        """Account one response body"""
+        with self._lock:
+            counters = self._endpoints.setdefault(endpoint, dict.fromkeys(self.FIELDS, 0))
+            counters["responses"] += 1
+            counters["compressed_responses"] += compressed
+            counters["wire_bytes"] += wire_bytes
+            counters["decoded_bytes"] += decoded_bytes
+            counters["decompress_ms"] += decompress_seconds * 1000
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Copy of all endpoint counters"""
+        with self._lock:
+            return {endpoint: dict(counters) for endpoint, counters in self._endpoints.items()}
+
+    def reset(self):
+        """Clear all counters"""
+        with self._lock:
+            self._endpoints.clear()
+
+    @staticmethod
+    def delta(before: Dict[str, Dict[str, float]],
+              after: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        """Endpoint counters that changed between two snapshots"""
+        changed = {}
+        for endpoint, counters in sorted(after.items()):
+            previous = before.get(endpoint, {})
+            difference = {name: round(value - previous.get(name, 0), 3) for name, value in counters.items()}
+            if difference["responses"]:
+                changed[endpoint] = difference
+        return changed
+
+    @staticmethod
+    def merge(into: Dict[str, Dict[str, float]], other: Dict[str, Dict[str, float]]):
+        """Add another set of endpoint counters into ``into``"""
+        for endpoint, counters in other.items():
+            target = into.setdefault(endpoint, dict.fromkeys(BandwidthLedger.FIELDS, 0))
+            for name, value in counters.items():
+                target[name] = target.get(name, 0) + value
+
+    @staticmethod
+    def totals(endpoints: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+        """Counters summed over all endpoints, with the overall compression ratio"""
+        total = dict.fromkeys(BandwidthLedger.FIELDS, 0)
+        for counters in endpoints.values():
+            for name in BandwidthLedger.FIELDS:
+                total[name] += counters.get(name, 0)
+        wire = total["wire_bytes"]
+        total["compression_ratio"] = round(total["decoded_bytes"] / wire, 3) if wire else 1.0
+        return total
+
+
+# Global bandwidth ledger
+bandwidth = BandwidthLedger()
+
+
+# Responses that carry no body even when they declare the Content-Encoding a GET would get
+BODILESS_STATUSES = frozenset({204, 304})
+
+
+def decode_body(method: str, url: str, status: int, headers, body: Buffer) -> bytes:
+    """Decode a response body per its Content-Encoding and account it against its endpoint
+
+    Empty bodies are left alone: HEAD, 204 and 304 responses may name a coding without
+    having a body to apply it to. The result is always ``bytes``, as requests returns.
+    """
+    codings = [coding.strip().lower() for coding in headers.get("Content-Encoding", "").split(",")]
+    codings = [coding for coding in codings if coding and coding != "identity"]
+    if not body or method.upper() == "HEAD" or status in BODILESS_STATUSES:
+        codings = []
+    started = time.thread_time()
+    decoded = body
+    try:
+        # Codings are listed in the order they were applied
+        for coding in reversed(codings):
+            decoded = decompress(decoded, coding)
+    except (ValueError, zlib.error) as e:
+        raise requests.exceptions.ContentDecodingError(f"Failed to decode {', '.join(codings)} body: {e}")
+    elapsed = time.thread_time() - started
+    bandwidth.record(endpoint_key(method, url), len(body), len(decoded), elapsed, compressed=bool(codings))
+    metrics.increment("bytes_wire", len(body))
+    metrics.increment("bytes_decoded", len(decoded))
+    metrics.increment("decompress_seconds", elapsed)
+    # Decoders already return bytes; only identity bodies still need freezing
+    return decoded if isinstance(decoded, bytes) else bytes(decoded)
+
+
+class AccountingAdapter(HTTPAdapter):
+    """HTTPAdapter that decodes bodies itself so compressed and decoded sizes can be counted
+
+    Bodies are read into one preallocated buffer rather than joined from chunks.
+    Streamed responses (``stream=True``) are passed through unaccounted.
+    """
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs) -> requests.Response:
+        response = super().send(request, stream=True, **kwargs)
+        if stream:
+            return response
+        try:
+            # The adapter opened raw with decode_content=False, so this is the wire body
+            body = read_into(response.raw, content_length(response.headers))
+        except ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e, request=request)
+        except ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        finally:
+            response.raw.release_conn()
+        # Same attributes requests fills when it reads the body itself
+        response._content = decode_body(request.method, request.url, response.status_code,
+                                        response.headers, body)
+        response._content_consumed = True
+        return response
@@ -0,0 +1,187 @@
+"""
+Incremental dataset diffs: per-record content hashes kept between runs instead of whole collection dumps
+"""
+import os
+import re
+import sys
+import json
+import time
+import codecs
+import argparse
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+from core.api_client import APIClient
+from core.body import CHUNK_SIZE, digest, json_body
+from core.parallel import run_parallel
+from config.settings import settings
+
+
+RESOURCES = ("posts", "users", "comments")
+
+_decoder = json.JSONDecoder()
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def iter_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array as its bytes arrive
+
+    Only the element being parsed is held as text, so a collection is never decoded or
+    kept whole. Raises ``ValueError`` if the body is not an array or ends early.
+    """
+    decode = codecs.getincrementaldecoder("utf-8")().decode
+    text, position, opened = "", 0, False
+    for chunk in chunks:
+        text = text[position:] + decode(chunk)
+        position = 0
+        while True:
+            position = _SEPARATORS.match(text, position).end()
+            if position == len(text):
+                break
+            if not opened:
+                if text[position] != "[":
+                    raise ValueError(f"Expected a JSON array, got {text[position:position + 20]!r}")
+                opened = True
+                position += 1
+                continue
+            if text[position] == "]":
+                return
+            try:
+                item, end = _decoder.raw_decode(text, position)
+            except json.JSONDecodeError:
+                break  # element split across chunks
+            if end == len(text):
+                break  # a number may continue in the next chunk; the closing bracket is still to come
+            position = end
+            yield item
+    raise ValueError(f"JSON array ended early: {text[position:position + 40]!r}")
+
+
+def record_hash(record: Any) -> str:
+    """Content hash of a record, independent of key order and formatting"""
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return digest(canonical.encode("utf-8"))
+
+
+def _sort_ids(ids: Iterable[str]) -> List[str]:
+    return sorted(ids, key=lambda item_id: (not item_id.isdigit(), int(item_id) if item_id.isdigit() else 0, item_id))
+
+
+class DatasetDiff:
+    """Compare a collection with the id → content-hash index saved by the previous run
+
+    ``run()`` streams ``GET /<resource>``, hashing each record as it is parsed, and reports
+    ids added, removed and changed since the saved index. Full details are fetched from
+    ``detail_path`` only for added and changed records, concurrently when the client is
+    thread-safe. The first run for a resource only records the index.
+    """
+
+    def __init__(self, client: APIClient, resource: str, index_dir: Optional[str] = None,
+                 id_field: str = "id", detail_path: str = "/{resource}/{id}", concurrency: int = 8):
+        self.client = client
+        self.resource = resource
+        self.index_dir = index_dir or settings.dataset_index_dir
+        self.id_field = id_field
+        self.detail_path = detail_path
+        self.concurrency = concurrency if client.thread_safe else 1
+
+    @property
+    def index_path(self) -> str:
+        host = re.sub(r"[^A-Za-z0-9.-]", "_", urlsplit(self.client.base_url).netloc)
+        return os.path.join(self.index_dir, f"{host}-{self.resource}.json")
+
+    def load_index(self) -> Optional[Dict[str, str]]:
+        """Hashes saved by the previous run, or None if there is none"""
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)["records"]
+        except FileNotFoundError:
+            return None
+
+    def save_index(self, hashes: Dict[str, str]):
+        """Replace the saved index atomically"""
+        os.makedirs(self.index_dir, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=self.index_dir, suffix=".tmp")
+        with os.fdopen(descriptor, "w") as f:
+            json.dump({"resource": self.resource, "saved_at": time.time(), "records": hashes}, f)
+        os.replace(temporary, self.index_path)
+
+    def scan(self) -> Dict[str, str]:
+        """Stream the collection and hash every record"""
+        response = self.client.get(f"/{self.resource}", stream=True)
+        try:
+            response.raise_for_status()
+            return {str(record[self.id_field]): record_hash(record)
+                    for record in iter_array(response.iter_content(CHUNK_SIZE))}
+        finally:
+            response.close()
+
+    def fetch(self, item_id: str) -> Any:
+        """Full record for one id"""
+        response = self.client.get(self.detail_path.format(resource=self.resource, id=item_id))
+        response.raise_for_status()
+        return json_body(response)
+
+    def run(self, fetch_details: bool = True, save: bool = True) -> Dict[str, Any]:
+        """Diff the collection against the saved index, then save the new index"""
+        started = time.monotonic()
+        previous = self.load_index()
+        current = self.scan()
+        report: Dict[str, Any] = {"resource": self.resource, "records": len(current),
+                                  "first_run": previous is None, "added": [], "removed": [], "changed": []}
+        if previous is not None:
+            report["added"] = _sort_ids(current.keys() - previous.keys())
+            report["removed"] = _sort_ids(previous.keys() - current.keys())
+            report["changed"] = _sort_ids(item_id for item_id in current.keys() & previous.keys()
+                                          if current[item_id] != previous[item_id])
+        report["unchanged"] = len(current) - len(report["added"]) - len(report["changed"])
+        details = {}
+        wanted = report["added"] + report["changed"]
+        if fetch_details and wanted:
+            details = dict(zip(wanted, run_parallel(self.fetch, wanted, max_workers=self.concurrency)))
+        report["details"] = details
+        if save:
+            self.save_index(current)
+        report["elapsed_s"] = round(time.monotonic() - started, 3)
+        return report
+
+
+def format_diff(report: Dict[str, Any]) -> str:
+    """One line per resource with the changed ids listed below it"""
+    if report["first_run"]:
+        return f"{report['resource']}: {report['records']} records indexed (first run)"
+    lines = [f"{report['resource']}: {report['records']} records, {len(report['added'])} added, "
+             f"{len(report['removed'])} removed, {len(report['changed'])} changed"]
+    for kind in ("added", "removed", "changed"):
+        if report[kind]:
+            lines.append(f"  {kind}: {', '.join(report[kind])}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report records added, removed and changed since the last run")
+    parser.add_argument("resources", nargs="*", default=list(RESOURCES), help="Collections to diff")
+    parser.add_argument("--base-url", help="Base URL for the API under test")
+    parser.add_argument("--index-dir", help=f"Where hash indexes are kept (default {settings.dataset_index_dir})")
+    parser.add_argument("--no-details", action="store_true", help="Do not fetch changed records")
+    parser.add_argument("--dry-run", action="store_true", help="Do not update the saved indexes")
+    parser.add_argument("--output", help="Write the JSON reports to this file")
+    args = parser.parse_args()
+
+    client = APIClient(base_url=args.base_url, thread_safe=True)
+    try:
+        reports = [DatasetDiff(client, resource, index_dir=args.index_dir)
+                   .run(fetch_details=not args.no_details, save=not args.dry_run) for resource in args.resources]
+    finally:
+        client.close()
+    for report in reports:
+        print(format_diff(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+    # Like diff(1): 1 when anything changed
+    return int(any(report["added"] or report["removed"] or report["changed"] for report in reports))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Deadlines that bound the total time spent on HTTP calls within a test or block
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple, Union
+import requests
+
+
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised instead of sending a request once the current deadline has passed"""
+
+    def __init__(self, overrun: float):
+        self.overrun = overrun
+        super().__init__(f"Deadline exceeded {overrun:.2f}s ago, request not sent")
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Bound every request made inside the block to ``seconds`` from now
+
+    Nested deadlines can only shorten the outer one.
+    """
+    expires = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(expires if outer is None else min(outer, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline (negative once passed), or None without one"""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+def clamp_timeout(timeout: Timeout) -> Tuple[Timeout, bool]:
+    """Shrink a requests timeout to the time left; returns (timeout, whether it was shortened)
+
+    Raises DeadlineExceeded if the deadline has already passed.
+    """
+    left = remaining()
+    if left is None:
+        return timeout, False
+    if left <= 0:
+        raise DeadlineExceeded(-left)
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    clamped = (min(connect, left) if connect is not None else left,
+               min(read, left) if read is not None else left)
+    return clamped, clamped != (connect, read)
@@ -0,0 +1,401 @@
+"""
+Property-based payload fuzzing for write endpoints, generated from the JSON schemas in core.validators
+"""
+import re
+import sys
+import copy
+import json
+import time
+import random
+import logging
+import argparse
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from jsonschema.validators import validator_for
+from core.api_client import APIClient
+from core.parallel import run_parallel
+from core.validators import COMMENT_SCHEMA, POST_SCHEMA, USER_SCHEMA
+
+
+KINDS = ("valid", "boundary", "unicode", "missing", "extra", "wrong_type")
+
+BOUNDARY_STRINGS = [
+    "", " ", "a", "a" * 255, "a" * 256, "a" * 10_000, "  padded  ", "line\nbreak\ttab\r\n",
+    "\x00", "'\"<>&%s{0}\\", "null", "0", "-1", "true", "<script>alert(1)</script>", "../../etc/passwd",
+]
+
+UNICODE_STRINGS = [
+    "Zoë", "日本語テキスト", "🐱", "👩\u200d👩\u200d👧", "مرحبا بالعالم", "Ω≈ç√∫", "𝕳𝖊𝖑𝖑𝖔",
+    "e\u0301",  # combining accent
+    "\u200b", "\ufeff",  # zero-width space, byte order mark
+    "\ud800",  # a lone surrogate: escaped in JSON, but not valid UTF-16
+]
+
+# Kept within signed 64 bits: core.body.loads reads larger integers back as floats
+BOUNDARY_INTEGERS = [0, -1, 1, 2 ** 31 - 1, 2 ** 31, -2 ** 31, 2 ** 53 + 1, 2 ** 63 - 1, -2 ** 63]
+
+EXTRA_KEYS = ["unexpected", "", "__proto__", "$where", "ключ", "k" * 300, "nested.key"]
+
+WRONG_TYPES = [None, True, 1.5, 0, "1", "", [], {}, [1, "a"], {"nested": {"deep": [None]}}]
+
+_JSON_TYPES = {"string": str, "integer": int, "number": (int, float), "boolean": bool, "object": dict,
+               "array": list, "null": type(None)}
+
+
+def _is_type(value: Any, schema_type: Optional[str]) -> bool:
+    if schema_type in ("integer", "number") and isinstance(value, bool):
+        return False
+    return schema_type in _JSON_TYPES and isinstance(value, _JSON_TYPES[schema_type])
+
+
+def _paths(schema: Dict[str, Any], prefix: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], Dict[str, Any]]]:
+    """Every property path in an object schema, parents before children"""
+    for name, child in schema.get("properties", {}).items():
+        yield prefix + (name,), child
+        if child.get("type") == "object":
+            yield from _paths(child, prefix + (name,))
+
+
+def _parent(payload: Dict[str, Any], path: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    for name in path[:-1]:
+        payload = payload.get(name) if isinstance(payload, dict) else None
+    return payload if isinstance(payload, dict) else None
+
+
+class FuzzCase:
+    """One generated payload, what was done to it and whether it still satisfies the schema"""
+
+    def __init__(self, index: int, target: str, kind: str, description: str, payload: Any, valid: bool):
+        self.index = index
+        self.target = target
+        self.kind = kind
+        self.description = description
+        self.payload = payload
+        self.valid = valid
+
+    def __repr__(self) -> str:
+        return f"FuzzCase({self.target} #{self.index}: {self.description})"
+
+
+class FuzzTarget:
+    """A service write call and the schema its payloads are generated from
+
+    Fields in ``omit`` (server-assigned ids) are left out of payloads; with ``partial``
+    every field is optional, as for PATCH.
+    """
+
+    def __init__(self, name: str, call: Callable[[Any], Dict[str, Any]], schema: Dict[str, Any],
+                 omit: Tuple[str, ...] = ("id",), partial: bool = False):
+        self.name = name
+        self.call = call
+        self.schema = copy.deepcopy(schema)
+        for field in omit:
+            self.schema.get("properties", {}).pop(field, None)
+        self.schema["required"] = [] if partial else [
+            field for field in self.schema.get("required", []) if field not in omit]
+        self.partial = partial
+        self._validator = validator_for(self.schema)(self.schema)
+        self._paths = list(_paths(self.schema))
+
+    def is_valid(self, payload: Any) -> bool:
+        return self._validator.is_valid(payload)
+
+    def _value(self, schema: Dict[str, Any], rng: random.Random, name: str) -> Any:
+        schema_type = schema.get("type")
+        if schema_type == "object":
+            return {child: self._value(child_schema, rng, child)
+                    for child, child_schema in schema.get("properties", {}).items()}
+        if schema_type == "integer":
+            return rng.randint(1, 100)
+        if schema_type == "number":
+            return round(rng.uniform(-180, 180), 4)
+        if schema_type == "boolean":
+            return rng.random() < 0.5
+        return f"{name} {rng.randint(1, 10_000)}"
+
+    def generate(self, index: int, rng: random.Random, kind: Optional[str] = None) -> FuzzCase:
+        """A valid payload with one mutation of ``kind`` (random by default) applied"""
+        payload = self._value(self.schema, rng, self.name)
+        if self.partial:
+            keep = rng.sample(sorted(payload), rng.randint(1, len(payload)))
+            payload = {field: payload[field] for field in keep}
+        kind = kind or rng.choice(KINDS)
+        description = self._mutate(payload, kind, rng)
+        if description is None:
+            kind, description = "valid", "valid"
+        if kind == "wrong_type" and description == "payload":
+            payload = rng.choice([[payload], "payload", None, 1])
+            description = f"payload as {type(payload).__name__}"
+        return FuzzCase(index, self.name, kind, description, payload, self.is_valid(payload))
+
+    def _mutate(self, payload: Dict[str, Any], kind: str, rng: random.Random) -> Optional[str]:
+        """Apply one mutation in place and describe it; None when nothing applies"""
+        present = [(path, schema) for path, schema in self._paths if path[-1] in (_parent(payload, path) or {})]
+        if kind in ("boundary", "unicode"):
+            types = ("string",) if kind == "unicode" else ("string", "integer")
+            fields = [(path, schema) for path, schema in present if schema.get("type") in types]
+            if not fields:
+                return None
+            path, schema = rng.choice(fields)
+            if schema["type"] == "integer":
+                value = rng.choice(BOUNDARY_INTEGERS)
+            else:
+                value = rng.choice(BOUNDARY_STRINGS if kind == "boundary" else UNICODE_STRINGS)
+            _parent(payload, path)[path[-1]] = value
+            label = value if len(str(value)) <= 20 else f"{str(value)[:8]}... ({len(value)} chars)"
+            return f"{'.'.join(path)} = {label!r}"
+        if kind == "missing":
+            if not present:
+                return None
+            path, _ = rng.choice(present)
+            del _parent(payload, path)[path[-1]]
+            return f"{'.'.join(path)} removed"
+        if kind == "extra":
+            objects = [()] + [path for path, schema in present if schema.get("type") == "object"]
+            path = rng.choice(objects)
+            key, value = rng.choice(EXTRA_KEYS), rng.choice(WRONG_TYPES + BOUNDARY_STRINGS[:4])
+            target = payload
+            for name in path:
+                target = target[name]
+            target[key] = copy.deepcopy(value)
+            return f"{'.'.join(path + (key,))} added"
+        if kind == "wrong_type":
+            if not present or rng.random() < 0.1:
+                return "payload"
+            path, schema = rng.choice(present)
+            value = rng.choice([value for value in WRONG_TYPES if not _is_type(value, schema.get("type"))])
+            _parent(payload, path)[path[-1]] = copy.deepcopy(value)
+            return f"{'.'.join(path)} = {value!r}"
+        return None
+
+
+def service_targets(posts, users, comments) -> List[FuzzTarget]:
+    """Create, update and patch calls of the three JSONPlaceholder services"""
+    targets = []
+    for resource, service, schema in (("post", posts, POST_SCHEMA), ("user", users, USER_SCHEMA),
+                                      ("comment", comments, COMMENT_SCHEMA)):
+        create = getattr(service, f"create_{resource}")
+        update = getattr(service, f"update_{resource}")
+        patch = getattr(service, f"patch_{resource}")
+        targets += [
+            FuzzTarget(f"create_{resource}", create, schema),
+            FuzzTarget(f"update_{resource}", lambda payload, update=update: update(1, payload), schema),
+            FuzzTarget(f"patch_{resource}", lambda payload, patch=patch: patch(1, payload), schema, partial=True),
+        ]
+    return targets
+
+
+def echo_property(case: FuzzCase, outcome: Any) -> Optional[str]:
+    """Default property: no errors or 5xx, and valid payloads are accepted and echoed back
+
+    Returns why the case failed, or None.
+    """
+    if isinstance(outcome, Exception):
+        return f"{type(outcome).__name__}: {outcome}"
+    status = outcome["status_code"]
+    if status >= 500:
+        return f"Server error {status}"
+    if not case.valid:
+        return None
+    if not 200 <= status < 300:
+        return f"Valid payload rejected with {status}"
+    data = outcome["data"]
+    if not isinstance(data, dict):
+        return f"Expected an object back, got {type(data).__name__}"
+    for field, value in case.payload.items():
+        if field not in data or data[field] != value:
+            return f"Field {field!r} not echoed back"
+    return None
+
+
+def _signature(target: str, error: str) -> Tuple[str, str]:
+    """Failures differing only in numbers (positions, sizes) count as one"""
+    return target, re.sub(r"\d+", "N", error)
+
+
+def _simpler(value: Any) -> Iterator[Any]:
+    """Candidate replacements for a value, simplest first"""
+    if isinstance(value, str):
+        if value:
+            yield ""
+        for cut in (len(value) // 2, len(value) * 3 // 4, len(value) - 1):
+            if 0 < cut < len(value):
+                yield value[:cut]
+        if value.strip("a"):
+            yield "a" * len(value)
+    elif isinstance(value, bool):
+        if value:
+            yield False
+    elif isinstance(value, int):
+        if value:
+            yield 0
+        if abs(value) > 1:
+            yield value // 2
+    elif isinstance(value, float):
+        yield 0
+    elif isinstance(value, list):
+        if value:
+            yield []
+            yield value[:len(value) // 2]
+
+
+def shrink(payload: Any, fails: Callable[[Any], bool], max_attempts: int = 200) -> Tuple[Any, int]:
+    """Greedily simplify a failing payload while ``fails`` still holds
+
+    Keys are dropped and values simplified (strings shortened, numbers moved towards
+    zero, lists emptied) anywhere in the payload, keeping each change that still fails.
+    Returns the smallest payload found and the number of attempts made.
+    """
+    attempts = 0
+
+    def candidates(value: Any) -> Iterator[Any]:
+        if isinstance(value, dict):
+            for key in list(value):
+                yield {name: item for name, item in value.items() if name != key}
+            for key, item in value.items():
+                for simpler in candidates(item):
+                    yield {**value, key: simpler}
+        elif isinstance(value, list):
+            yield from _simpler(value)
+            for index, item in enumerate(value):
+                for simpler in candidates(item):
+                    yield value[:index] + [simpler] + value[index + 1:]
+        else:
+            yield from _simpler(value)
+
+    improved = True
+    while improved and attempts < max_attempts:
+        improved = False
+        for candidate in candidates(payload):
+            if attempts >= max_attempts:
+                break
+            attempts += 1
+            if fails(candidate):
+                payload, improved = candidate, True
+                break
+    return payload, attempts
+
+
+class Fuzzer:
+    """Fire generated payloads at targets concurrently, then shrink each distinct failure
+
+    Cases are spread round-robin over ``targets`` and sent from ``concurrency`` threads;
+    the targets' services should share one ``APIClient(thread_safe=True)``. ``prop``
+    decides whether a case failed (``echo_property`` by default). Failures are grouped by
+    target and message, and the first case of each group is shrunk to a minimal repro.
+    """
+
+    def __init__(self, targets: List[FuzzTarget], concurrency: int = 8,
+                 prop: Callable[[FuzzCase, Any], Optional[str]] = echo_property, max_shrink_attempts: int = 200):
+        self.targets = targets
+        self.concurrency = concurrency
+        self.prop = prop
+        self.max_shrink_attempts = max_shrink_attempts
+
+    def generate(self, cases: int, seed: Optional[int] = None) -> List[FuzzCase]:
+        """Cases in a reproducible order for a given seed"""
+        rng = random.Random(seed)
+        return [self.targets[index % len(self.targets)].generate(index, rng) for index in range(cases)]
+
+    def run(self, cases: int = 1000, seed: Optional[int] = None) -> Dict[str, Any]:
+        """Generate and send ``cases`` payloads, returning throughput and shrunk failures
+
+        Without a ``seed`` one is drawn and reported, so any run can be replayed.
+        """
+        seed = seed if seed is not None else random.randrange(2 ** 32)
+        by_name = {target.name: target for target in self.targets}
+        generated = self.generate(cases, seed)
+        started = time.perf_counter()
+        outcomes = run_parallel(lambda case: by_name[case.target].call(case.payload), generated,
+                                max_workers=self.concurrency, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+
+        groups: Dict[Tuple[str, str], List[Tuple[FuzzCase, str]]] = {}
+        statuses: Dict[str, int] = {}
+        kinds: Dict[str, int] = {}
+        for case, outcome in zip(generated, outcomes):
+            kinds[case.kind] = kinds.get(case.kind, 0) + 1
+            status = type(outcome).__name__ if isinstance(outcome, Exception) else str(outcome["status_code"])
+            statuses[status] = statuses.get(status, 0) + 1
+            error = self.prop(case, outcome)
+            if error is not None:
+                groups.setdefault(_signature(case.target, error), []).append((case, error))
+        return {
+            "cases": len(generated),
+            "seed": seed,
+            "elapsed_s": round(elapsed, 3),
+            "cases_per_second": round(len(generated) / elapsed, 1) if elapsed > 0 else 0.0,
+            "by_kind": kinds,
+            "statuses": statuses,
+            "failed": sum(len(group) for group in groups.values()),
+            "failures": [self._shrink(by_name[case.target], case, error, len(group))
+                         for (case, error), group in ((group[0], group) for group in groups.values())],
+        }
+
+    def _shrink(self, target: FuzzTarget, case: FuzzCase, error: str, occurrences: int) -> Dict[str, Any]:
+        signature = _signature(target.name, error)
+
+        def fails(payload: Any) -> bool:
+            candidate = FuzzCase(case.index, target.name, case.kind, case.description, payload,
+                                 target.is_valid(payload))
+            try:
+                outcome = target.call(payload)
+            except Exception as e:
+                outcome = e
+            failure = self.prop(candidate, outcome)
+            return failure is not None and _signature(target.name, failure) == signature
+
+        minimal, attempts = shrink(case.payload, fails, self.max_shrink_attempts)
+        return {"target": target.name, "error": error, "occurrences": occurrences, "kind": case.kind,
+                "description": case.description, "case": case.index, "payload": minimal,
+                "shrink_attempts": attempts}
+
+
+def format_fuzz_report(report: Dict[str, Any]) -> str:
+    """Throughput line, case mix and one minimal repro per failure"""
+    lines = [f"{report['cases']} cases in {report['elapsed_s']}s ({report['cases_per_second']} cases/s), "
+             f"{report['failed']} failed",
+             "kinds: " + ", ".join(f"{kind} {count}" for kind, count in sorted(report["by_kind"].items())),
+             "statuses: " + ", ".join(f"{status} {count}" for status, count in sorted(report["statuses"].items()))]
+    for failure in report["failures"]:
+        lines += ["", f"{failure['target']}: {failure['error']} ({failure['occurrences']} cases)",
+                  f"  first seen: case {failure['case']}, {failure['description']}",
+                  f"  minimal payload: {json.dumps(failure['payload'])}"]
+    return "\n".join(lines)
+
+
+def main():
+    from services.posts_service import PostsService
+    from services.users_service import UsersService
+    from services.comments_service import CommentsService
+    from stubs.jsonplaceholder import StubServer
+
+    parser = argparse.ArgumentParser(description="Fuzz the posts, users and comments write endpoints")
+    parser.add_argument("--cases", type=int, default=5000, help="Number of payloads to send")
+    parser.add_argument("--concurrency", type=int, default=16, help="Threads sending payloads")
+    parser.add_argument("--seed", type=int, help="Random seed; reuse it to replay a run")
+    parser.add_argument("--target", action="append", default=[], help="Only these targets, e.g. create_post")
+    parser.add_argument("--base-url", help="API under test (default: a local JSONPlaceholder stand-in)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    # Per-request INFO logging would dominate the client-side cost
+    logging.getLogger("core.api_client").setLevel(logging.WARNING)
+    server = None if args.base_url else StubServer().start_in_thread()
+    client = APIClient(base_url=args.base_url or server.base_url, thread_safe=True, pool_size=args.concurrency)
+    try:
+        targets = service_targets(PostsService(client), UsersService(client), CommentsService(client))
+        targets = [target for target in targets if not args.target or target.name in args.target]
+        report = Fuzzer(targets, concurrency=args.concurrency).run(args.cases, seed=args.seed)
+    finally:
+        client.close()
+        if server is not None:
+            server.stop()
+    print(format_fuzz_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
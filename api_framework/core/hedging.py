@@ -0,0 +1,142 @@
+"""
+Hedged GET requests: send a backup request when the first one is slow
+"""
+import time
+import threading
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import requests
+from config.settings import settings
+from core.histogram import LatencyHistogram
+from core.metrics import metrics
+from core.retry_policy import RetryBudget
+
+
+class HedgePolicy:
+    """Per-host hedge delay from observed latency, with a hard cap on the hedge rate
+
+    The delay is the configured percentile of the host's recent GET latencies (never below
+    ``min_delay_ms``); until ``min_samples`` are seen the minimum delay is used. Each request
+    earns ``max_rate`` hedge tokens and each hedge spends one, so hedges stay below that
+    fraction of requests.
+    """
+
+    def __init__(self, percentile: float = 95, min_delay_ms: float = 50, min_samples: int = 20,
+                 max_rate: float = 0.05, burst: int = 5):
+        self.percentile = percentile
+        self.min_delay_ms = min_delay_ms
+        self.min_samples = min_samples
+        self.max_rate = max_rate
+        self.burst = burst
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "HedgePolicy":
+        """Build the policy configured in settings"""
+        return cls(
+            percentile=settings.hedge_percentile,
+            min_delay_ms=settings.hedge_min_delay_ms,
+            min_samples=settings.hedge_min_samples,
+            max_rate=settings.hedge_max_rate,
+        )
+
+    def _host_state(self, host: str):
+        if host not in self._histograms:
+            self._histograms[host] = LatencyHistogram(highest_trackable_us=600_000_000)
+            self._budgets[host] = RetryBudget(self.max_rate, self.burst)
+        return self._histograms[host], self._budgets[host]
+
+    def delay(self, host: str) -> float:
+        """Seconds to wait for the primary before hedging; also credits the hedge budget"""
+        with self._lock:
+            histogram, budget = self._host_state(host)
+            budget.deposit()
+            if histogram.total_count < self.min_samples:
+                return self.min_delay_ms / 1000
+            return max(self.min_delay_ms, histogram.percentile_ms(self.percentile)) / 1000
+
+    def try_hedge(self, host: str) -> bool:
+        """Spend one hedge token for the host, if available"""
+        with self._lock:
+            return self._host_state(host)[1].try_withdraw()
+
+    def record(self, host: str, elapsed_s: float):
+        """Feed an observed GET latency into the host's histogram"""
+        with self._lock:
+            self._host_state(host)[0].record_seconds(elapsed_s)
+
+
+class Hedger:
+    """Run a GET on one session and, if it is slow, race a duplicate on a second session
+
+    Each request gets its own thread rather than a slot in a shared pool, so hedging never
+    caps how many GETs a client runs at once and no request waits in a queue. The hedge
+    delay runs from the moment the primary starts sending.
+    """
+
+    def __init__(self, policy: HedgePolicy, hedge_session: requests.Session):
+        self.policy = policy
+        self.hedge_session = hedge_session
+
+    @staticmethod
+    def _start(session: requests.Session, method: str, url: str, **kwargs) -> Tuple[Future, float]:
+        """Send a request on a new thread; returns its future and when it started sending"""
+        future: Future = Future()
+        sending = threading.Event()
+        sent_at = []
+
+        def send():
+            future.set_running_or_notify_cancel()
+            sent_at.append(time.perf_counter())
+            sending.set()
+            try:
+                future.set_result(session.request(method, url, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=send, name="hedge", daemon=True).start()
+        sending.wait()
+        return future, sent_at[0]
+
+    @staticmethod
+    def _discard(future: Future):
+        """Release the connection held by a losing request once it finishes"""
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def request(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        """Send the request, hedging once if it outlives the host's hedge delay"""
+        host = urlsplit(url).netloc
+        delay = self.policy.delay(host)
+        primary, started = self._start(session, method, url, **kwargs)
+        done, _ = wait([primary], timeout=max(0.0, started + delay - time.perf_counter()))
+        if done or not self.policy.try_hedge(host):
+            if not done:
+                metrics.increment("hedges_denied_by_budget")
+            response = primary.result()
+            self.policy.record(host, time.perf_counter() - started)
+            return response
+
+        metrics.increment("hedges_sent")
+        hedge, _ = self._start(self.hedge_session, method, url, **kwargs)
+        pending = {primary, hedge}
+        winner = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+        if winner is None:
+            # Both failed: surface the primary's error
+            return primary.result()
+
+        loser = hedge if winner is primary else primary
+        loser.add_done_callback(self._discard)
+        metrics.increment("hedge_wins" if winner is hedge else "hedge_losses")
+        self.policy.record(host, time.perf_counter() - started)
+        return winner.result()
+
+    def close(self):
+        """Close the hedge session"""
+        self.hedge_session.close()
@@ -0,0 +1,204 @@
+"""
+Fixed-size HDR-style latency histogram
+"""
+import sys
+import math
+import zlib
+import base64
+import struct
+from array import array
+from typing import Dict, Any, List, Optional, Union
+
+
+_HEADER = struct.Struct("<4sBQ")
+_MAGIC = b"LHG1"
+
+Counts = Union[array, memoryview]
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies in microseconds with constant memory
+
+    Values are grouped into power-of-two buckets, each split into linear sub-buckets
+    sized for the requested number of significant figures. Recording is O(1) and the
+    counts live in a preallocated int64 store, which may be an external buffer such as
+    shared memory. Everything (count, min, max, mean) is derived from the counts, so
+    the store alone fully describes the histogram.
+    """
+
+    def __init__(self, highest_trackable_us: int = 3_600_000_000, significant_figures: int = 2,
+                 counts: Optional[Counts] = None):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError(f"significant_figures must be between 1 and 5, got {significant_figures}")
+        if highest_trackable_us < 2:
+            raise ValueError(f"highest_trackable_us must be at least 2, got {highest_trackable_us}")
+        self.highest_trackable_us = highest_trackable_us
+        self.significant_figures = significant_figures
+        self.sub_bucket_bits, self.counts_length = self._layout(highest_trackable_us, significant_figures)
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count // 2
+        if counts is None:
+            counts = array("q", bytes(8 * self.counts_length))
+        elif len(counts) != self.counts_length:
+            raise ValueError(f"Counts store holds {len(counts)} slots, expected {self.counts_length}")
+        self.counts = counts
+
+    @staticmethod
+    def _layout(highest_trackable_us: int, significant_figures: int):
+        sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        bucket_count = max(1, highest_trackable_us.bit_length() - sub_bucket_bits + 1)
+        return sub_bucket_bits, (bucket_count + 1) * (1 << sub_bucket_bits) // 2
+
+    @classmethod
+    def counts_length_for(cls, highest_trackable_us: int = 3_600_000_000, significant_figures: int = 2) -> int:
+        """Number of int64 slots needed for a given layout"""
+        return cls._layout(highest_trackable_us, significant_figures)[1]
+
+    def index_of(self, value_us: int) -> int:
+        """Counts index of a value, clamped to the trackable range"""
+        value_us = min(max(0, int(value_us)), self.highest_trackable_us)
+        shift = value_us.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return value_us
+        return (shift + 1) * self.sub_bucket_half + (value_us >> shift) - self.sub_bucket_half
+
+    def _lowest_at(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return index
+        shift = index // self.sub_bucket_half - 1
+        return (index - shift * self.sub_bucket_half) << shift
+
+    def _width_at(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return 1
+        return 1 << (index // self.sub_bucket_half - 1)
+
+    def value_at(self, index: int) -> int:
+        """Highest value that maps to a counts index"""
+        return self._lowest_at(index) + self._width_at(index) - 1
+
+    def record(self, value_us: int, count: int = 1):
+        """Record a latency in microseconds"""
+        self.counts[self.index_of(value_us)] += count
+
+    def record_seconds(self, seconds: float, count: int = 1):
+        """Record a latency given in seconds"""
+        self.record(round(seconds * 1_000_000), count)
+
+    def record_response(self, response):
+        """Record the elapsed time of a requests response"""
+        self.record_seconds(response.elapsed.total_seconds())
+
+    @property
+    def total_count(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def min(self) -> int:
+        for index, count in enumerate(self.counts):
+            if count:
+                return self._lowest_at(index)
+        return 0
+
+    @property
+    def max(self) -> int:
+        for index in range(self.counts_length - 1, -1, -1):
+            if self.counts[index]:
+                return self.value_at(index)
+        return 0
+
+    def mean(self) -> float:
+        """Mean latency in microseconds, using bucket midpoints"""
+        total = 0
+        weighted = 0.0
+        for index, count in enumerate(self.counts):
+            if count:
+                total += count
+                weighted += count * (self._lowest_at(index) + (self._width_at(index) - 1) / 2)
+        return weighted / total if total else 0.0
+
+    def percentile(self, pct: float) -> int:
+        """Latency in microseconds at or below which pct percent of samples fall"""
+        if not 0 <= pct <= 100:
+            raise ValueError(f"Percentile must be between 0 and 100, got {pct}")
+        total = self.total_count
+        if total == 0:
+            return 0
+        target = max(1, math.ceil(pct / 100 * total))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.value_at(index)
+        return self.highest_trackable_us
+
+    def percentile_ms(self, pct: float) -> float:
+        """Percentile latency in milliseconds"""
+        return self.percentile(pct) / 1000
+
+    def percentiles_ms(self, pcts: List[float]) -> Dict[str, float]:
+        """Several percentiles at once, keyed like "p99_ms" """
+        return {f"p{pct:g}_ms": self.percentile_ms(pct) for pct in pcts}
+
+    def _check_compatible(self, other: "LatencyHistogram"):
+        if (other.highest_trackable_us, other.significant_figures) != \
+                (self.highest_trackable_us, self.significant_figures):
+            raise ValueError("Histograms with different layouts cannot be merged")
+
+    def add(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Merge another histogram with the same layout into this one"""
+        self._check_compatible(other)
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        return self
+
+    def copy(self) -> "LatencyHistogram":
+        """Independent array-backed copy, e.g. of a shared-memory histogram"""
+        return LatencyHistogram(self.highest_trackable_us, self.significant_figures,
+                                counts=array("q", self.counts))
+
+    def reset(self):
+        """Zero all counts in place"""
+        for index in range(self.counts_length):
+            self.counts[index] = 0
+
+    def to_bytes(self) -> bytes:
+        """Compact binary form: header plus zlib-compressed little-endian counts"""
+        counts = array("q", self.counts)
+        if sys.byteorder == "big":
+            counts.byteswap()
+        header = _HEADER.pack(_MAGIC, self.significant_figures, self.highest_trackable_us)
+        return header + zlib.compress(counts.tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencyHistogram":
+        """Rebuild a histogram serialized with to_bytes"""
+        magic, significant_figures, highest_trackable_us = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized LatencyHistogram")
+        counts = array("q")
+        counts.frombytes(zlib.decompress(data[_HEADER.size:]))
+        if sys.byteorder == "big":
+            counts.byteswap()
+        return cls(highest_trackable_us, significant_figures, counts=counts)
+
+    def encode(self) -> str:
+        """Base64 form of to_bytes, for JSON reports"""
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def decode(cls, text: str) -> "LatencyHistogram":
+        """Rebuild a histogram serialized with encode"""
+        return cls.from_bytes(base64.b64decode(text))
+
+    def summary(self, pcts: Optional[List[float]] = None) -> Dict[str, Any]:
+        """Count, mean, max and percentiles in milliseconds"""
+        summary = {
+            "count": self.total_count,
+            "mean_ms": self.mean() / 1000,
+            "max_ms": self.max / 1000,
+        }
+        summary.update(self.percentiles_ms(pcts or [50, 90, 95, 99]))
+        return summary
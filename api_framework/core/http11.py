@@ -0,0 +1,109 @@
+"""
+Minimal HTTP/1.1 framing helpers for asyncio streams
+"""
+import asyncio
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple, List
+from urllib.parse import urlsplit, parse_qs
+
+
+class HTTPRequest:
+    """Parsed HTTP/1.1 request"""
+
+    def __init__(self, method: str, target: str, version: str, headers: Dict[str, str], body: bytes):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        self.body = body
+        parts = urlsplit(target)
+        self.path = parts.path
+        self.query: Dict[str, List[str]] = parse_qs(parts.query)
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise asyncio.IncompleteReadError(line, None)
+        if line in (b"\r\n", b"\n"):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks = []
+    while True:
+        size = int((await reader.readline()).split(b";")[0].strip(), 16)
+        if size == 0:
+            await _read_headers(reader)  # trailers
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str], until_eof: bool) -> bytes:
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        return await _read_chunked(reader)
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read() if until_eof else b""
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[HTTPRequest]:
+    """Read one request; returns None when the peer closed the connection"""
+    line = await reader.readline()
+    if not line:
+        return None
+    method, target, version = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+    headers = await _read_headers(reader)
+    body = await _read_body(reader, headers, until_eof=False)
+    return HTTPRequest(method.upper(), target, version, headers, body)
+
+
+async def read_response(reader: asyncio.StreamReader, method: str = "GET") -> Tuple[int, Dict[str, str], bytes]:
+    """Read one response as (status, lower-cased headers, body)"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionResetError("Connection closed before response")
+    status = int(line.split(b" ", 2)[1])
+    headers = await _read_headers(reader)
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        return status, headers, b""
+    return status, headers, await _read_body(reader, headers, until_eof=True)
+
+
+def build_request(method: str, target: str, host: str, body: bytes = b"",
+                  headers: Optional[Dict[str, str]] = None) -> bytes:
+    """Serialize a request with Content-Length framing"""
+    lines = [f"{method} {target} HTTP/1.1", f"Host: {host}"]
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+    if body or method in ("POST", "PUT", "PATCH"):
+        lines.append(f"Content-Length: {len(body)}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def build_response(status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None,
+                   keep_alive: bool = True) -> bytes:
+    """Serialize a response with Content-Length framing"""
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = "Unknown"
+    lines = [f"HTTP/1.1 {status} {reason}"]
+    for name, value in (headers or {}).items():
+        if name.lower() not in ("content-length", "transfer-encoding", "connection"):
+            lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {len(body)}")
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
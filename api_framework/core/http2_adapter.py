@@ -0,0 +1,149 @@
+"""
+HTTP/2 transport adapter for requests, multiplexing concurrent requests per host
+"""
+import io
+import logging
+import threading
+from typing import Dict, Iterator
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.exceptions import NewConnectionError
+from core.body import content_length, join_into
+from core.compression import decode_body
+
+try:
+    import httpx
+except ImportError:  # optional dependency: pip install "httpx[http2]"
+    httpx = None
+else:
+    # APIClient already logs every request; httpx would log each one again at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Connection-specific headers are forbidden in HTTP/2 (RFC 9113, section 8.2.2)
+HOP_HEADERS = frozenset({"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"})
+
+
+class _StreamedBody(io.RawIOBase):
+    """File-like view of a streamed httpx response body, as requests expects of ``raw``"""
+
+    def __init__(self, response: "httpx.Response"):
+        self._response = response
+        self._chunks: Iterator[bytes] = response.iter_bytes()
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        self._response.close()
+        super().close()
+
+
+class HTTP2Adapter(BaseAdapter):
+    """requests transport over httpx with HTTP/2 enabled
+
+    Concurrent requests to one host share a single connection as HTTP/2 streams instead
+    of each taking a pooled HTTP/1.1 socket. ``https`` origins negotiate HTTP/2 via ALPN
+    and fall back to HTTP/1.1; plain ``http`` origins use HTTP/2 with prior knowledge
+    (h2c), so the server must speak HTTP/2. Like the default adapter, it never retries.
+
+    Certificate verification is fixed per adapter; per-request ``verify``, ``cert`` and
+    ``proxies`` are not supported.
+    """
+
+    def __init__(self, verify: bool = True, max_connections: int = 100):
+        if httpx is None:
+            raise ImportError('HTTP/2 transport requires httpx with HTTP/2 support: pip install "httpx[http2]"')
+        super().__init__()
+        self.verify = verify
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._clients: Dict[str, "httpx.Client"] = {}
+        self._lock = threading.Lock()
+
+    def _client(self, scheme: str) -> "httpx.Client":
+        with self._lock:
+            if scheme not in self._clients:
+                self._clients[scheme] = httpx.Client(
+                    http1=scheme == "https", http2=True, verify=self.verify, limits=self.limits,
+                    follow_redirects=False, trust_env=False,
+                )
+            return self._clients[scheme]
+
+    @staticmethod
+    def _timeout(timeout) -> "httpx.Timeout":
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+        else:
+            connect = read = timeout
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=connect)
+
+    @staticmethod
+    def _translate(error: Exception, request: requests.PreparedRequest) -> requests.exceptions.RequestException:
+        """Map httpx errors onto the requests exceptions the retry policy understands"""
+        if isinstance(error, httpx.ConnectTimeout):
+            return requests.exceptions.ConnectTimeout(error, request=request)
+        if isinstance(error, httpx.TimeoutException):
+            return requests.exceptions.ReadTimeout(error, request=request)
+        if isinstance(error, httpx.ConnectError):
+            # Nothing reached the server, which makes the request safe to replay
+            return requests.exceptions.ConnectionError(NewConnectionError(None, str(error)), request=request)
+        if isinstance(error, httpx.DecodingError):
+            return requests.exceptions.ContentDecodingError(error, request=request)
+        return requests.exceptions.ConnectionError(error, request=request)
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None,
+             verify=True, cert=None, proxies=None) -> requests.Response:
+        client = self._client(request.url.split(":", 1)[0].lower())
+        headers = {name: value for name, value in request.headers.items() if name.lower() not in HOP_HEADERS}
+        outgoing = client.build_request(request.method, request.url, headers=headers,
+                                        content=request.body, timeout=self._timeout(timeout))
+        body = None
+        try:
+            response = client.send(outgoing, stream=True)
+            if not stream:
+                try:
+                    body = join_into(response.iter_raw(), content_length(response.headers))
+                finally:
+                    response.close()
+        except httpx.HTTPError as e:
+            raise self._translate(e, request) from e
+        if body is not None:
+            body = decode_body(request.method, request.url, response.status_code, response.headers, body)
+        return self._build_response(request, response, body)
+
+    def _build_response(self, request: requests.PreparedRequest, response: "httpx.Response",
+                        body) -> requests.Response:
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        result.headers = CaseInsensitiveDict(response.headers)
+        result.encoding = get_encoding_from_headers(result.headers)
+        if body is None:
+            result.raw = _StreamedBody(response)
+        else:
+            result._content = body
+            result._content_consumed = True
+        result.url = request.url
+        result.request = request
+        result.connection = self
+        result.http_version = response.http_version
+        return result
+
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
@@ -0,0 +1,54 @@
+"""
+Process-wide counters for client-side request behaviour
+"""
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+class RequestMetrics:
+    """Thread-safe named counters, snapshotted around tests and runs"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+
+    def increment(self, name: str, value: float = 1):
+        """Add value to a counter"""
+        with self._lock:
+            self._counters[name] += value
+
+    def snapshot(self) -> Dict[str, float]:
+        """Copy of all counters"""
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        """Clear all counters"""
+        with self._lock:
+            self._counters.clear()
+
+    @staticmethod
+    def merge(into: Dict[str, float], other: Dict[str, float]):
+        """Add another process's counters into ``into``, e.g. those of an xdist worker"""
+        for name, value in other.items():
+            into[name] = into.get(name, 0) + value
+
+    @staticmethod
+    def retry_amplification(counters: Dict[str, float]) -> float:
+        """Attempts sent per logical request (1.0 means no retries)"""
+        requests = counters.get("requests", 0)
+        return counters.get("attempts", 0) / requests if requests else 0.0
+
+    @staticmethod
+    def delta(before: Dict[str, float], after: Dict[str, float]) -> Dict[str, float]:
+        """Counters that changed between two snapshots"""
+        return {
+            name: round(value - before.get(name, 0), 6)
+            for name, value in sorted(after.items())
+            if value != before.get(name, 0)
+        }
+
+
+# Global metrics instance
+metrics = RequestMetrics()
@@ -0,0 +1,32 @@
+"""
+Run blocking service calls from a thread pool, keeping results in input order
+"""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, TypeVar
+
+T = TypeVar("T")
+
+
+def run_parallel(function: Callable[[T], Any], items: Iterable[T], max_workers: int = 8,
+                 return_exceptions: bool = False) -> List[Any]:
+    """Call ``function`` on each item from ``max_workers`` threads; results follow input order
+
+    Each call runs in a copy of the caller's context, so a deadline set around
+    ``run_parallel`` bounds every call. Share one ``APIClient(thread_safe=True)`` between
+    the calls. The first failure is raised once earlier results are in, unless
+    ``return_exceptions`` puts each exception in its item's place instead.
+    """
+    context = contextvars.copy_context()
+
+    def call(item: T) -> Any:
+        try:
+            # A context can only be entered by one thread at a time
+            return context.copy().run(function, item)
+        except Exception as e:
+            if return_exceptions:
+                return e
+            raise
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="run-parallel") as executor:
+        return list(executor.map(call, items))
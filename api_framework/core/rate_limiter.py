@@ -0,0 +1,166 @@
+"""
+Client-side per-host rate limiter shared across processes through a locked state file
+"""
+import os
+import re
+import glob
+import json
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+from config.settings import settings
+from core.deadline import DeadlineExceeded, remaining
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def _locked_state(path: str) -> Iterator[Dict[str, Any]]:
+    """Exclusively lock a JSON state file, yield its contents and write them back"""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            f.seek(0)
+            raw = f.read()
+            try:
+                state = json.loads(raw) if raw else {}
+            except ValueError:
+                state = {}
+            yield state
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(state).encode("utf-8"))
+            f.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SharedTokenBucket:
+    """Token bucket whose state lives in a file so every process draws from one budget
+
+    Tokens refill at ``rate`` per second times a rate factor. A 429 halves the factor
+    (down to ``min_factor``) and blocks all takers until its Retry-After has passed; the
+    factor then recovers linearly back to 1 over ``recovery_seconds``.
+    """
+
+    def __init__(self, path: str, rate: float, burst: int, min_factor: float = 0.1,
+                 recovery_seconds: float = 30.0):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self.min_factor = min_factor
+        self.recovery_seconds = recovery_seconds
+
+    def _refill(self, state: Dict[str, Any], now: float):
+        if not state:
+            state.update(tokens=float(self.burst), updated=now, factor=1.0, blocked_until=0.0)
+            return
+        elapsed = max(0.0, now - state["updated"])
+        if self.recovery_seconds > 0:
+            state["factor"] = min(1.0, state["factor"] + elapsed * (1 - self.min_factor) / self.recovery_seconds)
+        state["tokens"] = min(float(self.burst), state["tokens"] + elapsed * self.rate * state["factor"])
+        state["updated"] = now
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the seconds spent waiting
+
+        Raises DeadlineExceeded without taking a token if none frees up before the
+        current deadline.
+        """
+        waited = 0.0
+        while True:
+            with _locked_state(self.path) as state:
+                now = time.time()
+                self._refill(state, now)
+                if state["blocked_until"] > now:
+                    wait = state["blocked_until"] - now
+                elif state["tokens"] >= 1:
+                    state["tokens"] -= 1
+                    return waited
+                else:
+                    wait = (1 - state["tokens"]) / (self.rate * state["factor"])
+            left = remaining()
+            if left is not None and wait > left:
+                raise DeadlineExceeded(max(0.0, -left))
+            time.sleep(wait)
+            waited += wait
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """React to a 429: lower the shared rate and pause every taker"""
+        with _locked_state(self.path) as state:
+            now = time.time()
+            self._refill(state, now)
+            state["factor"] = max(self.min_factor, state["factor"] / 2)
+            state["tokens"] = 0.0
+            pause = retry_after if retry_after is not None else 1 / (self.rate * state["factor"])
+            state["blocked_until"] = max(state["blocked_until"], now + pause)
+
+    @property
+    def rate_factor(self) -> float:
+        """Current fraction of the configured rate"""
+        with _locked_state(self.path) as state:
+            self._refill(state, time.time())
+            return state["factor"]
+
+
+_limiters: Dict[str, SharedTokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def run_id() -> str:
+    """Key of the current run: the xdist run id shared by all workers, else this process"""
+    return os.environ.get("PYTEST_XDIST_TESTRUNUID") or f"pid{os.getpid()}"
+
+
+def _state_dir() -> str:
+    return settings.rate_limit_state_dir or os.path.join(tempfile.gettempdir(), "api_framework_rate_limits")
+
+
+def state_path(host: str) -> str:
+    """State file for a host, scoped to the current run so all xdist workers share it"""
+    directory = _state_dir()
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{run_id()}-{re.sub(r'[^A-Za-z0-9.-]', '_', host)}.json")
+
+
+def remove_run_state(run: str) -> int:
+    """Delete the state files a finished run left behind; returns how many were removed"""
+    directory = _state_dir()
+    removed = 0
+    for path in glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(run)}-*.json")):
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def rate_limiter(host: str) -> SharedTokenBucket:
+    """Process-wide rate limiter for a host, backed by the shared state file"""
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = SharedTokenBucket(
+                state_path(host),
+                rate=settings.rate_limit_per_second,
+                burst=settings.rate_limit_burst,
+                min_factor=settings.rate_limit_min_factor,
+                recovery_seconds=settings.rate_limit_recovery_seconds,
+            )
+        return _limiters[host]
@@ -0,0 +1,139 @@
+"""
+Adaptive retry policy with full-jitter backoff, Retry-After and per-host retry budgets
+"""
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Iterable
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ConnectTimeoutError
+from config.settings import settings
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"})
+NON_IDEMPOTENT_METHODS = frozenset({"POST", "PATCH"})
+
+
+class RetryBudget:
+    """Token bucket that lets retries spend at most a fraction of request traffic
+
+    Every original request deposits ``ratio`` tokens and every retry withdraws one, so
+    in steady state retries stay below ``ratio`` of requests. ``burst`` caps the saved
+    tokens and is also the allowance at start-up.
+    """
+
+    def __init__(self, ratio: float, burst: int):
+        self.ratio = ratio
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Credit one original request"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """Spend one token for a retry, if available"""
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+_budgets: Dict[str, RetryBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def retry_budget(host: str) -> RetryBudget:
+    """Process-wide retry budget for a host, shared by every client"""
+    with _budgets_lock:
+        if host not in _budgets:
+            _budgets[host] = RetryBudget(settings.retry_budget_ratio, settings.retry_budget_burst)
+        return _budgets[host]
+
+
+def is_pre_send_failure(error: Exception) -> bool:
+    """True when the request failed while connecting, so no bytes reached the server"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+        return False
+    reason = error.args[0]
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Decide whether and when to retry a failed attempt"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 10.0,
+                 retry_after_max: float = 30.0, retry_statuses: Iterable[int] = RETRY_STATUSES,
+                 retry_methods: Iterable[str] = IDEMPOTENT_METHODS | NON_IDEMPOTENT_METHODS,
+                 rng: Optional[random.Random] = None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_after_max = retry_after_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_methods = frozenset(method.upper() for method in retry_methods)
+        self.random = rng or random.Random()
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        """Build the policy configured in settings"""
+        return cls(
+            max_retries=settings.max_retries,
+            base_delay=settings.retry_delay,
+            max_delay=settings.retry_max_delay,
+            retry_after_max=settings.retry_after_max,
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given zero-based retry attempt"""
+        return self.random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def is_retryable_error(self, error: Exception) -> bool:
+        """Connection failures and timeouts are retryable"""
+        return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+    def is_replay_safe(self, method: str, idempotency_key: Optional[str] = None,
+                       error: Optional[Exception] = None) -> bool:
+        """Non-idempotent writes may only be replayed with a key or if nothing was sent"""
+        if method.upper() not in NON_IDEMPOTENT_METHODS:
+            return True
+        return bool(idempotency_key) or (error is not None and is_pre_send_failure(error))
+
+    def delay(self, method: str, attempt: int, response: Optional[requests.Response] = None,
+              error: Optional[Exception] = None, idempotency_key: Optional[str] = None) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the attempt must not be retried"""
+        if attempt >= self.max_retries or method.upper() not in self.retry_methods:
+            return None
+        if not self.is_replay_safe(method, idempotency_key, error):
+            return None
+        if error is not None:
+            return self.backoff(attempt) if self.is_retryable_error(error) else None
+        if response is None or response.status_code not in self.retry_statuses:
+            return None
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is None:
+            return self.backoff(attempt)
+        # A server asking for a longer pause than we are willing to wait gets its response back
+        return retry_after if retry_after <= self.retry_after_max else None
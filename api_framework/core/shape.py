@@ -0,0 +1,186 @@
+"""
+Structural response fingerprints: detect contract drift by hashing shape, validating the schema only on change
+"""
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+from jsonschema import ValidationError, validate
+
+
+# Array elements hashed per array, spread evenly over it
+ARRAY_SAMPLE = 5
+
+# Accepted fingerprints kept per endpoint; nullable and optional fields produce a few variants
+MAX_VARIANTS = 16
+
+_SCALARS = {
+    str: b"s",
+    bool: b"b",
+    int: b"i",
+    float: b"f",
+    type(None): b"n",
+}
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _shape(value: Any, sample: int) -> bytes:
+    """Digest of one node: its type, and for containers the shapes below it"""
+    token = _SCALARS.get(type(value))
+    if token is not None:
+        return token
+    if isinstance(value, dict):
+        parts = [b"{"]
+        for key in sorted(value):
+            parts += (str(key).encode(), b":", _shape(value[key], sample), b",")
+        return _digest(b"".join(parts))
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return b"[]"
+        step = max(len(value) // sample, 1)
+        # Distinct element shapes, so array length and element order do not matter
+        elements = sorted({_shape(value[index], sample) for index in range(0, len(value), step)})
+        return _digest(b"[" + b"|".join(elements))
+    if isinstance(value, int):  # int subclasses such as IntEnum
+        return b"b" if isinstance(value, bool) else b"i"
+    return b"?" + type(value).__name__.encode()
+
+
+def fingerprint(value: Any, sample: int = ARRAY_SAMPLE) -> str:
+    """Hex fingerprint of a decoded JSON value's structure, ignoring the values themselves
+
+    Key sets, value types and nesting all feed the hash in one walk; arrays contribute the
+    set of shapes of up to ``sample`` evenly spaced elements. An empty array hashes
+    differently from a populated one, so it reads as a (validated) variant, not a match.
+    """
+    return _digest(_shape(value, sample)).hex()
+
+
+class ShapeCheck:
+    """Outcome of checking one response against its endpoint's baseline
+
+    ``status`` is ``match`` for a known shape, ``new`` for the first shape seen for the
+    endpoint, ``drift`` for an unseen shape that still passes the schema (or has none to
+    check) and ``invalid`` when the unseen shape fails it.
+    """
+
+    def __init__(self, endpoint: str, fingerprint: str, status: str, error: Optional[str] = None):
+        self.endpoint = endpoint
+        self.fingerprint = fingerprint
+        self.status = status
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "invalid"
+
+    @property
+    def validated(self) -> bool:
+        return self.status != "match"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"endpoint": self.endpoint, "fingerprint": self.fingerprint, "status": self.status,
+                "error": self.error}
+
+
+class ShapeBaselines:
+    """Accepted response fingerprints per endpoint, stored as JSON at ``path``
+
+    ``check`` hashes a response body and only runs full schema validation when the hash is
+    not among the endpoint's accepted fingerprints. An unseen shape that passes the schema
+    is accepted as a new variant, so it is validated once rather than on every response;
+    with ``update`` set, previously accepted variants are dropped as each endpoint is first
+    checked, re-recording the baseline from this run. Thread-safe; call ``save()`` at the
+    end of a run. Saving merges with whatever is on disk, so xdist workers sharing a file
+    only add to it.
+    """
+
+    def __init__(self, path: Optional[str] = None, update: bool = False, sample: int = ARRAY_SAMPLE):
+        self.path = path
+        self.update = update
+        self.sample = sample
+        self._lock = threading.Lock()
+        self._accepted: Dict[str, List[str]] = self._load() if path and not update else {}
+        self._refreshed: set = set()
+        self._dirty = False
+        self.counts = {"match": 0, "new": 0, "drift": 0, "invalid": 0}
+        self.changes: List[Dict[str, Any]] = []
+
+    def _load(self) -> Dict[str, List[str]]:
+        try:
+            with open(self.path) as f:
+                return {endpoint: list(entry["fingerprints"]) for endpoint, entry in json.load(f).items()}
+        except FileNotFoundError:
+            return {}
+
+    def fingerprints(self, endpoint: str) -> List[str]:
+        with self._lock:
+            return list(self._accepted.get(endpoint, ()))
+
+    def check(self, endpoint: str, data: Any, schema: Optional[Dict[str, Any]] = None) -> ShapeCheck:
+        """Compare ``data`` with the endpoint's baseline, validating against ``schema`` on a mismatch"""
+        shape = fingerprint(data, self.sample)
+        with self._lock:
+            if self.update and endpoint not in self._refreshed:
+                self._refreshed.add(endpoint)
+                self._accepted.pop(endpoint, None)
+            known = self._accepted.get(endpoint)
+            if known is not None and shape in known:
+                self.counts["match"] += 1
+                return ShapeCheck(endpoint, shape, "match")
+        error = None
+        if schema is not None:
+            try:
+                validate(instance=data, schema=schema)
+            except ValidationError as e:
+                error = f"Schema mismatch: {e.message}"
+        with self._lock:
+            known = self._accepted.setdefault(endpoint, [])
+            if error is not None:
+                status = "invalid"
+            elif shape in known:  # accepted by another thread meanwhile
+                status = "match"
+            else:
+                status = "new" if not known else "drift"
+                known.append(shape)
+                del known[:-MAX_VARIANTS]
+                self._dirty = True
+            self.counts[status] += 1
+            result = ShapeCheck(endpoint, shape, status, error)
+            if status in ("drift", "invalid"):
+                self.changes.append(result.to_dict())
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Check counts by outcome, the share that needed schema validation and every changed shape"""
+        with self._lock:
+            checks = sum(self.counts.values())
+            return dict(self.counts, checks=checks, endpoints=len(self._accepted),
+                        validated_ratio=round((checks - self.counts["match"]) / checks, 3) if checks else 0.0,
+                        changes=list(self.changes))
+
+    def save(self):
+        """Write accepted fingerprints to ``path``, merged with the file's current contents"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            merged = self._load()
+            for endpoint, shapes in self._accepted.items():
+                stored = [] if endpoint in self._refreshed else merged.get(endpoint, [])
+                merged[endpoint] = (stored + [shape for shape in shapes if shape not in stored])[-MAX_VARIANTS:]
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            # Replace atomically so a concurrent reader never sees a half-written file
+            descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(descriptor, "w") as f:
+                json.dump({endpoint: {"fingerprints": shapes} for endpoint, shapes in sorted(merged.items())},
+                          f, indent=2)
+            os.replace(temporary, self.path)
+            self._dirty = False
@@ -0,0 +1,155 @@
+"""
+Table-driven endpoint sweeps: one row per request and expected outcome, run as pytest cases or concurrently
+"""
+import time
+from typing import Any, Dict, Iterable, List, Optional, Union
+from jsonschema import ValidationError, validate
+from core.api_client import APIClient
+from core.body import json_body
+from core.compression import endpoint_key
+from core.parallel import run_parallel
+from core.shape import ShapeBaselines
+
+
+BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+
+class SweepCase:
+    """One endpoint check: the request to send and the status (and optionally schema) expected back"""
+
+    def __init__(self, path: str, expected_status: Union[int, List[int]] = 200, method: str = "GET",
+                 params: Optional[Dict[str, Any]] = None, body: Optional[Any] = None,
+                 schema: Optional[Dict[str, Any]] = None, name: Optional[str] = None, marks: Iterable = ()):
+        self.path = path
+        self.expected_status = expected_status
+        self.method = method.upper()
+        self.params = params
+        self.body = body
+        self.schema = schema
+        self.name = name
+        self.marks = tuple(marks)
+
+    @property
+    def id(self) -> str:
+        if self.name:
+            return self.name
+        query = "&".join(f"{key}={value}" for key, value in (self.params or {}).items())
+        return f"{self.method} {self.path}" + (f"?{query}" if query else "")
+
+    def expects(self, status: int) -> bool:
+        if isinstance(self.expected_status, int):
+            return status == self.expected_status
+        return status in self.expected_status
+
+    def __repr__(self) -> str:
+        return f"SweepCase({self.id} -> {self.expected_status})"
+
+
+class SweepResult:
+    """Outcome of one case; ``error`` explains a status, schema or transport failure"""
+
+    def __init__(self, case: SweepCase, status_code: Optional[int], elapsed: float, error: Optional[str]):
+        self.case = case
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def elapsed_ms(self) -> float:
+        return round(self.elapsed * 1000, 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"case": self.case.id, "expected_status": self.case.expected_status, "status_code": self.status_code,
+                "elapsed_ms": self.elapsed_ms, "error": self.error}
+
+
+def run_case(client: APIClient, case: SweepCase, shapes: Optional[ShapeBaselines] = None) -> SweepResult:
+    """Send one case through the client and check status, then schema
+
+    With ``shapes`` the body is fingerprinted and the schema is validated only when the
+    shape differs from the endpoint's baseline.
+    """
+    kwargs: Dict[str, Any] = {"params": case.params}
+    if case.body is not None:
+        kwargs["json_data" if case.method in BODY_METHODS else "json"] = case.body
+    started = time.perf_counter()
+    try:
+        response = getattr(client, case.method.lower())(case.path, **kwargs)
+    except Exception as e:
+        return SweepResult(case, None, time.perf_counter() - started, f"{type(e).__name__}: {e}")
+    elapsed = time.perf_counter() - started
+    if not case.expects(response.status_code):
+        return SweepResult(case, response.status_code, elapsed,
+                           f"Expected status {case.expected_status}, got {response.status_code}")
+    if case.schema is not None:
+        try:
+            data = json_body(response)
+            if shapes is not None:
+                check = shapes.check(endpoint_key(case.method, response.url), data, case.schema)
+                if not check.ok:
+                    return SweepResult(case, response.status_code, elapsed, check.error)
+            else:
+                validate(instance=data, schema=case.schema)
+        except ValueError as e:
+            return SweepResult(case, response.status_code, elapsed, f"Invalid JSON: {e}")
+        except ValidationError as e:
+            return SweepResult(case, response.status_code, elapsed, f"Schema mismatch: {e.message}")
+    return SweepResult(case, response.status_code, elapsed, None)
+
+
+class Sweep:
+    """A table of SweepCases
+
+    ``params()`` turns the table into pytest parameters, one test per row. ``run()`` sends
+    every row concurrently through one client and returns results in table order.
+    """
+
+    def __init__(self, cases: Iterable[SweepCase]):
+        self.cases = list(cases)
+
+    def __len__(self) -> int:
+        return len(self.cases)
+
+    def params(self) -> List[Any]:
+        """Rows as ``pytest.param`` values with readable ids, for ``@pytest.mark.parametrize``"""
+        import pytest  # only needed when generating test cases
+        return [pytest.param(case, id=case.id, marks=case.marks) for case in self.cases]
+
+    def run(self, client: APIClient, concurrency: int = 16,
+            shapes: Optional[ShapeBaselines] = None) -> List[SweepResult]:
+        """Run every row; ``client`` must be thread-safe when ``concurrency`` > 1"""
+        if concurrency > 1 and not client.thread_safe:
+            raise ValueError("Concurrent sweeps need APIClient(thread_safe=True)")
+        return run_parallel(lambda case: run_case(client, case, shapes), self.cases, max_workers=concurrency)
+
+    @staticmethod
+    def summary(results: List[SweepResult], elapsed_s: Optional[float] = None) -> Dict[str, Any]:
+        """Pass/fail counts and latency extremes, with rows per second when the wall time is given"""
+        latencies = sorted(result.elapsed_ms for result in results)
+        report = {
+            "cases": len(results),
+            "passed": sum(result.ok for result in results),
+            "failed": [result.to_dict() for result in results if not result.ok],
+            "slowest_ms": latencies[-1] if latencies else 0.0,
+            "median_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+        }
+        if elapsed_s is not None:
+            report["elapsed_s"] = round(elapsed_s, 3)
+            report["cases_per_second"] = round(len(results) / elapsed_s, 1) if elapsed_s > 0 else 0.0
+        return report
+
+
+def format_results(results: List[SweepResult]) -> str:
+    """Per-row table of status and latency"""
+    width = max([len(result.case.id) for result in results] + [4]) + 2
+    lines = [f"{'case':<{width}}{'expected':>10}{'status':>8}{'ms':>10}  result"]
+    for result in results:
+        expected = result.case.expected_status
+        expected = expected if isinstance(expected, int) else "/".join(map(str, expected))
+        lines.append(f"{result.case.id:<{width}}{expected:>10}{result.status_code or '-':>8}"
+                     f"{result.elapsed_ms:>10.2f}  {'ok' if result.ok else result.error}")
+    return "\n".join(lines)
@@ -34,6 +34,11 @@ class APIValidator:
         response_time_ms = response.elapsed.total_seconds() * 1000
         return response_time_ms <= max_time_ms
     
+    @staticmethod
+    def validate_latency_percentile(histogram, percentile: float, max_time_ms: float) -> bool:
+        """Validate a latency percentile recorded in a LatencyHistogram"""
+        return histogram.percentile_ms(percentile) <= max_time_ms
+    
     @staticmethod
     def validate_headers(response, required_headers: Dict[str, str]) -> bool:
         """Validate response headers"""
@@ -145,3 +150,45 @@ COMMENT_SCHEMA = {
     },
     "required": ["postId", "id", "name", "email", "body"]
 }
+
+
+# Cat Facts API (catfact.ninja)
+CAT_FACT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "fact": {"type": "string"},
+        "length": {"type": "integer"}
+    },
+    "required": ["fact", "length"]
+}
+
+CAT_BREED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "breed": {"type": "string"},
+        "country": {"type": "string"},
+        "origin": {"type": "string"},
+        "coat": {"type": "string"},
+        "pattern": {"type": "string"}
+    },
+    "required": ["breed", "country", "origin", "coat", "pattern"]
+}
+
+
+def list_schema(item_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema of a JSON array of ``item_schema`` items"""
+    return {"type": "array", "items": item_schema}
+
+
+def cat_facts_page_schema(item_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema of a paginated Cat Facts list of ``item_schema`` items"""
+    return {
+        "type": "object",
+        "properties": {
+            "data": {"type": "array", "items": item_schema},
+            "current_page": {"type": "integer"},
+            "per_page": {"type": "integer"},
+            "total": {"type": "integer"}
+        },
+        "required": ["data", "current_page", "per_page", "total"]
+    }
@@ -0,0 +1,43 @@
+"""
+Lightweight asyncio keep-alive HTTP/1.1 connection for load generation
+"""
+import asyncio
+from typing import Dict, Optional, Tuple
+from core.http11 import build_request, read_response
+
+
+class AsyncHTTPConnection:
+    """Single persistent connection issuing one request at a time"""
+
+    def __init__(self, host: str, port: int, headers: Optional[Dict[str, str]] = None):
+        self.host = host
+        self.port = port
+        self.headers = headers or {"Accept": "application/json"}
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, target: str, body: bytes = b"",
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """Send a request, reconnecting first if the previous one left the socket closed"""
+        if self._writer is None or self._writer.is_closing():
+            await self._connect()
+        request_headers = dict(self.headers, **headers) if headers else self.headers
+        try:
+            self._writer.write(build_request(method, target, f"{self.host}:{self.port}", body, request_headers))
+            status, headers, payload = await read_response(self._reader, method)
+        except BaseException:
+            self.close()
+            raise
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, headers, payload
+
+    def close(self):
+        """Drop the underlying socket"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._reader = None
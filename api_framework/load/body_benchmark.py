@@ -0,0 +1,155 @@
+"""
+Allocation benchmark for large response bodies: requests' default path vs the buffer pipeline
+"""
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import statistics
+import tracemalloc
+import multiprocessing
+from typing import Any, Callable, Dict, List
+import requests
+from requests.adapters import HTTPAdapter
+from core.body import digest, json_body, preview
+from core.compression import AccountingAdapter
+from stubs.jsonplaceholder import StubServer, JSON_HEADERS
+
+
+PIPELINES = ("requests", "buffer")
+
+
+class PayloadStub:
+    """Serve one JSON collection of roughly ``size`` bytes at every path"""
+
+    def __init__(self, size: int):
+        items, encoded = [], 2
+        while encoded < size:
+            item = {"postId": len(items) // 5 + 1, "id": len(items) + 1, "name": f"comment {len(items) + 1}",
+                    "email": f"commenter{len(items) + 1}@example.com", "body": "lorem ipsum dolor sit amet " * 8}
+            items.append(item)
+            encoded += len(json.dumps(item)) + 2
+        self.payload = json.dumps(items).encode("utf-8")
+
+    def handle(self, method, path, query, body=b"", headers=None):
+        return 200, dict(JSON_HEADERS), self.payload
+
+
+def _serve_payload(size: int, ready: "multiprocessing.Queue"):
+    """Serve a PayloadStub from its own process so its allocations are not traced"""
+    async def run():
+        server = StubServer(stub=PayloadStub(size))
+        await server.start()
+        ready.put(server.port)
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+def _requests_pipeline(session: requests.Session, url: str):
+    """What callers did before: parse via response.text, hash content, slice text for the log"""
+    response = session.get(url, timeout=60)
+    data = response.json()
+    checksum = hashlib.sha256(response.content).hexdigest()
+    logged = response.text[:500]
+    return data, checksum, logged
+
+
+def _buffer_pipeline(session: requests.Session, url: str):
+    """Body read into one buffer, parsed, hashed and previewed in place"""
+    response = session.get(url, timeout=60)
+    data = json_body(response)
+    checksum = digest(response.content)
+    logged = preview(response.content)
+    return data, checksum, logged
+
+
+def _session(pipeline: str) -> requests.Session:
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = "identity"
+    session.mount("http://", AccountingAdapter(max_retries=0) if pipeline == "buffer" else HTTPAdapter(max_retries=0))
+    return session
+
+
+def measure(pipeline: str, url: str, repeats: int = 5) -> Dict[str, Any]:
+    """Peak and transient traced allocation of one request, and the median time over ``repeats``
+
+    Transient bytes are the peak minus what is still held once the parsed data is returned:
+    the copies made on the way.
+    """
+    if pipeline not in PIPELINES:
+        raise ValueError(f"Unknown pipeline {pipeline!r}, expected one of {', '.join(PIPELINES)}")
+    run: Callable = _buffer_pipeline if pipeline == "buffer" else _requests_pipeline
+    session = _session(pipeline)
+    try:
+        body_bytes = len(session.get(url, timeout=60).content)  # also warms the connection
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            run(session, url)
+            timings.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            result = run(session, url)
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del result
+    finally:
+        session.close()
+    return {
+        "pipeline": pipeline,
+        "body_mb": round(body_bytes / 2 ** 20, 2),
+        "peak_mb": round(peak / 2 ** 20, 2),
+        "peak_over_body": round(peak / body_bytes, 2),
+        "transient_mb": round((peak - retained) / 2 ** 20, 2),
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+    }
+
+
+def run_benchmark(sizes_mb: List[float], repeats: int = 5) -> List[Dict[str, Any]]:
+    """Measure each pipeline against payloads of each size"""
+    reports = []
+    for size_mb in sizes_mb:
+        ready = multiprocessing.Queue()
+        server = multiprocessing.Process(target=_serve_payload, args=(int(size_mb * 2 ** 20), ready), daemon=True)
+        server.start()
+        try:
+            url = f"http://127.0.0.1:{ready.get(timeout=60)}/comments"
+            reports.extend(measure(pipeline, url, repeats) for pipeline in PIPELINES)
+        finally:
+            server.terminate()
+            server.join()
+    return reports
+
+
+def format_reports(reports: List[Dict[str, Any]]) -> str:
+    """Table of pipeline reports"""
+    lines = [f"{'pipeline':>10}{'body MB':>10}{'peak MB':>10}{'peak/body':>11}{'transient MB':>14}"
+             f"{'median ms':>11}"]
+    for report in reports:
+        lines.append(f"{report['pipeline']:>10}{report['body_mb']:>10.2f}{report['peak_mb']:>10.2f}"
+                     f"{report['peak_over_body']:>11.2f}{report['transient_mb']:>14.2f}{report['median_ms']:>11.2f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response body allocation benchmark")
+    parser.add_argument("--size-mb", type=float, action="append", help="Payload size, repeatable")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed requests per pipeline and size")
+    parser.add_argument("--output", help="Write the JSON reports to this file")
+    args = parser.parse_args()
+
+    reports = run_benchmark(args.size_mb or [2, 8, 32], args.repeats)
+    print(format_reports(reports))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
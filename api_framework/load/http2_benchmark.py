@@ -0,0 +1,131 @@
+"""
+Compare APIClient over pooled HTTP/1.1 connections and multiplexed HTTP/2
+"""
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+import requests
+from core.api_client import APIClient
+from core.histogram import LatencyHistogram
+from core.compression import AccountingAdapter
+from core.http2_adapter import HTTP2Adapter
+from stubs.jsonplaceholder import StubServer, JSONPlaceholderStub
+from stubs.http2_server import HTTP2StubServer
+
+
+DEFAULT_PATHS = ["/posts/1", "/users/1", "/comments?postId=1"]
+PERCENTILES = [50, 90, 99]
+TRANSPORTS = ("http1", "http2")
+
+
+class DelayedStub:
+    """Wrap a stub so every response takes a fixed server-side time"""
+
+    def __init__(self, stub: JSONPlaceholderStub, delay: float):
+        self.stub = stub
+        self.delay = delay
+
+    async def handle(self, method, path, query, body=b"", headers=None):
+        await asyncio.sleep(self.delay)
+        return self.stub.handle(method, path, query, body, headers)
+
+
+def run_transport(transport: str, concurrency: int = 16, requests_count: int = 1000,
+                  paths: Optional[List[str]] = None, latency_ms: float = 0) -> Dict[str, Any]:
+    """Send requests from ``concurrency`` threads sharing one client; report what it cost"""
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {transport!r}, expected one of {', '.join(TRANSPORTS)}")
+    paths = paths or DEFAULT_PATHS
+    stub = DelayedStub(JSONPlaceholderStub(), latency_ms / 1000) if latency_ms else None
+    server = (HTTP2StubServer(stub=stub) if transport == "http2" else StubServer(stub=stub)).start_in_thread()
+    client = APIClient(base_url=server.base_url)
+    # The HTTP/1.1 side is the client's current adapter, unchanged
+    adapter = HTTP2Adapter() if transport == "http2" else AccountingAdapter(max_retries=0)
+    client.mount("http://", adapter)
+
+    def worker(indexes: range):
+        histogram = LatencyHistogram(highest_trackable_us=600_000_000)
+        errors = 0
+        for index in indexes:
+            started = time.perf_counter()
+            try:
+                if client.get(paths[index % len(paths)]).status_code >= 400:
+                    errors += 1
+            except requests.exceptions.RequestException:
+                errors += 1
+            histogram.record_seconds(time.perf_counter() - started)
+        return histogram, errors
+
+    merged = LatencyHistogram(highest_trackable_us=600_000_000)
+    errors = 0
+    started = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            shards = [range(offset, requests_count, concurrency) for offset in range(concurrency)]
+            for histogram, shard_errors in executor.map(worker, shards):
+                merged.add(histogram)
+                errors += shard_errors
+        elapsed = time.monotonic() - started
+    finally:
+        client.close()
+        server.stop()
+
+    report = {
+        "transport": transport,
+        "concurrency": concurrency,
+        "requests": requests_count,
+        "errors": errors,
+        "connections": server.stats["connections"],
+        "requests_per_second": round(requests_count / elapsed, 1) if elapsed > 0 else 0.0,
+        "elapsed_s": round(elapsed, 3),
+    }
+    if transport == "http2":
+        report["max_concurrent_streams"] = server.stats["max_concurrent_streams"]
+    report.update(merged.percentiles_ms(PERCENTILES))
+    return report
+
+
+def compare_transports(**kwargs) -> List[Dict[str, Any]]:
+    """Run the same workload over each transport"""
+    return [run_transport(transport, **kwargs) for transport in TRANSPORTS]
+
+
+def format_reports(reports: List[Dict[str, Any]]) -> str:
+    """Side-by-side table of transport reports"""
+    lines = [f"{'transport':>10}{'connections':>13}{'req/s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'errors':>8}"]
+    for report in reports:
+        lines.append(f"{report['transport']:>10}{report['connections']:>13}{report['requests_per_second']:>10.0f}"
+                     f"{report['p50_ms']:>9.2f}{report['p90_ms']:>9.2f}{report['p99_ms']:>9.2f}"
+                     f"{report['errors']:>8}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/1.1 vs HTTP/2 transport benchmark")
+    parser.add_argument("--concurrency", type=int, default=32, help="Client threads sharing one APIClient")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per transport")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Server-side time per response")
+    parser.add_argument("--path", action="append", help="Path to request, repeatable")
+    parser.add_argument("--output", help="Write the JSON reports to this file")
+    args = parser.parse_args()
+
+    # Per-request INFO logging would dominate the client-side cost
+    logging.getLogger("core.api_client").setLevel(logging.WARNING)
+    # The HTTP/1.1 pool discards sockets beyond its size; that churn is what is being measured
+    logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+    reports = compare_transports(concurrency=args.concurrency, requests_count=args.requests,
+                                 paths=args.path, latency_ms=args.latency_ms)
+    print(format_reports(reports))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+    return 0 if all(report["errors"] == 0 for report in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Multi-process load driver: one asyncio event loop per core, latencies in shared memory
+"""
+import os
+import sys
+import time
+import json
+import asyncio
+import argparse
+import multiprocessing
+from typing import Dict, Any, List, Optional, Callable
+from urllib.parse import urlsplit
+from load.async_http import AsyncHTTPConnection
+from load import shared_histogram
+from load.shared_histogram import SharedHistogram
+from core.histogram import LatencyHistogram
+
+
+DEFAULT_PATHS = ["/posts/1", "/users/1", "/comments?postId=1"]
+PERCENTILES = [50, 90, 99, 99.9]
+# Pause after a failed request, doubling per consecutive failure, so a dead or restarting
+# backend is retried a few times a second instead of in a tight loop
+ERROR_BACKOFF_S = 0.01
+MAX_ERROR_BACKOFF_S = 1.0
+
+
+async def _connection_loop(connection: AsyncHTTPConnection, paths: List[str], offset: int,
+                           histogram: SharedHistogram, deadline: float):
+    position = offset
+    failures = 0
+    while time.monotonic() < deadline:
+        path = paths[position % len(paths)]
+        position += 1
+        started = time.perf_counter_ns()
+        try:
+            status, _, _ = await connection.request("GET", path)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            histogram.record_error()
+            failures += 1
+            backoff = min(MAX_ERROR_BACKOFF_S, ERROR_BACKOFF_S * 2 ** (failures - 1))
+            await asyncio.sleep(max(0.0, min(backoff, deadline - time.monotonic())))
+            continue
+        failures = 0
+        if status >= 400:
+            histogram.record_error()
+        else:
+            histogram.record((time.perf_counter_ns() - started) // 1000)
+    connection.close()
+
+
+async def _worker_main(host: str, port: int, paths: List[str], connections: int,
+                       duration: float, histogram: SharedHistogram):
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(
+        _connection_loop(AsyncHTTPConnection(host, port), paths, index, histogram, deadline)
+        for index in range(connections)
+    ))
+
+
+def _worker(host: str, port: int, paths: List[str], connections: int, duration: float,
+            raw_slots, start_barrier):
+    """Process entry point; writes only into its own shared histogram"""
+    histogram = SharedHistogram(raw_slots)
+    start_barrier.wait()
+    asyncio.run(_worker_main(host, port, paths, connections, duration, histogram))
+
+
+def summarize(histogram: LatencyHistogram, errors: int, elapsed_s: float) -> Dict[str, Any]:
+    """Request, error, throughput and percentile figures for a merged histogram"""
+    requests = histogram.total_count
+    summary = {
+        "requests": requests,
+        "errors": errors,
+        "requests_per_second": requests / elapsed_s if elapsed_s > 0 else 0.0,
+    }
+    summary.update(histogram.percentiles_ms(PERCENTILES))
+    return summary
+
+
+class MultiProcessLoadDriver:
+    """Spawn one event-loop worker per process and merge their histograms live"""
+
+    def __init__(self, base_url: str, paths: Optional[List[str]] = None, processes: Optional[int] = None,
+                 connections_per_process: int = 32, duration: float = 10.0, report_interval: float = 1.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError(f"Only plain http targets are supported, got {base_url}")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.paths = [self.prefix + path for path in (paths or DEFAULT_PATHS)]
+        self.processes = processes or os.cpu_count() or 1
+        self.connections_per_process = connections_per_process
+        self.duration = duration
+        self.report_interval = report_interval
+
+    def run(self, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Run the load and return the merged report"""
+        histograms = [SharedHistogram() for _ in range(self.processes)]
+        start_barrier = multiprocessing.Barrier(self.processes + 1)
+        workers = [
+            multiprocessing.Process(
+                target=_worker,
+                args=(self.host, self.port, self.paths, self.connections_per_process,
+                      self.duration, histogram.raw, start_barrier),
+                daemon=True,
+            )
+            for histogram in histograms
+        ]
+        for worker in workers:
+            worker.start()
+        start_barrier.wait()
+        started = time.monotonic()
+
+        previous_requests = 0
+        previous_time = started
+        while any(worker.is_alive() for worker in workers):
+            time.sleep(self.report_interval)
+            now = time.monotonic()
+            if on_progress:
+                progress = summarize(*shared_histogram.merge(histograms), now - started)
+                progress["elapsed_s"] = now - started
+                progress["interval_rps"] = (progress["requests"] - previous_requests) / (now - previous_time)
+                on_progress(progress)
+                previous_requests, previous_time = progress["requests"], now
+
+        for worker in workers:
+            worker.join()
+        elapsed = min(time.monotonic() - started, self.duration) or self.duration
+        merged, errors = shared_histogram.merge(histograms)
+        report = summarize(merged, errors, elapsed)
+        report.update({
+            "processes": self.processes,
+            "connections": self.processes * self.connections_per_process,
+            "elapsed_s": elapsed,
+            "per_process_requests": [histogram.histogram.total_count for histogram in histograms],
+        })
+        return report
+
+
+def scaling_run(base_url: str, process_counts: List[int], **kwargs) -> List[Dict[str, Any]]:
+    """Run the same load at several process counts to measure scaling efficiency"""
+    reports = []
+    for processes in process_counts:
+        report = MultiProcessLoadDriver(base_url, processes=processes, **kwargs).run()
+        baseline = reports[0] if reports else report
+        per_process_baseline = baseline["requests_per_second"] / baseline["processes"]
+        report["scaling_efficiency"] = (
+            report["requests_per_second"] / (per_process_baseline * processes) if per_process_baseline else 0.0
+        )
+        reports.append(report)
+    return reports
+
+
+def _print_progress(progress: Dict[str, Any]):
+    print(f"[{progress['elapsed_s']:6.1f}s] {progress['requests']:>9} req "
+          f"{progress['interval_rps']:>9.0f} req/s  p50 {progress['p50_ms']:.2f}ms  "
+          f"p99 {progress['p99_ms']:.2f}ms  errors {progress['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process HTTP load driver")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Plain http target")
+    parser.add_argument("--path", action="append", help="Path to request, repeatable")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--connections", type=int, default=32, help="Connections per process")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run")
+    parser.add_argument("--scaling", action="store_true", help="Repeat with 1, 2, 4... processes")
+    parser.add_argument("--stub-workers", type=int, default=0,
+                       help="Start a local JSONPlaceholder stand-in with this many processes")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.stub_workers:
+        from stubs.jsonplaceholder import serve
+        parts = urlsplit(args.base_url)
+        serve(parts.hostname, parts.port or 80, args.stub_workers)
+        time.sleep(0.5)
+
+    options = {"paths": args.path, "connections_per_process": args.connections, "duration": args.duration}
+    if args.scaling:
+        counts = [count for count in (1, 2, 4, 8, 16, 32, 64) if count < args.processes] + [args.processes]
+        reports = scaling_run(args.base_url, counts, **options)
+        print(f"{'processes':>10}{'req/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'efficiency':>12}")
+        for report in reports:
+            print(f"{report['processes']:>10}{report['requests_per_second']:>12.0f}"
+                  f"{report['p50_ms']:>10.2f}{report['p99_ms']:>10.2f}{report['scaling_efficiency']:>12.0%}")
+        result: Any = reports
+    else:
+        result = MultiProcessLoadDriver(args.base_url, processes=args.processes, **options).run(_print_progress)
+        print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0 if not isinstance(result, dict) or result["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Compare sequential service calls with run_parallel over one thread-safe client
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+from typing import Any, Dict, List
+from core.api_client import APIClient
+from core.parallel import run_parallel
+from services.posts_service import PostsService
+from stubs.jsonplaceholder import StubServer, JSONPlaceholderStub
+from load.http2_benchmark import DelayedStub
+
+
+def _timed_run(post_ids: List[int], base_url: str, workers: int) -> Dict[str, Any]:
+    """Fetch every post through PostsService, sequentially when ``workers`` is 1"""
+    client = APIClient(base_url=base_url, thread_safe=workers > 1, pool_size=max(workers, 1))
+    posts = PostsService(client)
+    started = time.monotonic()
+    try:
+        if workers > 1:
+            results = run_parallel(posts.get_post_by_id, post_ids, max_workers=workers)
+        else:
+            results = [posts.get_post_by_id(post_id) for post_id in post_ids]
+        elapsed = time.monotonic() - started
+    finally:
+        client.close()
+    ordered = [result["data"]["id"] if result["data"] else None for result in results] == post_ids
+    return {
+        "workers": workers,
+        "calls": len(post_ids),
+        "errors": sum(result["status_code"] != 200 for result in results),
+        "ordered": ordered,
+        "elapsed_s": round(elapsed, 3),
+        "calls_per_second": round(len(post_ids) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def compare(calls: int = 200, workers: int = 16, latency_ms: float = 20) -> Dict[str, Any]:
+    """Run the same calls sequentially and through run_parallel against a stand-in"""
+    server = StubServer(stub=DelayedStub(JSONPlaceholderStub(), latency_ms / 1000)).start_in_thread()
+    post_ids = [index % 100 + 1 for index in range(calls)]
+    try:
+        sequential = _timed_run(post_ids, server.base_url, workers=1)
+        connections_before = server.stats["connections"]
+        parallel = _timed_run(post_ids, server.base_url, workers=workers)
+        parallel["connections"] = server.stats["connections"] - connections_before
+    finally:
+        server.stop()
+    speedup = sequential["elapsed_s"] / parallel["elapsed_s"] if parallel["elapsed_s"] else 0.0
+    return {"sequential": sequential, "parallel": parallel, "speedup": round(speedup, 2)}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Table of the sequential and parallel runs"""
+    lines = [f"{'run':>12}{'workers':>9}{'calls':>7}{'calls/s':>10}{'elapsed s':>11}{'errors':>8}{'ordered':>9}"]
+    for name in ("sequential", "parallel"):
+        run = report[name]
+        lines.append(f"{name:>12}{run['workers']:>9}{run['calls']:>7}{run['calls_per_second']:>10.0f}"
+                     f"{run['elapsed_s']:>11.3f}{run['errors']:>8}{str(run['ordered']):>9}")
+    lines.append(f"speedup: {report['speedup']:.2f}x over {report['parallel']['connections']} connections")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs run_parallel service calls")
+    parser.add_argument("--calls", type=int, default=200, help="Service calls per run")
+    parser.add_argument("--workers", type=int, default=16, help="Threads sharing the thread-safe client")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Server-side time per response")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    # Per-request INFO logging would dominate the client-side cost
+    logging.getLogger("core.api_client").setLevel(logging.WARNING)
+    report = compare(calls=args.calls, workers=args.workers, latency_ms=args.latency_ms)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["sequential"]["errors"] == report["parallel"]["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
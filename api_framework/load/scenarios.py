@@ -0,0 +1,238 @@
+"""
+Closed-loop scenario engine for running service workflows as virtual users
+"""
+import random
+import threading
+import time
+import logging
+from typing import Dict, Any, List, Optional, Callable, Union, Tuple
+from core.api_client import APIClient
+from services.posts_service import PostsService
+from services.users_service import UsersService
+from services.comments_service import CommentsService
+from core.histogram import LatencyHistogram
+
+
+PERCENTILES = [50, 90, 95, 99]
+
+
+class Step:
+    """Single named action inside a scenario"""
+
+    def __init__(self, name: str, action: Callable[["VirtualUser"], Dict[str, Any]],
+                 expected_status: Union[int, List[int]] = 200):
+        self.name = name
+        self.action = action
+        self.expected_status = expected_status
+
+    def is_success(self, result: Dict[str, Any]) -> bool:
+        """Check the service result against the expected status"""
+        if isinstance(self.expected_status, int):
+            return result["status_code"] == self.expected_status
+        return result["status_code"] in self.expected_status
+
+
+class Scenario:
+    """Weighted sequence of steps executed by a virtual user"""
+
+    def __init__(self, name: str, steps: List[Step], weight: int = 1,
+                 think_time: Tuple[float, float] = (0.0, 0.0)):
+        if weight <= 0:
+            raise ValueError(f"Scenario weight must be positive, got {weight}")
+        self.name = name
+        self.steps = steps
+        self.weight = weight
+        self.think_time = think_time
+
+
+class VirtualUser:
+    """Per-user context holding its own client, services and scratch data"""
+
+    def __init__(self, user_id: int, base_url: Optional[str] = None, seed: Optional[int] = None):
+        self.user_id = user_id
+        self.api_client = APIClient(base_url=base_url)
+        self.posts = PostsService(self.api_client)
+        self.users = UsersService(self.api_client)
+        self.comments = CommentsService(self.api_client)
+        self.random = random.Random(seed)
+        self.data: Dict[str, Any] = {}
+
+    def close(self):
+        """Release the underlying HTTP session"""
+        self.api_client.close()
+
+
+class ScenarioStats:
+    """Thread-safe collector for step and scenario latencies in constant memory"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.scenarios: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _new_entry() -> Dict[str, Any]:
+        return {"count": 0, "errors": 0, "histogram": LatencyHistogram()}
+
+    def record_step(self, scenario: str, step: str, elapsed_s: float, ok: bool):
+        """Record the outcome of a single step"""
+        with self._lock:
+            entry = self.steps.setdefault((scenario, step), self._new_entry())
+            entry["count"] += 1
+            entry["errors"] += 0 if ok else 1
+            entry["histogram"].record_seconds(elapsed_s)
+
+    def record_scenario(self, scenario: str, elapsed_s: float, ok: bool):
+        """Record the outcome of a full scenario iteration"""
+        with self._lock:
+            entry = self.scenarios.setdefault(scenario, self._new_entry())
+            entry["count"] += 1
+            entry["errors"] += 0 if ok else 1
+            entry["histogram"].record_seconds(elapsed_s)
+
+
+def summarize(entry: Dict[str, Any], elapsed_s: float) -> Dict[str, Any]:
+    """Turn a raw stats entry into count, error and percentile figures"""
+    summary = entry["histogram"].summary(PERCENTILES)
+    summary.update({
+        "count": entry["count"],
+        "errors": entry["errors"],
+        "throughput": entry["count"] / elapsed_s if elapsed_s > 0 else 0.0,
+    })
+    return summary
+
+
+class ScenarioRunner:
+    """Run weighted scenarios with a fixed number of closed-loop virtual users"""
+
+    def __init__(self, scenarios: List[Scenario], concurrency: int, duration: float,
+                 ramp_up: float = 0.0, ramp_down: float = 0.0,
+                 base_url: Optional[str] = None, seed: Optional[int] = None):
+        if not scenarios:
+            raise ValueError("At least one scenario is required")
+        if concurrency <= 0:
+            raise ValueError(f"Concurrency must be positive, got {concurrency}")
+        self.scenarios = scenarios
+        self.concurrency = concurrency
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.ramp_down = ramp_down
+        self.base_url = base_url
+        self.seed = seed
+        self.stats = ScenarioStats()
+        self.logger = logging.getLogger(__name__)
+        self._weights = [scenario.weight for scenario in scenarios]
+
+    def _schedule(self, index: int) -> Tuple[float, float]:
+        """Start and stop offsets for a virtual user, staggered by ramp-up/ramp-down"""
+        start = self.ramp_up * index / self.concurrency
+        stop = self.ramp_up + self.duration + self.ramp_down * (self.concurrency - index) / self.concurrency
+        return start, stop
+
+    def _think(self, vu: VirtualUser, scenario: Scenario, stop_at: float, stopped: threading.Event):
+        """Pause between actions without overrunning the user's stop time"""
+        low, high = scenario.think_time
+        if high <= 0:
+            return
+        pause = min(vu.random.uniform(low, high), max(0.0, stop_at - time.monotonic()))
+        stopped.wait(pause)
+
+    def _run_iteration(self, vu: VirtualUser, scenario: Scenario, stop_at: float, stopped: threading.Event):
+        """Execute every step of one scenario and record latencies"""
+        vu.data = {}
+        scenario_ok = True
+        scenario_start = time.perf_counter()
+        for position, step in enumerate(scenario.steps):
+            if position:
+                self._think(vu, scenario, stop_at, stopped)
+            step_start = time.perf_counter()
+            try:
+                result = step.action(vu)
+                ok = step.is_success(result)
+            except Exception as e:
+                self.logger.warning(f"Step {scenario.name}/{step.name} failed: {e}")
+                ok = False
+            self.stats.record_step(scenario.name, step.name, time.perf_counter() - step_start, ok)
+            if not ok:
+                scenario_ok = False
+                break
+        self.stats.record_scenario(scenario.name, time.perf_counter() - scenario_start, scenario_ok)
+
+    def _virtual_user(self, index: int, started_at: float, stopped: threading.Event):
+        """Closed loop: pick a scenario, run it, think, repeat until stop time"""
+        start_offset, stop_offset = self._schedule(index)
+        if stopped.wait(max(0.0, started_at + start_offset - time.monotonic())):
+            return
+        seed = None if self.seed is None else self.seed + index
+        vu = VirtualUser(index, base_url=self.base_url, seed=seed)
+        stop_at = started_at + stop_offset
+        try:
+            while time.monotonic() < stop_at and not stopped.is_set():
+                scenario = vu.random.choices(self.scenarios, weights=self._weights)[0]
+                self._run_iteration(vu, scenario, stop_at, stopped)
+                self._think(vu, scenario, stop_at, stopped)
+        finally:
+            vu.close()
+
+    def run(self) -> Dict[str, Any]:
+        """Run the load profile to completion and return the report"""
+        stopped = threading.Event()
+        started_at = time.monotonic()
+        threads = [
+            threading.Thread(target=self._virtual_user, args=(index, started_at, stopped),
+                             name=f"vu-{index}", daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.logger.warning("Interrupted, stopping virtual users")
+            stopped.set()
+            for thread in threads:
+                thread.join()
+        return self.report(time.monotonic() - started_at)
+
+    def report(self, elapsed_s: float) -> Dict[str, Any]:
+        """Build per-step, per-scenario and overall throughput figures"""
+        with self.stats._lock:
+            steps = {f"{scenario}/{step}": summarize(entry, elapsed_s)
+                     for (scenario, step), entry in self.stats.steps.items()}
+            scenarios = {name: summarize(entry, elapsed_s)
+                         for name, entry in self.stats.scenarios.items()}
+        total_requests = sum(step["count"] for step in steps.values())
+        total_iterations = sum(scenario["count"] for scenario in scenarios.values())
+        return {
+            "elapsed_s": elapsed_s,
+            "concurrency": self.concurrency,
+            "requests": total_requests,
+            "errors": sum(step["errors"] for step in steps.values()),
+            "iterations": total_iterations,
+            "requests_per_second": total_requests / elapsed_s if elapsed_s > 0 else 0.0,
+            "iterations_per_second": total_iterations / elapsed_s if elapsed_s > 0 else 0.0,
+            "scenarios": scenarios,
+            "steps": steps,
+        }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render a report as a plain-text table"""
+    columns = ["count", "errors"] + [f"p{pct}_ms" for pct in PERCENTILES] + ["max_ms"]
+    header = f"{'name':<40}" + "".join(f"{column:>10}" for column in columns)
+    lines = [
+        f"Elapsed: {report['elapsed_s']:.1f}s, virtual users: {report['concurrency']}",
+        f"Requests: {report['requests']} ({report['requests_per_second']:.1f}/s), "
+        f"errors: {report['errors']}, iterations: {report['iterations']} "
+        f"({report['iterations_per_second']:.2f}/s)",
+    ]
+    for title, rows in (("Scenarios", report["scenarios"]), ("Steps", report["steps"])):
+        lines.extend(["", title, header])
+        for name, row in sorted(rows.items()):
+            cells = "".join(
+                f"{row[column]:>10}" if isinstance(row[column], int) else f"{row[column]:>10.1f}"
+                for column in columns
+            )
+            lines.append(f"{name:<40}{cells}")
+    return "\n".join(lines)
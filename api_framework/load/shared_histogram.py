@@ -0,0 +1,48 @@
+"""
+Fixed-size latency histograms backed by shared memory
+"""
+from multiprocessing.sharedctypes import RawArray
+from typing import Optional, Sequence, Tuple
+from core.histogram import LatencyHistogram
+
+
+HIGHEST_TRACKABLE_US = 60_000_000
+SIGNIFICANT_FIGURES = 2
+COUNTS_LENGTH = LatencyHistogram.counts_length_for(HIGHEST_TRACKABLE_US, SIGNIFICANT_FIGURES)
+
+# Slot 0 holds the error count, latency counts follow
+ERRORS_SLOT = 0
+SLOTS = COUNTS_LENGTH + 1
+
+
+class SharedHistogram:
+    """Single-writer LatencyHistogram living in a shared-memory array of int64 slots"""
+
+    def __init__(self, raw: Optional[RawArray] = None):
+        self.raw = raw if raw is not None else RawArray("q", SLOTS)
+        self.slots = memoryview(self.raw).cast("B").cast("q")
+        self.histogram = LatencyHistogram(HIGHEST_TRACKABLE_US, SIGNIFICANT_FIGURES, counts=self.slots[1:])
+
+    def record(self, value_us: int):
+        """Record one latency sample"""
+        self.histogram.record(value_us)
+
+    def record_error(self):
+        """Record one failed request"""
+        self.slots[ERRORS_SLOT] += 1
+
+    @property
+    def errors(self) -> int:
+        return self.slots[ERRORS_SLOT]
+
+    def snapshot(self) -> LatencyHistogram:
+        """Private copy; readers tolerate concurrent single-slot increments"""
+        return self.histogram.copy()
+
+
+def merge(histograms: Sequence[SharedHistogram]) -> Tuple[LatencyHistogram, int]:
+    """Merged latency histogram and total error count of several workers"""
+    merged = LatencyHistogram(HIGHEST_TRACKABLE_US, SIGNIFICANT_FIGURES)
+    for shared in histograms:
+        merged.add(shared.histogram)
+    return merged, sum(shared.errors for shared in histograms)
@@ -0,0 +1,296 @@
+"""
+Soak mode: run a scenario mix for hours while sampling process resources and testing them for growth
+"""
+import os
+import sys
+import json
+import math
+import time
+import logging
+import argparse
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+from core.api_client import connection_pool_stats
+from load.scenarios import Scenario, ScenarioRunner, format_report
+from load.workflows import SCENARIOS, build_scenarios
+
+try:
+    import psutil
+except ImportError:  # optional: pip install psutil; /proc is read instead
+    psutil = None
+
+
+# Minimum growth over the analysed window before a significant upward trend counts as a leak
+GROWTH_THRESHOLDS = {
+    "rss_kb": 20 * 1024,
+    "traced_kb": 5 * 1024,
+    "open_fds": 10,
+    "sockets": 10,
+    "pools": 5,
+    "idle_connections": 10,
+    "connections_created": 50,
+}
+
+# Samples fed to the trend test; longer series are thinned evenly
+MAX_TREND_SAMPLES = 500
+
+
+def _rss_kb() -> int:
+    """Current resident set size, or -1 (left out of the trend test) where it cannot be read
+
+    getrusage only reports the peak, which never goes down and so cannot show a leak.
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss // 1024
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return -1
+
+
+def _descriptors() -> Tuple[int, int]:
+    """Open file descriptors and how many of them are sockets"""
+    if psutil is not None:
+        process = psutil.Process()
+        # net_connections replaced connections in psutil 6
+        connections = getattr(process, "net_connections", None) or process.connections
+        return process.num_fds(), len(connections(kind="all"))
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return -1, -1
+    sockets = 0
+    for fd in fds:
+        try:
+            sockets += os.readlink(f"/proc/self/fd/{fd}").startswith("socket:")
+        except OSError:
+            pass  # closed while listing
+    return len(fds), sockets
+
+
+def sample_resources() -> Dict[str, Any]:
+    """One reading of process memory, descriptors and connection pools"""
+    open_fds, sockets = _descriptors()
+    sample = {"rss_kb": _rss_kb(), "open_fds": open_fds, "sockets": sockets}
+    sample.update(connection_pool_stats())
+    if tracemalloc.is_tracing():
+        sample["traced_kb"] = tracemalloc.get_traced_memory()[0] // 1024
+    return sample
+
+
+def _thin(points: List[Tuple[float, float]], limit: int) -> List[Tuple[float, float]]:
+    if len(points) <= limit:
+        return points
+    step = (len(points) - 1) / (limit - 1)
+    return [points[round(index * step)] for index in range(limit)]
+
+
+def trend(points: List[Tuple[float, float]], min_growth: float = 0.0, alpha: float = 0.01) -> Dict[str, Any]:
+    """Mann-Kendall test for a monotonic trend in (seconds, value) samples, with Sen's slope
+
+    ``growing`` is set when the upward trend is significant at ``alpha`` and Sen's slope
+    adds at least ``min_growth`` over the sampled span, so steady noise and small one-off
+    steps are not reported as leaks.
+    """
+    points = _thin(sorted(points), MAX_TREND_SAMPLES)
+    n = len(points)
+    result = {"samples": n, "tau": 0.0, "z": 0.0, "p_value": 1.0, "slope_per_hour": 0.0, "growth": 0.0,
+              "growing": False}
+    if n < 8:
+        return result
+    values = [value for _, value in points]
+    score, slopes = 0, []
+    for i in range(n - 1):
+        t_i, v_i = points[i]
+        for j in range(i + 1, n):
+            t_j, v_j = points[j]
+            score += (v_j > v_i) - (v_j < v_i)
+            if t_j > t_i:
+                slopes.append((v_j - v_i) / (t_j - t_i))
+    # Variance with the correction for tied values, common in integer counters
+    ties: Dict[float, int] = {}
+    for value in values:
+        ties[value] = ties.get(value, 0) + 1
+    variance = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in ties.values())) / 18
+    if variance > 0:
+        z = (score - math.copysign(1, score)) / math.sqrt(variance) if score else 0.0
+    else:
+        z = 0.0
+    slopes.sort()
+    middle = len(slopes) // 2
+    slope = (slopes[middle] if len(slopes) % 2 else (slopes[middle - 1] + slopes[middle]) / 2) if slopes else 0.0
+    growth = slope * (points[-1][0] - points[0][0])
+    p_value = math.erfc(abs(z) / math.sqrt(2))
+    result.update({
+        "tau": round(score / (n * (n - 1) / 2), 3),
+        "z": round(z, 2),
+        "p_value": p_value,
+        "slope_per_hour": round(slope * 3600, 2),
+        "growth": round(growth, 2),
+        "growing": z > 0 and p_value < alpha and growth >= min_growth,
+    })
+    return result
+
+
+class ResourceSampler:
+    """Sample process resources on a background thread at a fixed interval
+
+    Samples in the first ``warmup`` seconds, while pools and caches fill, are kept but
+    left out of the trend test. With ``trace_allocations`` tracemalloc runs for the whole
+    soak and every ``snapshot_every`` samples the top allocators are diffed against the
+    first snapshot after warm-up, pointing at the lines that keep allocating.
+    """
+
+    def __init__(self, interval: float = 10.0, warmup: float = 0.0, trace_allocations: bool = False,
+                 snapshot_every: int = 6, top: int = 10):
+        self.interval = interval
+        self.warmup = warmup
+        self.trace_allocations = trace_allocations
+        self.snapshot_every = snapshot_every
+        self.top = top
+        self.samples: List[Dict[str, Any]] = []
+        self.top_allocators: List[Dict[str, Any]] = []
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._since_snapshot = 0
+        self._started_tracing = False
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    def _diff_allocators(self, elapsed: float):
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            tracemalloc.Filter(False, __file__),  # the samples themselves
+        ])
+        if self._baseline is None:
+            self._baseline = snapshot
+            return
+        self.top_allocators = [{
+            "elapsed_s": round(elapsed, 1),
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "count_diff": stat.count_diff,
+        } for stat in snapshot.compare_to(self._baseline, "lineno")[:self.top] if stat.size_diff > 0]
+
+    def take_sample(self):
+        """Record one sample now"""
+        elapsed = time.monotonic() - self._started_at
+        sample = dict(sample_resources(), elapsed_s=round(elapsed, 3))
+        self.samples.append(sample)
+        if self.trace_allocations and elapsed >= self.warmup:
+            if self._baseline is None or self._since_snapshot + 1 >= self.snapshot_every:
+                self._diff_allocators(elapsed)
+                self._since_snapshot = 0
+            else:
+                self._since_snapshot += 1
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.take_sample()
+
+    def start(self) -> "ResourceSampler":
+        self._started_at = time.monotonic()
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.take_sample()
+        self._thread = threading.Thread(target=self._run, name="soak-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.take_sample()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def trends(self) -> Dict[str, Dict[str, Any]]:
+        """Trend test per metric over the samples taken after warm-up"""
+        settled = [sample for sample in self.samples if sample["elapsed_s"] >= self.warmup]
+        metrics = [name for name in GROWTH_THRESHOLDS if settled and settled[0].get(name, -1) >= 0]
+        return {
+            name: trend([(sample["elapsed_s"], sample[name]) for sample in settled], GROWTH_THRESHOLDS[name])
+            for name in metrics
+        }
+
+
+class SoakRunner:
+    """Run a scenario mix under ScenarioRunner while a ResourceSampler watches the process"""
+
+    def __init__(self, scenarios: List[Scenario], concurrency: int, duration: float, interval: float = 10.0,
+                 warmup: float = 60.0, trace_allocations: bool = False, base_url: Optional[str] = None,
+                 seed: Optional[int] = None):
+        self.runner = ScenarioRunner(scenarios, concurrency=concurrency, duration=duration,
+                                     base_url=base_url, seed=seed)
+        self.sampler = ResourceSampler(interval=interval, warmup=warmup, trace_allocations=trace_allocations)
+
+    def run(self) -> Dict[str, Any]:
+        """Run to completion and return the load report with samples, trends and suspected leaks"""
+        self.sampler.start()
+        try:
+            load = self.runner.run()
+        finally:
+            self.sampler.stop()
+        trends = self.sampler.trends()
+        return {
+            "load": load,
+            "warmup_s": self.sampler.warmup,
+            "samples": self.sampler.samples,
+            "trends": trends,
+            "leaks": sorted(name for name, result in trends.items() if result["growing"]),
+            "top_allocators": self.sampler.top_allocators,
+        }
+
+
+def format_soak_report(report: Dict[str, Any]) -> str:
+    """Load table followed by the per-metric trend table"""
+    lines = [format_report(report["load"]), "", f"Resources ({len(report['samples'])} samples, "
+             f"trend after {report['warmup_s']:g}s warm-up)",
+             f"{'metric':<22}{'first':>12}{'last':>12}{'slope/h':>12}{'p-value':>10}{'leak':>6}"]
+    first, last = report["samples"][0], report["samples"][-1]
+    for name, result in report["trends"].items():
+        lines.append(f"{name:<22}{first[name]:>12}{last[name]:>12}{result['slope_per_hour']:>12.1f}"
+                     f"{result['p_value']:>10.3g}{'yes' if result['growing'] else '':>6}")
+    if report["top_allocators"]:
+        lines.extend(["", "Top growing allocators"])
+        for allocation in report["top_allocators"]:
+            lines.append(f"  {allocation['size_diff_kb']:>10.1f} KB {allocation['count_diff']:>8} "
+                         f"{allocation['location']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak run with resource growth detection")
+    parser.add_argument("--scenario", action="append", default=[],
+                        help=f"Scenario as name[:weight], repeatable ({', '.join(SCENARIOS)})")
+    parser.add_argument("--users", type=int, default=10, help="Number of concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=3600, help="Soak duration in seconds")
+    parser.add_argument("--interval", type=float, default=10, help="Seconds between resource samples")
+    parser.add_argument("--warmup", type=float, default=60, help="Seconds excluded from the trend test")
+    parser.add_argument("--trace-allocations", action="store_true", help="Track top allocators with tracemalloc")
+    parser.add_argument("--base-url", help="Base URL for the API under test")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible scenario choice")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    # Per-request INFO logging would dominate the client-side cost
+    logging.getLogger("core.api_client").setLevel(logging.WARNING)
+    soak = SoakRunner(build_scenarios(args.scenario or list(SCENARIOS)), concurrency=args.users,
+                      duration=args.duration, interval=args.interval, warmup=args.warmup,
+                      trace_allocations=args.trace_allocations, base_url=args.base_url, seed=args.seed)
+    report = soak.run()
+    print(format_soak_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["leaks"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
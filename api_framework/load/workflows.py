@@ -0,0 +1,111 @@
+"""
+Load-test scenarios modelled on the integration test journeys
+"""
+from typing import Dict, Any, List, Tuple
+from load.scenarios import Step, Scenario
+
+
+def _pick_user(vu) -> Dict[str, Any]:
+    vu.data["user_id"] = vu.random.randint(1, 10)
+    return vu.users.get_user_by_id(vu.data["user_id"])
+
+
+def _user_posts(vu) -> Dict[str, Any]:
+    result = vu.posts.get_posts_by_user(vu.data["user_id"])
+    if result["data"]:
+        vu.data["post_id"] = vu.random.choice(result["data"])["id"]
+    return result
+
+
+def _post_comments(vu) -> Dict[str, Any]:
+    return vu.comments.get_comments_by_post(vu.data.get("post_id", 1))
+
+
+def _pick_post(vu) -> Dict[str, Any]:
+    vu.data["post_id"] = vu.random.randint(1, 100)
+    return vu.posts.get_post_by_id(vu.data["post_id"])
+
+
+def _create_post(vu) -> Dict[str, Any]:
+    return vu.posts.create_post({
+        "title": f"Load test post {vu.user_id}",
+        "body": "Created by the scenario engine.",
+        "userId": vu.data.get("user_id", 1),
+    })
+
+
+def _update_post(vu) -> Dict[str, Any]:
+    return vu.posts.update_post(vu.data["post_id"], {
+        "id": vu.data["post_id"],
+        "title": "Updated load test post",
+        "body": "Updated by the scenario engine.",
+        "userId": 1,
+    })
+
+
+def _patch_post(vu) -> Dict[str, Any]:
+    return vu.posts.patch_post(vu.data["post_id"], {"title": "Patched load test post"})
+
+
+def _delete_post(vu) -> Dict[str, Any]:
+    return vu.posts.delete_post(vu.data["post_id"])
+
+
+def _create_comment(vu) -> Dict[str, Any]:
+    return vu.comments.create_comment({
+        "postId": vu.data["post_id"],
+        "name": f"Load test comment {vu.user_id}",
+        "email": "load@example.com",
+        "body": "Created by the scenario engine.",
+    })
+
+
+def _delete_comment(vu) -> Dict[str, Any]:
+    return vu.comments.delete_comment(vu.random.randint(1, 500))
+
+
+def user_content_journey(weight: int = 1, think_time: Tuple[float, float] = (0.0, 0.0)) -> Scenario:
+    """User -> posts -> comments, as in test_complete_user_workflow"""
+    return Scenario("user_content_journey", [
+        Step("get_user", _pick_user),
+        Step("get_user_posts", _user_posts),
+        Step("get_post_comments", _post_comments),
+    ], weight=weight, think_time=think_time)
+
+
+def post_write_cycle(weight: int = 1, think_time: Tuple[float, float] = (0.0, 0.0)) -> Scenario:
+    """Create, update, patch and delete a post"""
+    return Scenario("post_write_cycle", [
+        Step("get_post", _pick_post),
+        Step("create_post", _create_post, expected_status=201),
+        Step("update_post", _update_post),
+        Step("patch_post", _patch_post),
+        Step("delete_post", _delete_post),
+    ], weight=weight, think_time=think_time)
+
+
+def comment_write_cycle(weight: int = 1, think_time: Tuple[float, float] = (0.0, 0.0)) -> Scenario:
+    """Read a post, comment on it and delete a comment"""
+    return Scenario("comment_write_cycle", [
+        Step("get_post", _pick_post),
+        Step("create_comment", _create_comment, expected_status=201),
+        Step("delete_comment", _delete_comment),
+    ], weight=weight, think_time=think_time)
+
+
+SCENARIOS = {
+    "user_content_journey": user_content_journey,
+    "post_write_cycle": post_write_cycle,
+    "comment_write_cycle": comment_write_cycle,
+}
+
+
+def build_scenarios(spec: List[str], think_time: Tuple[float, float] = (0.0, 0.0)) -> List[Scenario]:
+    """Build scenarios from "name" or "name:weight" strings"""
+    scenarios = []
+    for item in spec:
+        name, _, weight = item.partition(":")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}', expected one of {sorted(SCENARIOS)}")
+        scenarios.append(SCENARIOS[name](weight=int(weight or 1), think_time=think_time))
+    return scenarios
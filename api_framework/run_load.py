@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Load runner script for API framework
+"""
+import json
+import logging
+import argparse
+from load.scenarios import ScenarioRunner, format_report
+from load.workflows import SCENARIOS, build_scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API Load Runner")
+    parser.add_argument("--scenario", action="append", default=[],
+                       help=f"Scenario as name[:weight], repeatable ({', '.join(SCENARIOS)})")
+    parser.add_argument("--users", type=int, default=10, help="Number of concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Steady-state duration in seconds")
+    parser.add_argument("--ramp-up", type=float, default=0, help="Seconds to start all virtual users")
+    parser.add_argument("--ramp-down", type=float, default=0, help="Seconds to stop all virtual users")
+    parser.add_argument("--think-min", type=float, default=0, help="Minimum think time in seconds")
+    parser.add_argument("--think-max", type=float, default=0, help="Maximum think time in seconds")
+    parser.add_argument("--base-url", help="Base URL for the API under load")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible scenario choice")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--log-level", default="WARNING", help="Log level for request logging")
+
+    args = parser.parse_args()
+
+    scenarios = build_scenarios(args.scenario or list(SCENARIOS), think_time=(args.think_min, args.think_max))
+    runner = ScenarioRunner(
+        scenarios,
+        concurrency=args.users,
+        duration=args.duration,
+        ramp_up=args.ramp_up,
+        ramp_down=args.ramp_down,
+        base_url=args.base_url,
+        seed=args.seed,
+    )
+    # Per-request INFO logging would dominate the client-side cost under load
+    logging.getLogger("core.api_client").setLevel(args.log_level.upper())
+
+    report = runner.run()
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📊 JSON report written: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ import argparse
 from pathlib import Path
 
 
-def run_command(command, description):
+def run_command(command, description, env=None):
     """Run a command and handle errors"""
     print(f"\n{'='*50}")
     print(f"Running: {description}")
@@ -17,7 +17,7 @@ def run_command(command, description):
     print(f"{'='*50}")
     
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True, env=env)
         print(result.stdout)
         if result.stderr:
             print("STDERR:", result.stderr)
@@ -38,6 +38,9 @@ def main():
     parser.add_argument("--test-file", help="Specific test file to run")
     parser.add_argument("--base-url", help="Base URL for API tests")
     parser.add_argument("--timeout", type=int, help="API timeout in seconds")
+    parser.add_argument("--deadline", type=float, help="Seconds of HTTP time allowed per test")
+    parser.add_argument("--rate-limit", type=float,
+                       help="Requests per second per host, shared by all parallel workers")
     
     args = parser.parse_args()
     
@@ -47,6 +50,11 @@ def main():
         env["BASE_URL"] = args.base_url
     if args.timeout:
         env["API_TIMEOUT"] = str(args.timeout)
+    if args.deadline:
+        env["TEST_DEADLINE"] = str(args.deadline)
+    if args.rate_limit:
+        env["RATE_LIMIT_ENABLED"] = "true"
+        env["RATE_LIMIT_PER_SECOND"] = str(args.rate_limit)
     
     # Build pytest command
     cmd_parts = ["python", "-m", "pytest"]
@@ -76,7 +84,7 @@ def main():
     os.makedirs("allure-results", exist_ok=True)
     
     # Run tests
-    success = run_command(command, "Running API Tests")
+    success = run_command(command, "Running API Tests", env=env)
     
     if success and args.report == "allure":
         print("\nGenerating Allure report...")
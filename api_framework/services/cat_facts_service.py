@@ -3,6 +3,7 @@ Service class for Cat Facts API endpoints
 """
 from typing import Dict, Any, List, Optional
 from core.api_client import APIClient
+from core.body import json_body
 from core.validators import APIValidator
 
 
@@ -18,7 +19,7 @@ class CatFactsService:
         response = self.api_client.get("/fact")
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -28,7 +29,7 @@ class CatFactsService:
         response = self.api_client.get("/facts", params=params)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -38,7 +39,7 @@ class CatFactsService:
         response = self.api_client.get("/breeds", params=params)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
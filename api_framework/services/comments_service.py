@@ -3,6 +3,8 @@ Service class for Comments API endpoints
 """
 from typing import Dict, Any, List, Optional
 from core.api_client import APIClient
+from core.body import json_body
+from core.cleanup import record_created
 from core.validators import APIValidator, COMMENT_SCHEMA
 
 
@@ -18,7 +20,7 @@ class CommentsService:
         response = self.api_client.get("/comments")
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -27,7 +29,7 @@ class CommentsService:
         response = self.api_client.get(f"/comments/{comment_id}")
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -36,16 +38,19 @@ class CommentsService:
         response = self.api_client.get("/comments", params={"postId": post_id})
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
     def create_comment(self, comment_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new comment"""
         response = self.api_client.post("/comments", json_data=comment_data)
+        data = json_body(response) if response.status_code == 201 else None
+        if isinstance(data, dict):
+            record_created("comments", data.get("id"), self.delete_comment, self.api_client.thread_safe)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 201 else None,
+            "data": data,
             "status_code": response.status_code
         }
     
@@ -54,7 +59,7 @@ class CommentsService:
         response = self.api_client.put(f"/comments/{comment_id}", json_data=comment_data)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -63,7 +68,7 @@ class CommentsService:
         response = self.api_client.patch(f"/comments/{comment_id}", json_data=comment_data)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
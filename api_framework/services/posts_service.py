@@ -3,6 +3,8 @@ Service class for Posts API endpoints
 """
 from typing import Dict, Any, List, Optional
 from core.api_client import APIClient
+from core.body import json_body
+from core.cleanup import record_created
 from core.validators import APIValidator, POST_SCHEMA
 
 
@@ -18,7 +20,7 @@ class PostsService:
         response = self.api_client.get("/posts")
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -27,7 +29,7 @@ class PostsService:
         response = self.api_client.get(f"/posts/{post_id}")
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -36,16 +38,19 @@ class PostsService:
         response = self.api_client.get("/posts", params={"userId": user_id})
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
     def create_post(self, post_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new post"""
         response = self.api_client.post("/posts", json_data=post_data)
+        data = json_body(response) if response.status_code == 201 else None
+        if isinstance(data, dict):
+            record_created("posts", data.get("id"), self.delete_post, self.api_client.thread_safe)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 201 else None,
+            "data": data,
             "status_code": response.status_code
         }
     
@@ -54,7 +59,7 @@ class PostsService:
         response = self.api_client.put(f"/posts/{post_id}", json_data=post_data)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -63,7 +68,7 @@ class PostsService:
         response = self.api_client.patch(f"/posts/{post_id}", json_data=post_data)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -3,6 +3,8 @@ Service class for Users API endpoints
 """
 from typing import Dict, Any, List, Optional
 from core.api_client import APIClient
+from core.body import json_body
+from core.cleanup import record_created
 from core.validators import APIValidator, USER_SCHEMA
 
 
@@ -18,7 +20,7 @@ class UsersService:
         response = self.api_client.get("/users")
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -27,16 +29,19 @@ class UsersService:
         response = self.api_client.get(f"/users/{user_id}")
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
     def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new user"""
         response = self.api_client.post("/users", json_data=user_data)
+        data = json_body(response) if response.status_code == 201 else None
+        if isinstance(data, dict):
+            record_created("users", data.get("id"), self.delete_user, self.api_client.thread_safe)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 201 else None,
+            "data": data,
             "status_code": response.status_code
         }
     
@@ -45,7 +50,7 @@ class UsersService:
         response = self.api_client.put(f"/users/{user_id}", json_data=user_data)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
@@ -54,7 +59,7 @@ class UsersService:
         response = self.api_client.patch(f"/users/{user_id}", json_data=user_data)
         return {
             "response": response,
-            "data": response.json() if response.status_code == 200 else None,
+            "data": json_body(response) if response.status_code == 200 else None,
             "status_code": response.status_code
         }
     
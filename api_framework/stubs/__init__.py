@@ -0,0 +1 @@
+# Local API stand-ins package
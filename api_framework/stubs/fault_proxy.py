@@ -0,0 +1,342 @@
+"""
+Fault-injecting asyncio HTTP proxy for measuring client resilience
+"""
+import re
+import sys
+import json
+import math
+import time
+import socket
+import struct
+import random
+import asyncio
+import inspect
+import logging
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlsplit
+import requests
+from core.api_client import APIClient
+from core.http11 import read_request, build_response
+from core.histogram import LatencyHistogram
+from core.metrics import metrics
+from core.retry_policy import RetryPolicy
+from load.async_http import AsyncHTTPConnection
+from stubs.jsonplaceholder import StubServer, JSONPlaceholderStub
+
+
+DEFAULT_PATHS = ["/posts/1", "/users/1", "/comments?postId=1"]
+PERCENTILES = [50, 90, 99, 99.9]
+
+# Hop-by-hop headers are the proxy's business, not the backend's
+HOP_HEADERS = frozenset({"host", "connection", "keep-alive", "content-length", "transfer-encoding"})
+
+
+class LatencyDistribution:
+    """Added latency drawn from a named distribution, parameters in milliseconds
+
+    ``fixed:MS``, ``uniform:LOW:HIGH``, ``normal:MEAN:STDDEV``, ``lognormal:MEDIAN:SIGMA``
+    (sigma is unitless) and ``exponential:MEAN``.
+    """
+
+    ARITY = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+
+    def __init__(self, kind: str = "fixed", *params: float):
+        if kind not in self.ARITY:
+            raise ValueError(f"Unknown latency distribution {kind!r}, expected one of {', '.join(self.ARITY)}")
+        if len(params) != self.ARITY[kind]:
+            raise ValueError(f"{kind} latency takes {self.ARITY[kind]} parameter(s), got {len(params)}")
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Build from ``kind:param[:param]``"""
+        kind, *params = spec.split(":")
+        return cls(kind, *(float(param) for param in params))
+
+    def sample(self, rng: random.Random) -> float:
+        """Seconds of latency to add"""
+        if self.kind == "fixed":
+            millis = self.params[0]
+        elif self.kind == "uniform":
+            millis = rng.uniform(*self.params)
+        elif self.kind == "normal":
+            millis = rng.gauss(*self.params)
+        elif self.kind == "lognormal":
+            millis = rng.lognormvariate(math.log(self.params[0]), self.params[1])
+        else:
+            millis = rng.expovariate(1 / self.params[0])
+        return max(0.0, millis) / 1000
+
+    def __repr__(self) -> str:
+        return ":".join([self.kind] + [f"{param:g}" for param in self.params])
+
+
+class FaultRule:
+    """Faults injected into requests whose path matches a regex
+
+    Latency delays the response headers, ``bandwidth`` (bytes/s) throttles the response
+    as it is written, ``reset_rate`` aborts the connection with a TCP reset instead of
+    answering and ``error_rate`` answers ``error_status`` without reaching the backend.
+    """
+
+    def __init__(self, path: str = ".*", method: str = "*", latency: Optional[LatencyDistribution] = None,
+                 bandwidth: Optional[float] = None, reset_rate: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, retry_after: Optional[float] = None):
+        self.path = path
+        self.pattern = re.compile(path)
+        self.method = method.upper()
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.reset_rate = reset_rate
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+
+    @classmethod
+    def parse(cls, spec: str) -> "FaultRule":
+        """Build from ``PATH_REGEX [key=value ...]``
+
+        Keys: method, latency (a distribution spec), bandwidth, reset, error, status, retry_after.
+        """
+        path, *options = spec.split()
+        kwargs: Dict[str, Any] = {}
+        for option in options:
+            key, _, value = option.partition("=")
+            if key == "method":
+                kwargs["method"] = value
+            elif key == "latency":
+                kwargs["latency"] = LatencyDistribution.parse(value)
+            elif key == "bandwidth":
+                kwargs["bandwidth"] = float(value)
+            elif key == "reset":
+                kwargs["reset_rate"] = float(value)
+            elif key == "error":
+                kwargs["error_rate"] = float(value)
+            elif key == "status":
+                kwargs["error_status"] = int(value)
+            elif key == "retry_after":
+                kwargs["retry_after"] = float(value)
+            else:
+                raise ValueError(f"Unknown fault option {key!r} in {spec!r}")
+        return cls(path, **kwargs)
+
+    def matches(self, method: str, path: str) -> bool:
+        return self.method in ("*", method) and self.pattern.search(path) is not None
+
+    def __repr__(self) -> str:
+        return (f"FaultRule({self.path!r}, method={self.method}, latency={self.latency}, "
+                f"bandwidth={self.bandwidth}, reset={self.reset_rate}, error={self.error_rate})")
+
+
+class FaultProxy(StubServer):
+    """Proxy that injects faults per route before forwarding to a backend
+
+    ``upstream`` is a base URL to forward to, or a stub object served in-process
+    (the JSONPlaceholder stand-in by default). The first matching rule applies.
+    """
+
+    def __init__(self, rules: Optional[List[FaultRule]] = None,
+                 upstream: Union[str, JSONPlaceholderStub, None] = None,
+                 host: str = "127.0.0.1", port: int = 0, seed: Optional[int] = None):
+        self.upstream_url = upstream if isinstance(upstream, str) else None
+        super().__init__(stub=None if self.upstream_url else upstream, host=host, port=port)
+        if self.upstream_url:
+            parts = urlsplit(self.upstream_url)
+            if parts.scheme != "http":
+                raise ValueError(f"Only plain http upstreams are supported, got {self.upstream_url}")
+            self._upstream_host, self._upstream_port = parts.hostname, parts.port or 80
+            self._upstream_prefix = parts.path.rstrip("/")
+        self.rules = list(rules or [])
+        self.random = random.Random(seed)
+
+    def rule_for(self, method: str, path: str) -> Optional[FaultRule]:
+        return next((rule for rule in self.rules if rule.matches(method, path)), None)
+
+    async def _forward(self, upstream: Optional[AsyncHTTPConnection], request):
+        if upstream is None:
+            result = self.stub.handle(request.method, request.path, request.query, request.body, request.headers)
+            return (await result) if inspect.isawaitable(result) else result
+        headers = {name: value for name, value in request.headers.items() if name not in HOP_HEADERS}
+        return await upstream.request(request.method, self._upstream_prefix + request.target,
+                                      request.body, headers)
+
+    async def _write_throttled(self, writer: asyncio.StreamWriter, data: bytes, bandwidth: float):
+        # 50 ms slices keep the pacing smooth without a syscall per byte
+        chunk = max(1, int(bandwidth / 20))
+        for offset in range(0, len(data), chunk):
+            await asyncio.sleep(min(chunk, len(data) - offset) / bandwidth)
+            writer.write(data[offset:offset + chunk])
+            await writer.drain()
+        self.stats["throttled_bytes"] += len(data)
+
+    @staticmethod
+    def _reset(writer: asyncio.StreamWriter):
+        """Abort with RST rather than FIN, like a crashed peer or a middlebox"""
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        writer.transport.abort()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        upstream = AsyncHTTPConnection(self._upstream_host, self._upstream_port) if self.upstream_url else None
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                self.stats["requests"] += 1
+                rule = self.rule_for(request.method, request.path)
+                if rule is not None and rule.latency is not None:
+                    delay = rule.latency.sample(self.random)
+                    self.stats["latency_injected_s"] += delay
+                    await asyncio.sleep(delay)
+                if rule is not None and self.random.random() < rule.reset_rate:
+                    self.stats["resets_injected"] += 1
+                    self._reset(writer)
+                    return
+                if rule is not None and self.random.random() < rule.error_rate:
+                    self.stats["errors_injected"] += 1
+                    headers = {"Content-Type": "application/json"}
+                    if rule.retry_after is not None:
+                        headers["Retry-After"] = f"{rule.retry_after:g}"
+                    status, body = rule.error_status, b'{"error": "injected"}'
+                else:
+                    status, headers, body = await self._forward(upstream, request)
+                if request.method == "HEAD":
+                    body = b""
+                data = build_response(status, body, headers, keep_alive=request.keep_alive)
+                if rule is not None and rule.bandwidth:
+                    await self._write_throttled(writer, data, rule.bandwidth)
+                else:
+                    writer.write(data)
+                    await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # peer went away, or the server is stopping
+        finally:
+            if upstream is not None:
+                upstream.close()
+            if not writer.transport.is_closing():
+                writer.close()
+
+
+def benchmark(proxy: FaultProxy, requests_count: int = 200, paths: Optional[List[str]] = None,
+              concurrency: int = 1, retry_policy: Optional[RetryPolicy] = None) -> Dict[str, Any]:
+    """Drive APIClient through a running proxy and report what the client experienced
+
+    Latency is measured per logical request, including retries and backoff.
+    """
+    paths = paths or DEFAULT_PATHS
+    histogram = LatencyHistogram(highest_trackable_us=600_000_000)
+    outcomes: Counter = Counter()
+
+    def worker(indexes: range):
+        client = APIClient(base_url=proxy.base_url)
+        if retry_policy is not None:
+            client.retry_policy = retry_policy
+        local = LatencyHistogram(highest_trackable_us=600_000_000)
+        local_outcomes: Counter = Counter()
+        for index in indexes:
+            started = time.perf_counter()
+            try:
+                response = client.get(paths[index % len(paths)])
+                local_outcomes[str(response.status_code)] += 1
+            except requests.exceptions.RequestException as e:
+                local_outcomes[type(e).__name__] += 1
+            local.record_seconds(time.perf_counter() - started)
+        client.close()
+        return local, local_outcomes
+
+    before_metrics, before_stats = metrics.snapshot(), proxy.stats.copy()
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        shards = [range(worker_index, requests_count, concurrency) for worker_index in range(concurrency)]
+        for local, local_outcomes in executor.map(worker, shards):
+            histogram.add(local)
+            outcomes.update(local_outcomes)
+    elapsed = time.monotonic() - started
+
+    used = metrics.delta(before_metrics, metrics.snapshot())
+    faults = dict(proxy.stats - before_stats)
+    report = {
+        "requests": requests_count,
+        "succeeded": sum(count for outcome, count in outcomes.items() if outcome.isdigit() and int(outcome) < 400),
+        "outcomes": dict(sorted(outcomes.items())),
+        "elapsed_s": round(elapsed, 3),
+        "mean_ms": round(histogram.mean() / 1000, 3),
+        "max_ms": round(histogram.max / 1000, 3),
+        "attempts": int(used.get("attempts", 0)),
+        "retries": int(used.get("retries", 0)),
+        "retry_amplification": round(metrics.retry_amplification(used), 3),
+        "retries_denied_by_budget": int(used.get("retries_denied_by_budget", 0)),
+        "circuit_rejections": int(used.get("circuit_rejections", 0)),
+        "faults": {name: round(value, 3) for name, value in sorted(faults.items())},
+    }
+    report.update(histogram.percentiles_ms(PERCENTILES))
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Human-readable benchmark summary"""
+    lines = [
+        f"requests: {report['requests']}  succeeded: {report['succeeded']}  elapsed: {report['elapsed_s']}s",
+        "latency: " + "  ".join(f"{name[:-3]} {report[name]:.1f}ms" for name in report
+                             if name.startswith("p") and name.endswith("_ms")),
+        f"attempts: {report['attempts']}  retries: {report['retries']}  "
+        f"amplification: {report['retry_amplification']}  budget denials: {report['retries_denied_by_budget']}  "
+        f"circuit rejections: {report['circuit_rejections']}",
+        "outcomes: " + ", ".join(f"{name}={count}" for name, count in report["outcomes"].items()),
+        "faults: " + ", ".join(f"{name}={value:g}" for name, value in report["faults"].items()),
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fault-injecting HTTP proxy")
+    parser.add_argument("--rule", action="append", default=[],
+                       help='Fault rule "PATH_REGEX [latency=lognormal:50:0.5] [bandwidth=BYTES_PER_S] '
+                            '[reset=RATE] [error=RATE] [status=503] [retry_after=S] [method=GET]", repeatable')
+    parser.add_argument("--upstream", help="Backend base URL (default: in-process JSONPlaceholder stand-in)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible faults")
+    parser.add_argument("--benchmark", type=int, metavar="REQUESTS",
+                       help="Send this many GETs through the proxy with APIClient and report")
+    parser.add_argument("--concurrency", type=int, default=1, help="Benchmark client threads")
+    parser.add_argument("--path", action="append", help="Benchmark path, repeatable")
+    parser.add_argument("--output", help="Write the JSON benchmark report to this file")
+    args = parser.parse_args()
+
+    proxy = FaultProxy([FaultRule.parse(rule) for rule in args.rule], upstream=args.upstream,
+                       host=args.host, port=args.port, seed=args.seed)
+    if args.benchmark is None:
+        print(f"Fault proxy on {proxy.base_url} -> {args.upstream or 'in-process stand-in'}")
+        for rule in proxy.rules:
+            print(f"  {rule}")
+        try:
+            asyncio.run(proxy.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    # Per-request INFO logging would drown the report
+    logging.getLogger("core.api_client").setLevel(logging.ERROR)
+    proxy.start_in_thread()
+    try:
+        report = benchmark(proxy, args.benchmark, args.path, args.concurrency)
+    finally:
+        proxy.stop()
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
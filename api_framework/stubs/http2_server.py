@@ -0,0 +1,148 @@
+"""
+HTTP/2 (h2c, prior knowledge) variant of the local JSONPlaceholder stand-in
+"""
+import asyncio
+import inspect
+import argparse
+from typing import Dict, List
+from urllib.parse import urlsplit, parse_qs
+from stubs.jsonplaceholder import StubServer
+
+try:
+    from h2.config import H2Configuration
+    from h2.connection import H2Connection
+    from h2.events import (ConnectionTerminated, DataReceived, RequestReceived, StreamEnded, StreamReset,
+                           WindowUpdated)
+    from h2.exceptions import ProtocolError, StreamClosedError
+except ImportError:  # optional dependency: pip install "httpx[http2]"
+    H2Connection = None
+
+# Connection-specific headers are forbidden in HTTP/2
+HOP_HEADERS = frozenset({"connection", "keep-alive", "content-length", "transfer-encoding", "upgrade"})
+
+
+class HTTP2StubServer(StubServer):
+    """Serve a stub over cleartext HTTP/2, one task per stream
+
+    Requests on one connection are handled concurrently, so a client multiplexing many
+    streams sees the same per-request latency as one using many HTTP/1.1 connections.
+    ``stats`` counts connections, requests and the most streams received but not yet
+    answered at once.
+    """
+
+    def __init__(self, stub=None, host: str = "127.0.0.1", port: int = 0, compress: bool = False):
+        if H2Connection is None:
+            raise ImportError('HTTP/2 stand-in requires h2: pip install "httpx[http2]"')
+        super().__init__(stub=stub, host=host, port=port, compress=compress)
+        self._in_flight = 0
+
+    async def _respond(self, connection: "H2Connection", writer: asyncio.StreamWriter, stream_id: int,
+                       headers: Dict[str, str], body: bytes, windows: Dict[int, asyncio.Event]):
+        try:
+            method = headers[":method"]
+            target = urlsplit(headers[":path"])
+            request_headers = {name: value for name, value in headers.items() if not name.startswith(":")}
+            result = self.stub.handle(method, target.path, parse_qs(target.query), body, request_headers)
+            # Handlers may be coroutines, e.g. to inject latency without blocking the loop
+            if inspect.isawaitable(result):
+                result = await result
+            status, response_headers, payload = result
+            self.stats["requests"] += 1
+            if self.compress and payload:
+                payload, response_headers = self._compressed(payload, response_headers,
+                                                             request_headers.get("accept-encoding"))
+            if method == "HEAD":
+                payload = b""
+
+            connection.send_headers(stream_id, [(":status", str(status))] + [
+                (name.lower(), str(value)) for name, value in response_headers.items()
+                if name.lower() not in HOP_HEADERS
+            ] + [("content-length", str(len(payload)))], end_stream=not payload)
+            writer.write(connection.data_to_send())
+            await self._send_body(connection, writer, stream_id, payload, windows)
+        except (StreamClosedError, ProtocolError):
+            pass  # client reset the stream or went away
+        finally:
+            self._in_flight -= 1
+            windows.pop(stream_id, None)
+
+    @staticmethod
+    async def _send_body(connection: "H2Connection", writer: asyncio.StreamWriter, stream_id: int,
+                         payload: bytes, windows: Dict[int, asyncio.Event]):
+        """Send DATA frames within the peer's flow-control window"""
+        view = memoryview(payload)
+        while view:
+            size = min(connection.local_flow_control_window(stream_id), connection.max_outbound_frame_size,
+                       len(view))
+            if size <= 0:
+                window = windows.setdefault(stream_id, asyncio.Event())
+                window.clear()
+                await window.wait()
+                continue
+            connection.send_data(stream_id, bytes(view[:size]), end_stream=size == len(view))
+            writer.write(connection.data_to_send())
+            view = view[size:]
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        connection = H2Connection(config=H2Configuration(client_side=False, header_encoding="utf-8"))
+        connection.initiate_connection()
+        writer.write(connection.data_to_send())
+        pending: Dict[int, List] = {}
+        windows: Dict[int, asyncio.Event] = {}
+        tasks = set()
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                for event in connection.receive_data(data):
+                    if isinstance(event, RequestReceived):
+                        pending[event.stream_id] = [dict(event.headers), bytearray()]
+                    elif isinstance(event, DataReceived):
+                        pending[event.stream_id][1] += event.data
+                        connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, StreamEnded):
+                        headers, body = pending.pop(event.stream_id)
+                        self._in_flight += 1
+                        self.stats["max_concurrent_streams"] = max(self.stats["max_concurrent_streams"],
+                                                                   self._in_flight)
+                        task = asyncio.ensure_future(
+                            self._respond(connection, writer, event.stream_id, headers, bytes(body), windows))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    elif isinstance(event, WindowUpdated):
+                        targets = windows.values() if event.stream_id == 0 else [windows.get(event.stream_id)]
+                        for window in targets:
+                            if window is not None:
+                                window.set()
+                    elif isinstance(event, StreamReset):
+                        pending.pop(event.stream_id, None)
+                    elif isinstance(event, ConnectionTerminated):
+                        return
+                writer.write(connection.data_to_send())
+                await writer.drain()
+        except (ConnectionError, ProtocolError, asyncio.CancelledError):
+            pass  # peer went away, or the server is stopping
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local JSONPlaceholder stand-in over HTTP/2 (h2c)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    args = parser.parse_args()
+
+    server = HTTP2StubServer(host=args.host, port=args.port)
+    print(f"Serving JSONPlaceholder stand-in over HTTP/2 on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Local stand-in for the JSONPlaceholder API, served over asyncio
+"""
+import re
+import json
+import asyncio
+import inspect
+import argparse
+import threading
+import multiprocessing
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+from core.http11 import read_request, build_response
+from core.compression import compress
+
+
+JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+ROUTE = re.compile(r"^/(posts|users|comments)(?:/(\d+))?(?:/(comments|posts))?/?$")
+
+# Nested collections exposed by JSONPlaceholder, mapped to their foreign key
+NESTED = {("posts", "comments"): "postId", ("users", "posts"): "userId"}
+
+
+def _build_dataset() -> Dict[str, List[Dict[str, Any]]]:
+    """Deterministic data with the same shape and sizes as JSONPlaceholder"""
+    users = [{
+        "id": user_id,
+        "name": f"User {user_id}",
+        "username": f"user{user_id}",
+        "email": f"user{user_id}@example.com",
+        "address": {
+            "street": f"{user_id} Main St",
+            "suite": f"Apt. {user_id}",
+            "city": "Gwenborough",
+            "zipcode": f"{user_id:05d}",
+            "geo": {"lat": f"{user_id * 1.5:.4f}", "lng": f"{user_id * -2.5:.4f}"},
+        },
+        "phone": f"1-770-736-{user_id:04d}",
+        "website": f"user{user_id}.org",
+        "company": {"name": f"Company {user_id}", "catchPhrase": "Multi-layered client-server", "bs": "harness"},
+    } for user_id in range(1, 11)]
+    posts = [{
+        "userId": (post_id - 1) // 10 + 1,
+        "id": post_id,
+        "title": f"post title {post_id}",
+        "body": f"post body {post_id}\nlorem ipsum dolor sit amet",
+    } for post_id in range(1, 101)]
+    comments = [{
+        "postId": (comment_id - 1) // 5 + 1,
+        "id": comment_id,
+        "name": f"comment name {comment_id}",
+        "email": f"commenter{comment_id}@example.com",
+        "body": f"comment body {comment_id}\nlorem ipsum dolor sit amet",
+    } for comment_id in range(1, 501)]
+    return {"users": users, "posts": posts, "comments": comments}
+
+
+def _encode(data: Any) -> bytes:
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+class JSONPlaceholderStub:
+    """Request handler mimicking JSONPlaceholder's fake-write semantics"""
+
+    def __init__(self):
+        self.data: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_id: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        # Serialized bodies for the hot read paths
+        self._encoded_collections: Dict[str, bytes] = {}
+        self._encoded_items: Dict[str, Dict[int, bytes]] = {}
+        for name, items in _build_dataset().items():
+            self.set_items(name, items)
+
+    def set_items(self, resource: str, items: List[Dict[str, Any]]):
+        """Replace a resource's records, e.g. to change the data between dataset snapshots"""
+        self.data[resource] = items
+        self._by_id[resource] = {item["id"]: item for item in items}
+        self._encoded_collections[resource] = _encode(items)
+        self._encoded_items[resource] = {item["id"]: _encode(item) for item in items}
+
+    def _filter(self, resource: str, query: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        items = self.data[resource]
+        for key, values in query.items():
+            items = [item for item in items if str(item.get(key)) in values]
+        return items
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], body: bytes = b"",
+               headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """Return (status, headers, body) for a request"""
+        match = ROUTE.match(path)
+        if not match:
+            return 404, dict(JSON_HEADERS), b"{}"
+        resource, item_id, nested = match.group(1), match.group(2), match.group(3)
+        item_id = int(item_id) if item_id else None
+
+        if nested:
+            if method != "GET" or (resource, nested) not in NESTED or item_id not in self._by_id[resource]:
+                return 404, dict(JSON_HEADERS), b"{}"
+            query = dict(query, **{NESTED[(resource, nested)]: [str(item_id)]})
+            return 200, dict(JSON_HEADERS), _encode(self._filter(nested, query))
+
+        if method in ("GET", "HEAD"):
+            if item_id is None:
+                if query:
+                    return 200, dict(JSON_HEADERS), _encode(self._filter(resource, query))
+                return 200, dict(JSON_HEADERS), self._encoded_collections[resource]
+            encoded = self._encoded_items[resource].get(item_id)
+            return (200, dict(JSON_HEADERS), encoded) if encoded else (404, dict(JSON_HEADERS), b"{}")
+
+        if method == "DELETE":
+            return (200, dict(JSON_HEADERS), b"{}") if item_id is not None else (404, dict(JSON_HEADERS), b"{}")
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, dict(JSON_HEADERS), b"{}"
+        if not isinstance(payload, dict):
+            payload = {}
+
+        if method == "POST" and item_id is None:
+            return 201, dict(JSON_HEADERS), _encode(dict(payload, id=len(self.data[resource]) + 1))
+        if method in ("PUT", "PATCH") and item_id is not None:
+            existing = self._by_id[resource].get(item_id)
+            if existing is None:
+                # JSONPlaceholder fails updates of unknown ids with a server error
+                return 500, dict(JSON_HEADERS), b"{}"
+            updated = dict(existing, **payload) if method == "PATCH" else dict(payload)
+            updated["id"] = item_id
+            return 200, dict(JSON_HEADERS), _encode(updated)
+        return 404, dict(JSON_HEADERS), b"{}"
+
+
+class StubServer:
+    """Asyncio HTTP/1.1 server exposing a stub handler"""
+
+    def __init__(self, stub: Optional[JSONPlaceholderStub] = None, host: str = "127.0.0.1", port: int = 0,
+                 compress: bool = False):
+        self.stub = stub or JSONPlaceholderStub()
+        self.host = host
+        self.port = port
+        self.compress = compress
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self.stats: Counter = Counter()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                self.stats["requests"] += 1
+                result = self.stub.handle(request.method, request.path, request.query,
+                                          request.body, request.headers)
+                # Handlers may be coroutines, e.g. to inject latency without blocking the loop
+                if inspect.isawaitable(result):
+                    result = await result
+                status, headers, body = result
+                if self.compress and body:
+                    body, headers = self._compressed(body, headers, request.headers.get("accept-encoding"))
+                if request.method == "HEAD":
+                    body = b""
+                writer.write(build_response(status, body, headers, keep_alive=request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # peer went away, or the server is stopping
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _compressed(body: bytes, headers: Dict[str, str], accepted: Optional[str]):
+        """Encode a body with the client's preferred available coding, like a production edge"""
+        body, coding = compress(body, accepted)
+        if coding is None:
+            return body, headers
+        return body, dict(headers, **{"Content-Encoding": coding, "Vary": "Accept-Encoding"})
+
+    async def start(self, reuse_port: bool = False):
+        """Start listening on the configured host and port"""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, reuse_port=reuse_port or None
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self, reuse_port: bool = False):
+        """Start and serve until cancelled"""
+        await self.start(reuse_port=reuse_port)
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> "StubServer":
+        """Serve from a background thread, e.g. for tests"""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="stub-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        """Stop a server started with start_in_thread"""
+        if self._loop is None:
+            return
+        async def shutdown():
+            self._server.close()
+            # Cancel handlers still sleeping on injected latency so none outlive the loop
+            handlers = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in handlers:
+                task.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+
+def _serve_process(host: str, port: int, compress: bool):
+    asyncio.run(StubServer(host=host, port=port, compress=compress).serve_forever(reuse_port=True))
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, workers: int = 1,
+          compress: bool = False) -> List[multiprocessing.Process]:
+    """Start the stub in worker processes sharing one port via SO_REUSEPORT"""
+    processes = [
+        multiprocessing.Process(target=_serve_process, args=(host, port, compress), daemon=True)
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    return processes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local JSONPlaceholder stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="Server processes sharing the port")
+    parser.add_argument("--compress", action="store_true", help="Compress responses per Accept-Encoding")
+    args = parser.parse_args()
+
+    print(f"Serving JSONPlaceholder stand-in on http://{args.host}:{args.port} ({args.workers} workers)")
+    processes = serve(args.host, args.port, args.workers, args.compress)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+In-memory requests transport for socket-free service tests
+"""
+import io
+import re
+import json
+import time
+import threading
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit, parse_qs
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+HandlerResult = Tuple[int, Dict[str, str], bytes]
+Latency = Union[float, Callable[[], float]]
+
+JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+
+class UnmatchedRequest(AssertionError):
+    """Raised when a request matches no mock route and there is no fallback"""
+
+
+class MockCall:
+    """A request received by the mock transport"""
+
+    def __init__(self, method: str, url: str, headers: Dict[str, str], body: bytes,
+                 params: Optional[Dict[str, str]] = None):
+        parts = urlsplit(url)
+        self.method = method
+        self.url = url
+        self.path = parts.path or "/"
+        self.query = parse_qs(parts.query)
+        self.headers = CaseInsensitiveDict(headers)
+        self.body = body
+        self.params = params or {}
+
+    def json(self) -> Any:
+        """Decoded JSON request body"""
+        return json.loads(self.body) if self.body else None
+
+    def __repr__(self) -> str:
+        return f"<MockCall {self.method} {self.path}>"
+
+
+class MockRoute:
+    """A method and path pattern with a canned or programmatic response
+
+    ``{name}`` segments in the path match one path segment and are passed to handlers
+    as ``call.params``.
+    """
+
+    def __init__(self, method: str, path: str, status: int = 200, json_body: Any = None,
+                 body: bytes = b"", headers: Optional[Dict[str, str]] = None, latency: Latency = 0,
+                 handler: Optional[Callable[[MockCall], HandlerResult]] = None,
+                 error: Optional[Exception] = None):
+        self.method = method.upper()
+        self.pattern = re.compile("^" + re.sub(r"\\{(\w+)\\}", r"(?P<\1>[^/]+)", re.escape(path)) + "/?$")
+        self.status = status
+        self.body = json.dumps(json_body).encode("utf-8") if json_body is not None else body
+        self.headers = dict(headers if headers is not None else JSON_HEADERS)
+        self.latency = latency
+        self.handler = handler
+        self.error = error
+
+    def match(self, method: str, path: str) -> Optional[Dict[str, str]]:
+        """Path parameters if the route matches, else None"""
+        if self.method not in ("*", method.upper()):
+            return None
+        found = self.pattern.match(path)
+        return found.groupdict() if found else None
+
+    def respond(self, call: MockCall) -> HandlerResult:
+        """Produce the route's response for a call"""
+        if self.error is not None:
+            raise self.error
+        if self.handler is not None:
+            return self.handler(call)
+        return self.status, dict(self.headers), self.body
+
+
+class MockTransport(BaseAdapter):
+    """Transport adapter that answers from memory instead of opening sockets
+
+    Routes are matched most recent first so a test can override earlier defaults.
+    Unmatched requests go to ``fallback`` (any object with the stub ``handle`` signature,
+    e.g. ``JSONPlaceholderStub``) or raise ``UnmatchedRequest``. Latency is slept for
+    real and turns into ``ReadTimeout`` when it exceeds the request's read timeout.
+    """
+
+    def __init__(self, fallback: Any = None, latency: Latency = 0):
+        super().__init__()
+        self.fallback = fallback
+        self.latency = latency
+        self.routes: List[MockRoute] = []
+        self.calls: List[MockCall] = []
+        self._lock = threading.Lock()
+
+    def add(self, method: str, path: str, **kwargs) -> MockRoute:
+        """Register a route; see MockRoute for the response options"""
+        route = MockRoute(method, path, **kwargs)
+        with self._lock:
+            self.routes.insert(0, route)
+        return route
+
+    def get(self, path: str, **kwargs) -> MockRoute:
+        return self.add("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> MockRoute:
+        return self.add("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> MockRoute:
+        return self.add("PUT", path, **kwargs)
+
+    def patch(self, path: str, **kwargs) -> MockRoute:
+        return self.add("PATCH", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> MockRoute:
+        return self.add("DELETE", path, **kwargs)
+
+    def mount(self, client) -> "MockTransport":
+        """Serve every request an APIClient makes to its base URL"""
+        client.mount(client.base_url, self)
+        if getattr(client, "hedger", None) is not None:
+            client.hedger.hedge_session.mount(client.base_url, self)
+        return self
+
+    def calls_to(self, method: str, path: str) -> List[MockCall]:
+        """Recorded calls with the given method and exact path"""
+        with self._lock:
+            return [call for call in self.calls if call.method == method.upper() and call.path == path]
+
+    def reset(self):
+        """Forget routes and recorded calls"""
+        with self._lock:
+            self.routes.clear()
+            self.calls.clear()
+
+    @staticmethod
+    def _read_timeout(timeout) -> Optional[float]:
+        return timeout[1] if isinstance(timeout, tuple) else timeout
+
+    @staticmethod
+    def _body_bytes(body) -> bytes:
+        if body is None:
+            return b""
+        if isinstance(body, str):
+            return body.encode("utf-8")
+        if isinstance(body, (bytes, bytearray)):
+            return bytes(body)
+        return b"".join(chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in body)
+
+    def _route(self, call: MockCall) -> Tuple[Optional[MockRoute], Latency]:
+        with self._lock:
+            for route in self.routes:
+                params = route.match(call.method, call.path)
+                if params is not None:
+                    call.params = params
+                    return route, route.latency or self.latency
+        return None, self.latency
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout=None,
+             verify=True, cert=None, proxies=None) -> requests.Response:
+        call = MockCall(request.method, request.url, dict(request.headers), self._body_bytes(request.body))
+        with self._lock:
+            self.calls.append(call)
+        route, latency = self._route(call)
+
+        delay = latency() if callable(latency) else latency
+        read_timeout = self._read_timeout(timeout)
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(f"Mock read timed out after {read_timeout}s", request=request)
+        if delay:
+            time.sleep(delay)
+
+        if route is not None:
+            status, headers, body = route.respond(call)
+        elif self.fallback is not None:
+            status, headers, body = self.fallback.handle(call.method, call.path, call.query, call.body,
+                                                         dict(call.headers.lower_items()))
+        else:
+            raise UnmatchedRequest(f"No mock route for {call.method} {call.path}")
+        return self._build_response(request, status, headers, body)
+
+    def _build_response(self, request: requests.PreparedRequest, status: int, headers: Dict[str, str],
+                        body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        try:
+            response.reason = HTTPStatus(status).phrase
+        except ValueError:
+            response.reason = ""
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
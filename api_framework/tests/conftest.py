@@ -1,19 +1,34 @@
 """
 Pytest configuration and fixtures for API tests
 """
+import os
+import json
+import uuid
 import pytest
 import allure
+from core import attachments, rate_limiter
 from core.api_client import APIClient
+from core.metrics import metrics
+from core.compression import bandwidth, BandwidthLedger
+from core.circuit_breaker import CircuitOpenError
+from core.cleanup import ResourceTracker
+from core.deadline import deadline
+from core.retry_policy import RetryPolicy
+from core.shape import ShapeBaselines
+from config.settings import settings
 from services.posts_service import PostsService
 from services.users_service import UsersService
 from services.comments_service import CommentsService
 from services.cat_facts_service import CatFactsService
+from stubs.jsonplaceholder import StubServer
+from stubs.mock_transport import MockTransport
 
 
 @pytest.fixture(scope="session")
 def api_client():
     """Create API client instance"""
-    client = APIClient()
+    # Thread-safe so teardown can delete the entities tests created concurrently
+    client = APIClient(thread_safe=True)
     yield client
     client.close()
 
@@ -39,12 +54,188 @@ def comments_service(api_client):
 @pytest.fixture(scope="session")
 def cat_facts_service():
     """Create CatFactsService instance with cat facts API client"""
-    from config.settings import settings
     # Create a separate API client for cat facts API
-    cat_facts_client = APIClient(base_url="https://catfact.ninja")
+    cat_facts_client = APIClient(base_url=settings.cat_facts_base_url)
     return CatFactsService(cat_facts_client)
 
 
+@pytest.fixture(scope="session")
+def stub_server():
+    """Start a local JSONPlaceholder stand-in for network-free tests"""
+    server = StubServer().start_in_thread()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def shape_baselines():
+    """Per-endpoint response shapes; schemas are validated only when a shape is new"""
+    baselines = ShapeBaselines(settings.shape_baselines_file, update=settings.shape_update_baselines)
+    yield baselines
+    baselines.save()
+    summary = baselines.summary()
+    if summary["checks"]:
+        allure.attach(json.dumps(summary, indent=2), name="Response shapes",
+                      attachment_type=allure.attachment_type.JSON)
+
+
+@pytest.fixture
+def mock_transport():
+    """In-memory transport with no routes; add routes or a fallback stub per test"""
+    return MockTransport()
+
+
+@pytest.fixture
+def mock_api_client(mock_transport):
+    """APIClient served by mock_transport, with instant retries and its own host"""
+    # A unique host keeps circuit breakers and retry budgets from leaking between tests
+    client = APIClient(base_url=f"http://mock-{uuid.uuid4().hex[:12]}.test")
+    client.retry_policy = RetryPolicy(max_retries=settings.max_retries, base_delay=0, max_delay=0)
+    mock_transport.mount(client)
+    yield client
+    client.close()
+
+
+# Cleanup counts and leftovers summed over tests, the session and xdist workers
+_run_cleanup = {"tracked": 0, "deleted": 0, "leftovers": []}
+
+
+def _merge_cleanup(report):
+    _run_cleanup["tracked"] += report.get("tracked", 0)
+    _run_cleanup["deleted"] += report.get("deleted", 0)
+    _run_cleanup["leftovers"].extend(report.get("leftovers", []))
+
+
+def _new_tracker():
+    return ResourceTracker(concurrency=settings.cleanup_concurrency, budget=settings.cleanup_budget)
+
+
+def _cleanup(tracker):
+    """Delete what the tracker recorded and attach the report; None when there was nothing to do"""
+    if not settings.cleanup_enabled or not tracker.pending:
+        return None
+    report = tracker.cleanup()
+    allure.attach(json.dumps(report, indent=2, default=str), name="Cleanup",
+                  attachment_type=allure.attachment_type.JSON)
+    return report
+
+
+# Reports of session-level cleanup, handed to the xdist controller at session finish
+_session_cleanup = []
+
+
+@pytest.fixture(scope="session")
+def session_resource_tracker():
+    """Tracker for entities shared across tests; activate it around their creation"""
+    tracker = _new_tracker()
+    yield tracker
+    report = _cleanup(tracker)
+    if report:
+        _session_cleanup.append(report)
+
+
+@pytest.fixture(autouse=True)
+def resource_tracker():
+    """Record the posts, users and comments the test creates through the services
+
+    They are deleted by pytest_runtest_teardown before any fixture is torn down, while
+    the clients, transports and stand-ins that created them are still up.
+    """
+    tracker = _new_tracker()
+    with tracker.activate():
+        yield tracker
+
+
+# Metrics and bandwidth snapshots taken when the test ends, before teardown deletes
+_test_end = pytest.StashKey[tuple]()
+
+
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_teardown(item):
+    """Delete what the test created before its fixtures are torn down
+
+    The fixtures measuring the test stop at the snapshot taken here, so the deletes are
+    left out of its metrics and bandwidth and bounded by CLEANUP_BUDGET instead of the
+    test deadline.
+    """
+    item.stash[_test_end] = (metrics.snapshot(), bandwidth.snapshot())
+    tracker = getattr(item, "funcargs", {}).get("resource_tracker")
+    if tracker is not None and not item.get_closest_marker("keep_resources"):
+        report = _cleanup(tracker)
+        if report:
+            item.user_properties.append(("cleanup", report))
+    yield
+
+
+# Per-test counter deltas from test reports, and counter totals of xdist workers,
+# so the summary covers every process of the run
+_test_metrics = {}
+_worker_metrics = {}
+
+
+@pytest.fixture(autouse=True)
+def request_metrics(request):
+    """Report request, retry and retry-time counters for each test"""
+    before = metrics.snapshot()
+    yield
+    after = request.node.stash[_test_end][0] if _test_end in request.node.stash else metrics.snapshot()
+    used = metrics.delta(before, after)
+    if used.get("requests"):
+        used["retry_amplification"] = round(metrics.retry_amplification(used), 3)
+    if used:
+        request.node.user_properties.append(("request_metrics", used))
+        allure.attach(json.dumps(used, indent=2), name="Request metrics",
+                      attachment_type=allure.attachment_type.JSON)
+
+
+@pytest.fixture(autouse=True)
+def request_deadline(request):
+    """Bound the test's HTTP calls by its deadline marker or TEST_DEADLINE"""
+    marker = request.node.get_closest_marker("deadline")
+    seconds = marker.args[0] if marker else settings.test_deadline
+    if not seconds:
+        yield
+        return
+    with deadline(seconds):
+        yield
+
+
+# Tests skipped by CIRCUIT_OPEN_ACTION=skip; any of them makes the session fail
+_circuit_skipped = []
+
+
+# Per-endpoint bandwidth summed from test reports, so xdist workers' traffic is included
+_run_bandwidth = {}
+
+
+@pytest.fixture(autouse=True)
+def bandwidth_report(request):
+    """Report bytes on the wire, decoded bytes and decompression time per endpoint for each test"""
+    before = bandwidth.snapshot()
+    yield
+    after = request.node.stash[_test_end][1] if _test_end in request.node.stash else bandwidth.snapshot()
+    used = bandwidth.delta(before, after)
+    if used:
+        request.node.user_properties.append(("bandwidth", used))
+        allure.attach(json.dumps(used, indent=2), name="Bandwidth",
+                      attachment_type=allure.attachment_type.JSON)
+
+
+def pytest_runtest_logreport(report):
+    """Collect each test's metrics, bandwidth and cleanup once its teardown has recorded them"""
+    if report.skipped and any(name == "circuit_open" for name, _ in report.user_properties):
+        _circuit_skipped.append(report.nodeid)
+    if report.when != "teardown":
+        return
+    for name, value in report.user_properties:
+        if name == "request_metrics":
+            _test_metrics[report.nodeid] = value
+        elif name == "bandwidth":
+            BandwidthLedger.merge(_run_bandwidth, value)
+        elif name == "cleanup":
+            _merge_cleanup(value)
+
+
 @pytest.fixture
 def sample_post_data():
     """Sample post data for testing"""
@@ -93,8 +284,21 @@ def sample_comment_data():
     }
 
 
+# Attachment store of this process, and store counters summed over xdist workers
+_attachment_store = None
+_run_attachments = {}
+
+
+@pytest.hookimpl(trylast=True)
 def pytest_configure(config):
-    """Configure pytest with custom markers"""
+    """Configure pytest with custom markers and deduplicated Allure attachments"""
+    global _attachment_store
+    if settings.allure_attachment_dedup:
+        # trylast: allure-pytest registers its listener in its own pytest_configure
+        _attachment_store = attachments.install(config, compress_min_bytes=settings.allure_compress_min_bytes)
+    if not hasattr(config, "workerinput") and config.getoption("testrunuid", None) is None:
+        # Pick the xdist run id here so the controller knows which rate limit state files to delete
+        config.option.testrunuid = uuid.uuid4().hex
     config.addinivalue_line(
         "markers", "smoke: mark test as smoke test"
     )
@@ -107,3 +311,141 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "integration: mark test as integration test"
     )
+    config.addinivalue_line(
+        "markers", "deadline(seconds): bound the test's total HTTP time"
+    )
+    config.addinivalue_line(
+        "markers", "keep_resources: do not delete the entities the test created"
+    )
+
+
+def pytest_sessionfinish(session):
+    """Fail runs that skipped tests on an open circuit; hand worker results to the xdist controller"""
+    if _circuit_skipped and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    worker = hasattr(session.config, "workeroutput")
+    if worker:
+        session.config.workeroutput["metrics"] = metrics.snapshot()
+        session.config.workeroutput["session_cleanup"] = _session_cleanup
+    else:
+        for report in _session_cleanup:
+            _merge_cleanup(report)
+        # Workers have exited by now; a later run must not inherit this run's penalties
+        for run in {session.config.getoption("testrunuid", None), rate_limiter.run_id()} - {None}:
+            rate_limiter.remove_run_state(run)
+    if _attachment_store is None:
+        return
+    if worker:
+        session.config.workeroutput["attachments"] = _attachment_store.stats()
+    else:
+        _merge_attachments(_attachment_store.stats())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Collect request metrics, attachment counters and session cleanup from a finished xdist worker"""
+    output = getattr(node, "workeroutput", {})
+    metrics.merge(_worker_metrics, output.get("metrics", {}))
+    _merge_attachments(output.get("attachments", {}))
+    for report in output.get("session_cleanup", []):
+        _merge_cleanup(report)
+
+
+def _merge_attachments(counts):
+    for name, value in counts.items():
+        _run_attachments[name] = _run_attachments.get(name, 0) + value
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Report tests stopped by an open circuit as skipped, with the reason"""
+    outcome = yield
+    report = outcome.get_result()
+    if call.excinfo is None or not call.excinfo.errisinstance(CircuitOpenError):
+        return
+    if settings.circuit_open_action == "skip":
+        report.outcome = "skipped"
+        report.longrepr = (str(item.path), item.location[1], f"Skipped: {call.excinfo.value}")
+        # Counted by pytest_runtest_logreport, wherever the test ran, to fail the session
+        report.user_properties.append(("circuit_open", str(call.excinfo.value)))
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Print run-wide request metrics, bandwidth, attachment storage, cleanup leftovers and circuit skips"""
+    _metrics_summary(terminalreporter)
+    _bandwidth_summary(terminalreporter)
+    _attachments_summary(terminalreporter)
+    _cleanup_summary(terminalreporter)
+    if _circuit_skipped:
+        terminalreporter.section("circuit breaker")
+        terminalreporter.write_line(f"{len(_circuit_skipped)} tests skipped on an open circuit; failing the run")
+
+
+def _cleanup_summary(terminalreporter):
+    """Print how many created entities were deleted and list any left behind"""
+    if not _run_cleanup["tracked"]:
+        return
+    leftovers = _run_cleanup["leftovers"]
+    terminalreporter.section("cleanup")
+    terminalreporter.write_line(
+        f"{_run_cleanup['tracked']} created entities, {_run_cleanup['deleted']} deleted, {len(leftovers)} left over"
+    )
+    for leftover in leftovers[:20]:
+        terminalreporter.write_line(f"{leftover['resource']}/{leftover['id']}: {leftover['error']}")
+    if len(leftovers) > 20:
+        terminalreporter.write_line(f"... and {len(leftovers) - 20} more")
+
+
+def _metrics_summary(terminalreporter):
+    """Print run-wide request metrics and the tests that retried"""
+    totals = metrics.snapshot()
+    metrics.merge(totals, _worker_metrics)
+    if not totals:
+        return
+    terminalreporter.section("request metrics")
+    for name, value in sorted(totals.items()):
+        terminalreporter.write_line(f"{name}: {value:g}")
+    if totals.get("requests"):
+        terminalreporter.write_line(f"retry_amplification: {metrics.retry_amplification(totals):.3f}")
+    for nodeid, used in _test_metrics.items():
+        if used.get("retries"):
+            terminalreporter.write_line(
+                f"{nodeid}: {used['retries']:g} retries, {used.get('retry_seconds', 0):.2f}s retrying"
+            )
+
+
+def _attachments_summary(terminalreporter):
+    """Print how much the attachment store kept out of the Allure results"""
+    if not _run_attachments.get("attachments"):
+        return
+    terminalreporter.section("allure attachments")
+    attached, written = _run_attachments["bytes_attached"], _run_attachments["bytes_written"]
+    terminalreporter.write_line(
+        f"{_run_attachments['attachments']} attachments stored as {_run_attachments['stored']} files: "
+        f"{attached / 1024:.1f} KB attached, {written / 1024:.1f} KB written "
+        f"({1 - written / attached if attached else 0:.0%} saved)"
+    )
+
+
+def _bandwidth_summary(terminalreporter):
+    """Print per-endpoint bandwidth for the run and save it next to the HTML report"""
+    if not _run_bandwidth:
+        return
+    totals = BandwidthLedger.totals(_run_bandwidth)
+    terminalreporter.section("bandwidth")
+    terminalreporter.write_line(f"{'endpoint':<50}{'responses':>10}{'wire KB':>10}{'decoded KB':>12}"
+                                f"{'ratio':>7}{'decode ms':>11}")
+    for endpoint, counters in sorted(_run_bandwidth.items(), key=lambda item: -item[1]["wire_bytes"]):
+        wire, decoded = counters["wire_bytes"], counters["decoded_bytes"]
+        terminalreporter.write_line(
+            f"{endpoint[:49]:<50}{counters['responses']:>10g}{wire / 1024:>10.1f}{decoded / 1024:>12.1f}"
+            f"{(decoded / wire if wire else 1):>7.2f}{counters['decompress_ms']:>11.2f}"
+        )
+    terminalreporter.write_line(
+        f"{'total':<50}{totals['responses']:>10g}{totals['wire_bytes'] / 1024:>10.1f}"
+        f"{totals['decoded_bytes'] / 1024:>12.1f}{totals['compression_ratio']:>7.2f}"
+        f"{totals['decompress_ms']:>11.2f}"
+    )
+    os.makedirs("reports", exist_ok=True)
+    with open(os.path.join("reports", "bandwidth.json"), "w") as f:
+        json.dump({"totals": totals, "endpoints": _run_bandwidth}, f, indent=2)
@@ -0,0 +1,111 @@
+"""
+Test cases for the content-addressed Allure attachment store
+"""
+import gzip
+import json
+import uuid
+import pytest
+import allure
+from allure_commons import model2
+from core import attachments
+from core.attachments import AttachmentStore, ContentAddressedReporter
+from stubs.jsonplaceholder import JSONPlaceholderStub
+
+
+@pytest.fixture(scope="module")
+def comments_body():
+    """The 500-item /comments collection as served by the stand-in"""
+    return JSONPlaceholderStub().handle("GET", "/comments", {})[2]
+
+
+class FakeConfig:
+    """Just enough pytest config for install(): a listener and a results directory"""
+
+    def __init__(self, directory):
+        self.option = type("Option", (), {"allure_report_dir": directory})()
+        self.pluginmanager = type("PluginManager", (), {"get_plugin": staticmethod(lambda name: object())})()
+
+
+@allure.feature("Core Framework")
+@allure.story("Attachment Store")
+class TestAttachments:
+    """Test class for deduplicated, optionally compressed attachments"""
+
+    @allure.title("Identical payloads are written once")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_store(self, tmp_path, comments_body):
+        """Test deduplication of data and files, and compression above the threshold"""
+        store = AttachmentStore(str(tmp_path))
+        names = {store.put(comments_body, "json")[0] for _ in range(20)}
+        other, _ = store.put(b'{"id": 1}', "json")
+        source = tmp_path.parent / f"{tmp_path.name}-source.json"
+        source.write_bytes(comments_body)
+
+        assert len(names) == 1 and other not in names, "One file per distinct payload"
+        assert store.put_file(str(source), "json")[0] in names, "Files with the same content share it"
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(names | {other}), "No stray files"
+        stats = store.stats()
+        assert (stats["attachments"], stats["stored"]) == (22, 2), stats
+        assert stats["bytes_written"] == len(comments_body) + 9, "Only the distinct payloads hit the disk"
+        assert AttachmentStore(str(tmp_path)).put(comments_body, "json") == (names.pop(), False), \
+            "Files from other workers are reused"
+
+        (tmp_path / "packed").mkdir()
+        packed = AttachmentStore(str(tmp_path / "packed"), compress_min_bytes=1024)
+        name, compressed = packed.put(comments_body, "json")
+        assert compressed and name.endswith(".json.gz"), "Large payloads are gzipped"
+        assert gzip.decompress((tmp_path / "packed" / name).read_bytes()) == comments_body, "Content survives"
+        assert packed.put(b"small", "txt")[0].endswith(".txt"), "Small payloads are stored as they are"
+        assert packed.stats()["bytes_written"] < len(comments_body) / 4, "Compression shrinks repetitive JSON"
+
+    @allure.title("Test results reference the shared file")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_reporter(self, tmp_path, comments_body):
+        """Test that repeated attachments become references to one file"""
+        reporter = ContentAddressedReporter(AttachmentStore(str(tmp_path), compress_min_bytes=64 * 1024))
+        test_uuid = str(uuid.uuid4())
+        reporter.schedule_test(test_uuid, model2.TestResult(uuid=test_uuid, name="attachments"))
+        try:
+            for _ in range(5):
+                reporter.attach_data(uuid.uuid4(), comments_body, name="comments",
+                                     attachment_type=allure.attachment_type.JSON)
+            reporter.attach_data(uuid.uuid4(), "plain text", name="note", attachment_type=allure.attachment_type.TEXT)
+            attachments = reporter.get_test(test_uuid).attachments
+        finally:
+            reporter.drop_test(test_uuid)
+
+        sources = {attachment.source for attachment in attachments}
+        assert len(attachments) == 6 and len(sources) == 2, "Every attachment is listed, backed by two files"
+        comments = attachments[0]
+        assert comments.type == "application/gzip" and comments.name == "comments (gzip)", \
+            "Compressed attachments say so"
+        assert json.loads(gzip.decompress((tmp_path / comments.source).read_bytes())) == json.loads(comments_body)
+        assert attachments[-1].type == "text/plain" and (tmp_path / attachments[-1].source).read_text() == \
+            "plain text", "Small attachments stay inline"
+
+    @allure.title("The installed allure-commons has the reporter method the store uses")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_reporter_contract(self, monkeypatch):
+        """Test that an allure-commons upgrade changing AllureReporter._attach fails here and disables the store"""
+        assert attachments.reporter_supported(), \
+            "AllureReporter._attach changed; update core.attachments before moving the allure-commons pin"
+
+        monkeypatch.setattr(attachments.AllureReporter, "_attach", lambda self, uuid, name=None: None)
+        assert not attachments.reporter_supported(), "A changed signature should be detected"
+        assert attachments.install(FakeConfig("allure-results")) is None, "The store should not be installed"
+
+    @allure.title("The run's attachments go through the store")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_installed(self, pytestconfig, comments_body):
+        """Test that allure.attach in this session is deduplicated"""
+        listener = pytestconfig.pluginmanager.get_plugin("allure_listener")
+        if listener is None or not isinstance(listener.allure_logger, ContentAddressedReporter):
+            pytest.skip("Allure results are not being written")
+        store = listener.allure_logger.store
+        before = store.stats()
+        for _ in range(3):
+            allure.attach(comments_body, name="comments", attachment_type=allure.attachment_type.JSON)
+        after = store.stats()
+
+        assert after["attachments"] - before["attachments"] == 3, "Every attach is counted"
+        assert after["stored"] - before["stored"] <= 1, "The body is stored at most once"
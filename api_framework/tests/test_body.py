@@ -0,0 +1,108 @@
+"""
+Test cases for buffer-based response body handling
+"""
+import io
+import json
+import hashlib
+import pytest
+import allure
+from core.api_client import APIClient
+from core.body import read_into, join_into, loads, json_body, digest, preview
+from load.body_benchmark import run_benchmark
+from stubs.jsonplaceholder import StubServer
+
+
+class TrickleBody(io.RawIOBase):
+    """File-like body that returns at most ``step`` bytes per read, like a socket"""
+
+    def __init__(self, data: bytes, step: int):
+        self._data = memoryview(data)
+        self._step = step
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._step, len(self._data))
+        buffer[:size] = self._data[:size]
+        self._data = self._data[size:]
+        return size
+
+
+class Latin1Stub:
+    """Serve one JSON document encoded in the charset its Content-Type declares"""
+
+    def handle(self, method, path, query, body=b"", headers=None):
+        return 200, {"Content-Type": "application/json; charset=iso-8859-1"}, '{"name": "Zoë"}'.encode("latin-1")
+
+
+@allure.feature("Core Framework")
+@allure.story("Response Bodies")
+class TestBody:
+    """Test class for reading, parsing, hashing and previewing bodies in place"""
+
+    @allure.title("Bodies are read into one buffer")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_read_into(self):
+        """Test reads with exact, missing and understated lengths"""
+        data = json.dumps([{"id": i, "body": "x" * 50} for i in range(20000)]).encode()
+        assert read_into(TrickleBody(data, 1000), len(data)) == data, "Exact length fills the buffer"
+        assert read_into(TrickleBody(data, 70000)) == data, "Unknown length grows the buffer"
+        assert read_into(TrickleBody(b"", 10), 0) == b"", "Empty bodies stay empty"
+        assert join_into(iter([data[:7], data[7:]]), len(data)) == data, "Chunks are copied into place"
+        assert join_into(iter([data[:7], data[7:]]), 10) == data, "Understated lengths still fit"
+
+    @allure.title("Buffers parse, hash and preview without copies")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_parse_hash_preview(self):
+        """Test the helpers accept bytes-like buffers"""
+        buffer = bytearray(json.dumps({"title": "é" * 400}, ensure_ascii=False).encode())
+        assert loads(buffer) == loads(memoryview(buffer)) == {"title": "é" * 400}, "Buffers parse as JSON"
+        assert digest(buffer) == hashlib.sha256(bytes(buffer)).hexdigest(), "Digest matches hashlib"
+        assert preview(buffer, 11) == '{"title": "...', "Preview decodes only the head"
+        assert preview(b"short") == "short", "Short bodies are shown whole"
+        assert preview(buffer, 12).startswith('{"title": "�'), "Split characters are replaced"
+        assert loads(b'{"title": "\\ud800"}') == {"title": "\ud800"}, "Escaped lone surrogates are valid JSON"
+        with pytest.raises(json.JSONDecodeError):
+            loads(bytearray(b"{not json"))
+
+    @allure.title("Client bodies are buffers")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_client_bodies(self, stub_server):
+        """Test that client responses carry the read buffer and parse like response.json()"""
+        client = APIClient(base_url=stub_server.base_url)
+        try:
+            response = client.get("/comments")
+            head = client.head("/posts")
+        finally:
+            client.close()
+
+        assert type(response.content) is bytes, "Body should be bytes, as requests returns"
+        assert json_body(response) == response.json(), "Parsing should match requests"
+        assert len(response.content) == int(response.headers["Content-Length"]), "Buffer holds the whole body"
+        assert head.content == b"", "HEAD responses have no body"
+
+    @allure.title("Declared charsets are honoured")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_declared_charset(self):
+        """Test that a body in a charset other than UTF-8 is decoded with that charset"""
+        server = StubServer(stub=Latin1Stub()).start_in_thread()
+        client = APIClient(base_url=server.base_url)
+        try:
+            response = client.get("/people/1")
+        finally:
+            client.close()
+            server.stop()
+
+        assert response.encoding == "iso-8859-1", "Charset should come from Content-Type"
+        assert json_body(response) == {"name": "Zoë"}, "Body should be decoded as Latin-1, not UTF-8"
+
+    @allure.title("Allocation benchmark")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_allocation_benchmark(self):
+        """Test that the buffer pipeline allocates less than requests' default path on a large body"""
+        baseline, buffered = run_benchmark([4], repeats=1)
+
+        assert baseline["body_mb"] == buffered["body_mb"] >= 4, "Both pipelines read the same payload"
+        assert buffered["transient_mb"] < baseline["transient_mb"] - 2, \
+            f"Buffer pipeline should avoid a body-sized copy: {buffered} vs {baseline}"
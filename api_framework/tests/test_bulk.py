@@ -0,0 +1,92 @@
+"""
+Test cases for the bulk write pipeline
+"""
+import time
+import pytest
+import allure
+from core.api_client import APIClient
+from core.bulk import BulkWriter, Operation
+from services.posts_service import PostsService
+from services.users_service import UsersService
+from services.comments_service import CommentsService
+
+
+@pytest.fixture
+def bulk_client(stub_server):
+    """Thread-safe client for the stand-in, pooled for the writer's concurrency"""
+    client = APIClient(base_url=stub_server.base_url, thread_safe=True, pool_size=8)
+    yield client
+    client.close()
+
+
+@allure.feature("Core Framework")
+@allure.story("Bulk Writes")
+class TestBulkWriter:
+    """Test class for bounded, streaming bulk writes"""
+
+    @allure.title("Mixed writes stream back with a summary")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_bulk_writes(self, bulk_client, sample_post_data, sample_user_data):
+        """Test creates, updates and deletes through the services with per-operation results"""
+        posts, users, comments = PostsService(bulk_client), UsersService(bulk_client), CommentsService(bulk_client)
+
+        def operations():
+            for index in range(100):
+                yield Operation(posts.create_post, dict(sample_post_data, title=f"bulk {index}"), key=index)
+            for user_id in range(1, 11):
+                yield Operation(users.update_user, user_id, sample_user_data)
+            for comment_id in range(1, 51):
+                yield Operation(comments.delete_comment, comment_id)
+
+        writer = BulkWriter(concurrency=8)
+        results = list(writer.run(operations()))
+        summary = writer.summary()
+
+        assert len(results) == 160 and all(result.ok for result in results), "Every write should succeed"
+        assert sorted(result.index for result in results) == list(range(160)), "Each operation reports once"
+        assert summary["by_operation"] == {"create_post": {"succeeded": 100, "failed": 0},
+                                           "update_user": {"succeeded": 10, "failed": 0},
+                                           "delete_comment": {"succeeded": 50, "failed": 0}}, summary
+        assert summary["operations_per_second"] > 0 and summary["p99_ms"] > 0, "Throughput should be reported"
+        assert summary["max_in_flight"] <= 8, "Concurrency should be bounded"
+
+    @allure.title("Failures are reported per operation")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_operation_errors(self, bulk_client, sample_user_data):
+        """Test that unexpected statuses and exceptions fail only their own operation"""
+        users = UsersService(bulk_client)
+
+        def explode(_):
+            raise RuntimeError("boom")
+
+        report = BulkWriter(concurrency=4).run_all([
+            Operation(users.update_user, 1, sample_user_data),
+            Operation(users.update_user, 999, sample_user_data),
+            Operation(explode, "record-7"),
+            Operation(users.update_user, 2, sample_user_data, expected_status=[200, 201]),
+        ])
+
+        assert report["succeeded"] == 2 and report["failed"] == 2, f"Unexpected summary {report}"
+        failures = {failure["key"]: failure for failure in report["failures"]}
+        assert failures[999]["status_code"] == 500 and "500" in failures[999]["error"], "Status failures are kept"
+        assert failures["record-7"]["error"] == "RuntimeError: boom", "Exceptions are captured"
+
+    @allure.title("Producers are throttled by backpressure")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_backpressure(self):
+        """Test that operations are pulled lazily and abandoning the run stops the producer"""
+        pulled = []
+
+        def operations():
+            for index in range(10_000):
+                pulled.append(index)
+                yield Operation(lambda value: time.sleep(0.002) or {"status_code": 200}, index)
+
+        writer = BulkWriter(concurrency=4, max_pending=8)
+        for completed, _ in enumerate(writer.run(operations()), start=1):
+            assert len(pulled) - completed <= 8, "No more than max_pending operations may be outstanding"
+            if completed == 50:
+                break
+
+        assert len(pulled) < 100, f"The producer should stop with the consumer, pulled {len(pulled)}"
+        assert writer.summary()["operations"] == 50, "Only consumed results are counted"
@@ -4,7 +4,19 @@ Test cases for Cat Facts API endpoints
 import pytest
 import allure
 from services.cat_facts_service import CatFactsService
-from core.validators import APIValidator
+from core.api_client import APIClient
+from core.validators import APIValidator, CAT_FACT_SCHEMA, CAT_BREED_SCHEMA, cat_facts_page_schema
+from core.sweep import Sweep, SweepCase, run_case, format_results
+from config.settings import settings
+
+
+# One row per endpoint and expected outcome
+ENDPOINTS = Sweep([
+    SweepCase("/fact", 200, schema=CAT_FACT_SCHEMA),
+    SweepCase("/facts", 200, params={"limit": 10, "page": 1}, schema=cat_facts_page_schema(CAT_FACT_SCHEMA)),
+    SweepCase("/breeds", 200, params={"limit": 10, "page": 1}, schema=cat_facts_page_schema(CAT_BREED_SCHEMA)),
+    SweepCase("/invalid_endpoint", 404),
+])
 
 
 @allure.feature("Cat Facts API")
@@ -15,33 +27,28 @@ class TestCatFactsAPI:
     @allure.title("Test API endpoints with parametrize")
     @allure.severity(allure.severity_level.CRITICAL)
     @pytest.mark.smoke
-    @pytest.mark.parametrize("endpoint,expected_status", [
-        ("/fact", 200),
-        ("/facts", 200),
-        ("/breeds", 200),
-        ("/invalid_endpoint", 404)
-    ])
-    def test_api_endpoints(self, cat_facts_service, endpoint, expected_status):
-        """Test various API endpoints for expected status codes using parametrize"""
-        with allure.step(f"Make GET request to {endpoint}"):
-            if endpoint == "/fact":
-                result = cat_facts_service.get_random_fact()
-            elif endpoint == "/facts":
-                result = cat_facts_service.get_facts()
-            elif endpoint == "/breeds":
-                result = cat_facts_service.get_breeds()
-            else:
-                # For invalid endpoint, we'll make a direct request
-                response = cat_facts_service.api_client.get(endpoint)
-                result = {
-                    "response": response,
-                    "data": None,
-                    "status_code": response.status_code
-                }
-        
-        with allure.step(f"Verify response status code is {expected_status}"):
-            assert result["status_code"] == expected_status, \
-                f"Expected {expected_status}, got {result['status_code']}"
+    @pytest.mark.parametrize("case", ENDPOINTS.params())
+    def test_api_endpoints(self, cat_facts_service, case):
+        """Test various API endpoints for expected status codes and schemas, one case per table row"""
+        with allure.step(f"Make {case.method} request to {case.path}"):
+            result = run_case(cat_facts_service.api_client, case)
+        
+        with allure.step(f"Verify response status code is {case.expected_status}"):
+            assert result.ok, result.error
+    
+    @allure.title("Test all endpoints concurrently")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_endpoint_sweep(self, shape_baselines):
+        """Run the whole endpoint table at once through a shared client and report per-row latency"""
+        client = APIClient(base_url=settings.cat_facts_base_url, thread_safe=True)
+        try:
+            results = ENDPOINTS.run(client, concurrency=len(ENDPOINTS), shapes=shape_baselines)
+        finally:
+            client.close()
+        
+        allure.attach(format_results(results), name="Endpoint sweep", attachment_type=allure.attachment_type.TEXT)
+        failures = [result.to_dict() for result in results if not result.ok]
+        assert not failures, f"Endpoint sweep failures: {failures}"
     
     @allure.title("Test random fact content validation")
     @allure.severity(allure.severity_level.CRITICAL)
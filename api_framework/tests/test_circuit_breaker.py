@@ -0,0 +1,150 @@
+"""
+Test cases for the per-host circuit breaker
+"""
+import time
+import pytest
+import allure
+from core.api_client import APIClient
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError, circuit_breaker, reset_circuit_breakers
+from core.deadline import DeadlineExceeded, deadline
+from core.retry_policy import RetryPolicy
+from core.metrics import metrics
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def breaker():
+    """Breaker opening after two failures with a 10s recovery timeout"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("example.test", failure_threshold=2, recovery_timeout=10, clock=clock)
+    breaker.clock_source = clock
+    return breaker
+
+
+@allure.feature("Core Framework")
+@allure.story("Circuit Breaker")
+class TestCircuitBreaker:
+    """Test class for circuit breaker state transitions"""
+    
+    @allure.title("Open after consecutive failures")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_opens_after_threshold(self, breaker):
+        """Test that the circuit opens after the failure threshold and rejects requests"""
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED, "One failure should not open the circuit"
+        
+        assert breaker.record_failure(), "Second failure should open the circuit"
+        with pytest.raises(CircuitOpenError) as excinfo:
+            breaker.before_request()
+        assert "example.test" in str(excinfo.value), "Error should name the host"
+    
+    @allure.title("Success resets the failure count")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_success_resets(self, breaker):
+        """Test that failures must be consecutive"""
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED, "Non-consecutive failures should not open the circuit"
+    
+    @allure.title("Half-open probe closes or reopens the circuit")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.parametrize("probe_succeeds,expected_state", [
+        (True, CircuitBreaker.CLOSED),
+        (False, CircuitBreaker.OPEN)
+    ])
+    def test_half_open_probe(self, breaker, probe_succeeds, expected_state):
+        """Test that one probe is allowed after the recovery timeout"""
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.clock_source.now = 10
+        
+        assert breaker.state == CircuitBreaker.HALF_OPEN, "Circuit should be half-open after the timeout"
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        
+        if probe_succeeds:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        assert breaker.state == expected_state, f"Circuit should be {expected_state} after the probe"
+    
+    @allure.title("Client fails fast on a dead host")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_client_fails_fast(self, monkeypatch):
+        """Test that APIClient stops contacting a host once its circuit is open"""
+        reset_circuit_breakers()
+        monkeypatch.setattr("config.settings.settings.circuit_failure_threshold", 2)
+        client = APIClient(base_url="http://127.0.0.1:9")
+        client.retry_policy = RetryPolicy(max_retries=0)
+        
+        for _ in range(2):
+            with pytest.raises(Exception):
+                client.get("/posts")
+        
+        before = metrics.snapshot()
+        started = time.monotonic()
+        with pytest.raises(CircuitOpenError):
+            client.get("/posts")
+        used = metrics.delta(before, metrics.snapshot())
+        
+        assert time.monotonic() - started < 0.1, "Open circuit should fail immediately"
+        assert used["circuit_rejections"] == 1 and "attempts" not in used, "No attempt should be sent"
+        reset_circuit_breakers()
+    
+    @allure.title("Aborted probe frees its half-open slot")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_aborted_probe(self, breaker):
+        """Test that a released probe lets the next request through"""
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.clock_source.now = 10
+        breaker.before_request()
+        
+        breaker.release()
+        breaker.before_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN, "Releasing should not change the state"
+        breaker.release()
+        breaker.release()
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+    
+    @allure.title("Client probe cut short by the deadline does not block the host")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_client_probe_aborted_by_deadline(self, monkeypatch):
+        """Test that a half-open probe aborted before sending is released, not leaked"""
+        reset_circuit_breakers()
+        monkeypatch.setattr("config.settings.settings.circuit_failure_threshold", 1)
+        monkeypatch.setattr("config.settings.settings.circuit_recovery_timeout", 0.05)
+        client = APIClient(base_url="http://127.0.0.1:9")
+        client.retry_policy = RetryPolicy(max_retries=0)
+        try:
+            with pytest.raises(Exception):
+                client.get("/posts")
+            time.sleep(0.06)
+            assert circuit_breaker("127.0.0.1:9").state == CircuitBreaker.HALF_OPEN
+            
+            with pytest.raises(DeadlineExceeded):
+                with deadline(0):
+                    client.get("/posts")
+            
+            before = metrics.snapshot()
+            with pytest.raises(Exception) as excinfo:
+                client.get("/posts")
+            used = metrics.delta(before, metrics.snapshot())
+        finally:
+            reset_circuit_breakers()
+        
+        assert excinfo.type is not CircuitOpenError, "The probe slot should have been released"
+        assert used["attempts"] == 1, "The next request should be sent as the probe"
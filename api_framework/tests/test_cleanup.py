@@ -0,0 +1,150 @@
+"""
+Test cases for tracked teardown of created posts, users and comments
+"""
+import json
+import time
+import asyncio
+import pytest
+import allure
+from core.api_client import APIClient
+from core.cleanup import ResourceTracker, record_created
+from core.parallel import run_parallel
+from core.retry_policy import RetryPolicy
+from config.settings import settings
+from services.posts_service import PostsService
+from services.users_service import UsersService
+from services.comments_service import CommentsService
+from stubs.jsonplaceholder import JSONPlaceholderStub, StubServer
+
+
+class UniqueIdStub(JSONPlaceholderStub):
+    """Stand-in that gives every created entity its own id and answers deletes after a delay"""
+
+    def __init__(self, delete_delay=0.0):
+        super().__init__()
+        self.delete_delay = delete_delay
+        self.created = 0
+        self.deleted = []
+
+    async def handle(self, method, path, query, body=b"", headers=None):
+        status, response_headers, response_body = super().handle(method, path, query, body, headers)
+        if method == "POST" and status == 201:
+            self.created += 1
+            response_body = json.dumps(dict(json.loads(response_body), id=1000 + self.created)).encode()
+        elif method == "DELETE":
+            await asyncio.sleep(self.delete_delay)
+            self.deleted.append(path)
+        return status, response_headers, response_body
+
+
+@pytest.fixture
+def unique_id_server():
+    """Start a stand-in per test; call with the delete delay it should use"""
+    servers = []
+
+    def make(delete_delay=0.0):
+        server = StubServer(stub=UniqueIdStub(delete_delay)).start_in_thread()
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def checked_server(unique_id_server):
+    """Stand-in that must have received the test's deletes by the time its fixture is torn down"""
+    server = unique_id_server()
+    yield server
+    assert server.stub.deleted == ["/posts/1001"], \
+        f"Teardown should delete the created post while the stand-in is up: {server.stub.deleted}"
+
+
+@allure.feature("Core Framework")
+@allure.story("Resource Cleanup")
+class TestCleanup:
+    """Test class for recording created entities and deleting them in batches"""
+
+    @allure.title("Created entities are recorded and deleted children first")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.keep_resources
+    def test_records_and_order(self, unique_id_server, sample_user_data, sample_post_data, sample_comment_data):
+        """Test recording from the services and worker threads, de-duplication and delete order"""
+        server = unique_id_server()
+        client = APIClient(base_url=server.base_url, thread_safe=True, pool_size=8)
+        users, posts, comments = UsersService(client), PostsService(client), CommentsService(client)
+        tracker = ResourceTracker()
+        try:
+            # Recorded by the per-test fixture instead, which keep_resources leaves alone
+            users.create_user(sample_user_data)
+            assert not tracker.pending, "Nothing is recorded while the tracker is inactive"
+            with tracker.activate():
+                users.create_user(sample_user_data)
+                run_parallel(posts.create_post, [sample_post_data] * 5)
+                run_parallel(comments.create_comment, [sample_comment_data] * 3)
+                record_created("comments", 42, comments.delete_comment)
+                record_created("comments", 42, comments.delete_comment)
+            assert [resource for resource, _ in tracker.pending].count("comments") == 4, \
+                "Repeated ids are recorded once"
+            report = tracker.cleanup()
+        finally:
+            client.close()
+
+        assert (report["tracked"], report["deleted"], report["leftovers"]) == (10, 10, []), report
+        assert not tracker.pending, "Cleanup empties the tracker"
+        order = [path.split("/")[1] for path in server.stub.deleted]
+        assert order == ["comments"] * 4 + ["posts"] * 5 + ["users"], \
+            f"Children should be deleted before what they belong to: {order}"
+
+    @allure.title("Deletes run concurrently")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_concurrent(self, unique_id_server, sample_post_data):
+        """Test that a batch of slow deletes takes about one round trip per concurrency slot"""
+        server = unique_id_server(delete_delay=0.1)
+        client = APIClient(base_url=server.base_url, thread_safe=True, pool_size=10)
+        tracker = ResourceTracker(concurrency=10)
+        try:
+            with tracker.activate():
+                run_parallel(PostsService(client).create_post, [sample_post_data] * 20)
+            report = tracker.cleanup()
+        finally:
+            client.close()
+
+        assert report["deleted"] == 20, report
+        assert report["elapsed_s"] < 1.0, f"20 deletes of 0.1s should not run one by one: {report['elapsed_s']}s"
+
+    @allure.title("Deletes past the budget are reported as leftovers")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_budget(self, unique_id_server, sample_post_data):
+        """Test that a client that is not thread-safe deletes serially and stops at the budget"""
+        server = unique_id_server(delete_delay=0.3)
+        client = APIClient(base_url=server.base_url)
+        client.retry_policy = RetryPolicy(max_retries=0)
+        tracker = ResourceTracker(budget=0.5)
+        try:
+            with tracker.activate():
+                for _ in range(5):
+                    PostsService(client).create_post(sample_post_data)
+            started = time.monotonic()
+            report = tracker.cleanup()
+        finally:
+            client.close()
+
+        assert time.monotonic() - started < 1.5, "Cleanup should stop close to its budget"
+        assert report["deleted"] == 1, f"Only the first delete fits in 0.5s: {report}"
+        assert len(report["leftovers"]) == 4, report
+        assert {leftover["resource"] for leftover in report["leftovers"]} == {"posts"}, report
+
+    @allure.title("Teardown deletes before fixtures are torn down")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_teardown_order(self, checked_server, sample_post_data, monkeypatch, request):
+        """Test that the per-test cleanup runs while the test's client and stand-in are still up"""
+        monkeypatch.setattr(settings, "cleanup_enabled", True)
+        client = APIClient(base_url=checked_server.base_url)
+        request.addfinalizer(client.close)
+
+        result = PostsService(client).create_post(sample_post_data)
+
+        assert result["status_code"] == 201, f"Expected 201, got {result['status_code']}"
+        assert not checked_server.stub.deleted, "Nothing should be deleted before the test ends"
@@ -4,7 +4,17 @@ Test cases for Comments API endpoints
 import pytest
 import allure
 from services.comments_service import CommentsService
-from core.validators import APIValidator
+from core.sweep import Sweep, SweepCase, run_case
+from core.validators import APIValidator, COMMENT_SCHEMA, list_schema
+
+
+# Status and schema checks, one generated test per row
+ENDPOINTS = Sweep([
+    SweepCase("/comments", schema=list_schema(COMMENT_SCHEMA)),
+    SweepCase("/comments/1", schema=COMMENT_SCHEMA),
+    SweepCase("/comments", params={"postId": 1}, schema=list_schema(COMMENT_SCHEMA)),
+    SweepCase("/comments/99999", 404, name="non-existent comment"),
+])
 
 
 @allure.feature("Comments API")
@@ -144,17 +154,16 @@ class TestCommentsAPI:
         with allure.step("Verify response data"):
             assert result["data"] is None, "Response data should be None for DELETE"
     
-    @allure.title("Get non-existent comment")
+    @allure.title("Comment endpoints return their expected status and schema")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_get_nonexistent_comment(self, comments_service):
-        """Test retrieving a non-existent comment"""
-        non_existent_id = 99999
-        
-        with allure.step(f"Make GET request to /comments/{non_existent_id}"):
-            result = comments_service.get_comment_by_id(non_existent_id)
-        
-        with allure.step("Verify response status code"):
-            assert result["status_code"] == 404, f"Expected 404, got {result['status_code']}"
+    @pytest.mark.parametrize("case", ENDPOINTS.params())
+    def test_api_endpoints(self, comments_service, case):
+        """Test each row of the ENDPOINTS sweep table, including the 404 for a non-existent comment"""
+        with allure.step(f"Make {case.method} request to {case.path}"):
+            result = run_case(comments_service.api_client, case)
+        
+        with allure.step(f"Verify response status code is {case.expected_status}"):
+            assert result.ok, result.error
     
     @allure.title("Validate comment email format")
     @allure.severity(allure.severity_level.NORMAL)
@@ -0,0 +1,139 @@
+"""
+Test cases for compression negotiation and bandwidth accounting
+"""
+import zlib
+import pytest
+import allure
+from core.api_client import APIClient
+from core.compression import bandwidth, BandwidthLedger, accept_encoding, decompress, endpoint_key
+from config.settings import settings
+from stubs.jsonplaceholder import JSONPlaceholderStub, StubServer
+
+
+class BodilessStub(JSONPlaceholderStub):
+    """Stand-in that labels empty 204 and 304 responses gzip, as some CDNs do"""
+
+    def handle(self, method, path, query, body=b"", headers=None):
+        if method == "DELETE":
+            return 204, {"Content-Encoding": "gzip"}, b""
+        if (headers or {}).get("if-none-match"):
+            return 304, {"Content-Encoding": "gzip", "ETag": '"1"'}, b""
+        return super().handle(method, path, query, body, headers)
+
+
+@pytest.fixture(scope="module")
+def compressing_server():
+    """Stand-in that compresses responses per Accept-Encoding"""
+    server = StubServer(compress=True).start_in_thread()
+    yield server
+    server.stop()
+
+
+def fetch(base_url, path):
+    """GET ``path`` with a fresh client and return the response with the bandwidth it used"""
+    before = bandwidth.snapshot()
+    client = APIClient(base_url=base_url)
+    try:
+        response = client.get(path)
+    finally:
+        client.close()
+    return response, bandwidth.delta(before, bandwidth.snapshot())
+
+
+@allure.feature("Core Framework")
+@allure.story("Compression")
+class TestCompression:
+    """Test class for content negotiation, decoding and per-endpoint accounting"""
+
+    @allure.title("Compressed responses are decoded and accounted")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_negotiated_compression(self, compressing_server, monkeypatch):
+        """Test that gzip is negotiated and wire bytes are counted separately from decoded bytes"""
+        monkeypatch.setattr(settings, "compression_encodings", "gzip")
+        response, used = fetch(compressing_server.base_url, "/posts")
+
+        assert response.headers["Content-Encoding"] == "gzip", "Stand-in should honour Accept-Encoding"
+        assert len(response.json()) == 100, "Body should be decoded before parsing"
+        counters = used[endpoint_key("GET", f"{compressing_server.base_url}/posts")]
+        assert counters["compressed_responses"] == counters["responses"] == 1, "One compressed response"
+        assert counters["decoded_bytes"] == len(response.content), "Decoded size is the body size"
+        assert counters["wire_bytes"] < counters["decoded_bytes"] / 3, "JSON should compress well"
+
+    @allure.title("Compression can be disabled")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_identity(self, compressing_server, monkeypatch):
+        """Test that disabling compression requests identity bodies"""
+        monkeypatch.setattr(settings, "compression_enabled", False)
+        assert accept_encoding() == "identity", "Only identity should be accepted"
+
+        response, used = fetch(compressing_server.base_url, "/posts/1")
+
+        assert "Content-Encoding" not in response.headers, "Body should not be compressed"
+        counters = used[endpoint_key("GET", f"{compressing_server.base_url}/posts/1")]
+        assert counters["wire_bytes"] == counters["decoded_bytes"], "Identity bodies cost their size"
+        assert counters["compressed_responses"] == 0, "Nothing was compressed"
+
+    @allure.title("Content codings decode")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_decompress(self):
+        """Test zlib-wrapped and raw deflate, gzip, and unknown codings"""
+        data = b'{"id": 1}' * 50
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        assert decompress(zlib.compress(data), "deflate") == data, "zlib-wrapped deflate"
+        assert decompress(raw.compress(data) + raw.flush(), "deflate") == data, "Raw deflate"
+        assert decompress(zlib.compress(data, wbits=16 + zlib.MAX_WBITS), "gzip") == data, "gzip"
+        with pytest.raises(ValueError):
+            decompress(data, "compress")
+
+    @allure.title("Endpoints group by path template")
+    @allure.severity(allure.severity_level.MINOR)
+    def test_endpoint_key_and_totals(self):
+        """Test id folding and ledger totals"""
+        assert endpoint_key("get", "https://api.test/posts/12/comments?x=1") == "GET api.test/posts/{id}/comments"
+        run = {}
+        BandwidthLedger.merge(run, {"GET a/posts": {"responses": 1, "wire_bytes": 100, "decoded_bytes": 400}})
+        BandwidthLedger.merge(run, {"GET a/posts": {"responses": 1, "wire_bytes": 100, "decoded_bytes": 400}})
+        totals = BandwidthLedger.totals(run)
+        assert totals["responses"] == 2 and totals["compression_ratio"] == 4.0, f"Unexpected totals {totals}"
+
+    @allure.title("HTTP/2 responses are accounted")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_http2_accounting(self, monkeypatch):
+        """Test that the HTTP/2 transport decodes and accounts compressed bodies"""
+        pytest.importorskip("h2", reason='HTTP/2 transport needs "httpx[http2]"')
+        from stubs.http2_server import HTTP2StubServer
+
+        monkeypatch.setattr(settings, "http2_enabled", True)
+        monkeypatch.setattr(settings, "compression_encodings", "gzip")
+        server = HTTP2StubServer(compress=True).start_in_thread()
+        try:
+            response, used = fetch(server.base_url, "/comments")
+        finally:
+            server.stop()
+
+        assert len(response.json()) == 500, "Body should be decoded before parsing"
+        counters = used[endpoint_key("GET", f"{server.base_url}/comments")]
+        assert counters["compressed_responses"] == 1, "Response should arrive compressed"
+        assert counters["wire_bytes"] < counters["decoded_bytes"], "Wire bytes should be the compressed size"
+
+    @allure.title("Bodiless responses with a Content-Encoding are not decoded")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.parametrize("method,kwargs,status", [
+        ("head", {}, 200),
+        ("delete", {}, 204),
+        ("get", {"headers": {"If-None-Match": '"1"'}}, 304),
+    ], ids=["head", "204", "304"])
+    def test_bodiless_responses(self, method, kwargs, status, monkeypatch):
+        """Test that HEAD, 204 and 304 responses labelled gzip come back empty instead of failing to decode"""
+        monkeypatch.setattr(settings, "compression_encodings", "gzip")
+        server = StubServer(stub=BodilessStub(), compress=True).start_in_thread()
+        client = APIClient(base_url=server.base_url)
+        try:
+            response = getattr(client, method)("/posts/1", **kwargs)
+        finally:
+            client.close()
+            server.stop()
+
+        assert response.status_code == status, f"Expected {status}, got {response.status_code}"
+        assert response.headers["Content-Encoding"] == "gzip", "Response should declare gzip"
+        assert response.content == b"", "Bodiless response should have empty content"
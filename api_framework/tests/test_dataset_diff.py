@@ -0,0 +1,101 @@
+"""
+Test cases for incremental dataset diffs
+"""
+import json
+import pytest
+import allure
+from core.api_client import APIClient
+from core.dataset_diff import DatasetDiff, iter_array, record_hash
+from stubs.jsonplaceholder import JSONPlaceholderStub, StubServer
+
+
+@pytest.fixture
+def mutable_server():
+    """Stand-in whose data the test may change between diffs"""
+    server = StubServer(stub=JSONPlaceholderStub()).start_in_thread()
+    yield server
+    server.stop()
+
+
+@allure.feature("Core Framework")
+@allure.story("Dataset Diffs")
+class TestDatasetDiff:
+    """Test class for the streaming array parser, record hashes and collection diffs"""
+
+    @allure.title("Arrays are parsed element by element")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_iter_array(self, sample_user_data):
+        """Test that elements split across chunks, multi-byte characters and numbers parse"""
+        records = [dict(sample_user_data, id=index, name=f"Zoë {index} ✓") for index in range(20)] + [7, "x", None]
+        body = json.dumps(records, indent=2, ensure_ascii=False).encode("utf-8")
+
+        for size in (1, 7, 64, len(body)):
+            chunks = (body[start:start + size] for start in range(0, len(body), size))
+            assert list(iter_array(chunks)) == records, f"Chunks of {size} bytes should parse"
+        assert list(iter_array([b"[", b"12", b"34]"])) == [1234], "Numbers may span chunks"
+        assert list(iter_array([b" [ ] "])) == [], "Empty arrays yield nothing"
+        with pytest.raises(ValueError):
+            list(iter_array([b'{"id": 1}']))
+        with pytest.raises(ValueError):
+            list(iter_array([b'[{"id": 1}, {"id"']))
+
+    @allure.title("Record hashes ignore key order")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_record_hash(self, sample_post_data):
+        """Test that hashes depend on content only"""
+        reordered = dict(reversed(list(sample_post_data.items())))
+        assert record_hash(sample_post_data) == record_hash(reordered), "Key order should not matter"
+        assert record_hash(sample_post_data) != record_hash(dict(sample_post_data, title="Other")), \
+            "Any value change should"
+
+    @allure.title("Diff reports added, removed and changed ids")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_diff(self, mutable_server, tmp_path):
+        """Test the first run, an unchanged run and a run after the data changed"""
+        stub = mutable_server.stub
+        client = APIClient(base_url=mutable_server.base_url, thread_safe=True, pool_size=8)
+        posts = DatasetDiff(client, "posts", index_dir=str(tmp_path))
+        try:
+            first = posts.run()
+            assert first["first_run"] and first["records"] == 100, first
+            assert not first["details"], "Nothing is fetched without a previous index"
+
+            before = mutable_server.stats["requests"]
+            unchanged = posts.run()
+            assert unchanged["unchanged"] == 100 and not unchanged["changed"], unchanged
+            assert mutable_server.stats["requests"] - before == 1, "An unchanged collection costs one request"
+
+            items = [dict(post, title="edited") if post["id"] in (3, 42) else post
+                     for post in stub.data["posts"] if post["id"] != 7]
+            items.append(dict(stub.data["posts"][0], id=101))
+            stub.set_items("posts", items)
+            before = mutable_server.stats["requests"]
+            diff = posts.run()
+        finally:
+            client.close()
+
+        assert (diff["added"], diff["removed"], diff["changed"]) == (["101"], ["7"], ["3", "42"]), diff
+        assert diff["unchanged"] == 97, diff
+        assert diff["details"]["42"]["title"] == "edited", "Changed records should be fetched in full"
+        assert set(diff["details"]) == {"3", "42", "101"}, "Only changed records are fetched"
+        assert mutable_server.stats["requests"] - before == 4, "One collection read plus one per change"
+        with open(posts.index_path) as f:
+            saved = json.load(f)["records"]
+        assert len(saved) == 100 and "7" not in saved, "The index should follow the latest data"
+
+    @allure.title("Indexes are per resource and can be left untouched")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_resources_and_dry_run(self, mutable_server, tmp_path):
+        """Test users and comments diffs and that dry runs do not update the index"""
+        client = APIClient(base_url=mutable_server.base_url)
+        try:
+            for resource, count in (("users", 10), ("comments", 500)):
+                assert DatasetDiff(client, resource, index_dir=str(tmp_path)).run()["records"] == count
+            comments = DatasetDiff(client, "comments", index_dir=str(tmp_path))
+            mutable_server.stub.set_items("comments", mutable_server.stub.data["comments"][:-1])
+            assert comments.run(save=False)["removed"] == ["500"], "Dry run should still report"
+            assert comments.run(fetch_details=False)["removed"] == ["500"], "The index was not updated"
+            assert comments.run()["removed"] == [], "Until a saving run"
+        finally:
+            client.close()
+        assert sorted(path.name.split("-")[-1] for path in tmp_path.iterdir()) == ["comments.json", "users.json"]
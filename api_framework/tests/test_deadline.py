@@ -0,0 +1,122 @@
+"""
+Test cases for deadline propagation into request timeouts
+"""
+import time
+import asyncio
+import pytest
+import allure
+import requests
+from core.api_client import APIClient
+from core.deadline import DeadlineExceeded, deadline, remaining, clamp_timeout
+from core.metrics import metrics
+from core.retry_policy import RetryPolicy
+from core import retry_policy
+from stubs.jsonplaceholder import StubServer
+
+
+class SlowStub:
+    """Answers every request after a fixed delay"""
+
+    def __init__(self, delay, status=200, headers=None):
+        self.delay = delay
+        self.status = status
+        self.headers = dict(headers or {}, **{"Content-Type": "application/json"})
+        self.calls = 0
+
+    async def handle(self, method, path, query, body=b"", headers=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.status, self.headers, b"{}"
+
+
+@pytest.fixture
+def slow_client(monkeypatch):
+    """Client pointed at a slow stand-in with fast, fresh retry settings"""
+    monkeypatch.setattr(retry_policy, "_budgets", {})
+    servers = []
+
+    def make(delay, status=200, headers=None, base_delay=0.05):
+        server = StubServer(stub=SlowStub(delay, status, headers)).start_in_thread()
+        servers.append(server)
+        client = APIClient(base_url=server.base_url)
+        client.retry_policy = RetryPolicy(max_retries=3, base_delay=base_delay, max_delay=base_delay)
+        return client, server.stub
+
+    yield make
+    for server in servers:
+        server.stop()
+
+
+@allure.feature("Core Framework")
+@allure.story("Deadlines")
+class TestDeadline:
+    """Test class for deadline context and client integration"""
+
+    @allure.title("Timeouts shrink to the time left")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_clamp_timeout(self):
+        """Test that connect and read timeouts are capped by the deadline"""
+        assert clamp_timeout(30) == (30, False), "Timeouts are untouched without a deadline"
+
+        with deadline(2):
+            (connect, read), shortened = clamp_timeout((1, 30))
+            assert connect == 1, "A connect timeout below the deadline is kept"
+            assert 1.9 < read <= 2, "The read timeout should be capped at the time left"
+            assert shortened, "Capping should be reported"
+
+            with deadline(10):
+                assert remaining() <= 2, "Nested deadlines cannot extend the outer one"
+
+        assert remaining() is None, "The deadline should end with its block"
+
+    @allure.title("Requests fail fast once the deadline has passed")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_expired_deadline_raises(self, slow_client):
+        """Test that no request is sent after the deadline"""
+        client, stub = slow_client(0)
+
+        with deadline(0.05):
+            time.sleep(0.06)
+            with pytest.raises(DeadlineExceeded):
+                client.get("/posts/1")
+
+        client.close()
+        assert stub.calls == 0, "No request should reach the server"
+
+    @allure.title("Slow call times out at the deadline")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_slow_call_cut_at_deadline(self, slow_client):
+        """Test that a hanging call fails at the deadline instead of API_TIMEOUT"""
+        client, _ = slow_client(2.0)
+        before = metrics.snapshot()
+
+        started = time.monotonic()
+        with deadline(0.3), pytest.raises(requests.exceptions.Timeout):
+            client.get("/posts/1")
+        elapsed = time.monotonic() - started
+
+        used = metrics.delta(before, metrics.snapshot())
+        client.close()
+        assert elapsed < 1.0, f"Call should end near the 0.3s deadline, took {elapsed:.2f}s"
+        assert used.get("retries_cancelled_by_deadline") == 1, "Retry should be cancelled by the deadline"
+        assert "circuit_opened" not in used, "Deadline timeouts must not count against the backend"
+
+    @allure.title("Retries that would overrun the deadline are cancelled")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_retry_cancelled(self, slow_client):
+        """Test that the last response is returned when a retry would outlive the deadline"""
+        client, stub = slow_client(0, status=503, headers={"Retry-After": "1"})
+
+        with deadline(0.5):
+            response = client.get("/posts/1")
+
+        client.close()
+        assert response.status_code == 503, "The last response should be returned"
+        assert stub.calls == 1, "The retry should not have been sent"
+
+    @allure.title("Deadline marker bounds the test")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.deadline(5)
+    def test_marker(self):
+        """Test that the deadline marker applies to the test body"""
+        assert 4 < remaining() <= 5, "The marker's deadline should be active"
@@ -0,0 +1,138 @@
+"""
+Test cases for the fault-injecting proxy
+"""
+import time
+import random
+import pytest
+import allure
+import requests
+from core.api_client import APIClient
+from core.retry_policy import RetryPolicy
+from core import retry_policy
+from stubs.fault_proxy import FaultProxy, FaultRule, LatencyDistribution, benchmark
+
+
+@pytest.fixture
+def fault_proxy(monkeypatch):
+    """Start a proxy in front of the in-process stand-in with the given rules"""
+    monkeypatch.setattr(retry_policy, "_budgets", {})
+    proxies = []
+
+    def make(*rules, upstream=None):
+        proxy = FaultProxy([FaultRule.parse(rule) for rule in rules], upstream=upstream, seed=7).start_in_thread()
+        proxies.append(proxy)
+        return proxy
+
+    yield make
+    for proxy in proxies:
+        proxy.stop()
+
+
+def fast_client(proxy):
+    """Client with millisecond backoff so fault tests stay quick"""
+    client = APIClient(base_url=proxy.base_url)
+    client.retry_policy = RetryPolicy(max_retries=3, base_delay=0.01, max_delay=0.02)
+    return client
+
+
+@allure.feature("Core Framework")
+@allure.story("Fault Injection")
+class TestFaultProxy:
+    """Test class for fault rules, proxying and the resilience benchmark"""
+
+    @allure.title("Latency distributions")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_latency_distributions(self):
+        """Test that distributions parse and sample within their bounds"""
+        rng = random.Random(1)
+        assert LatencyDistribution.parse("fixed:25").sample(rng) == 0.025, "Fixed latency is exact"
+        samples = [LatencyDistribution.parse("uniform:10:20").sample(rng) for _ in range(200)]
+        assert 0.01 <= min(samples) and max(samples) <= 0.02, "Uniform samples stay in range"
+        samples = sorted(LatencyDistribution.parse("lognormal:50:0.5").sample(rng) for _ in range(2001))
+        assert 0.04 < samples[1000] < 0.06, "Lognormal median should be near 50ms"
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse("pareto:1")
+
+    @allure.title("Rules parse from specs")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_rule_parse(self):
+        """Test that rule specs map onto rule fields and match paths"""
+        rule = FaultRule.parse("^/posts method=get latency=fixed:5 bandwidth=1000 reset=0.1 error=0.2 status=502")
+
+        assert (rule.method, rule.bandwidth, rule.reset_rate, rule.error_rate, rule.error_status) == \
+            ("GET", 1000, 0.1, 0.2, 502), f"Unexpected rule {rule}"
+        assert rule.matches("GET", "/posts/1") and not rule.matches("POST", "/posts"), "Method should be matched"
+        assert not rule.matches("GET", "/users/1"), "Path regex should be matched"
+
+    @allure.title("Requests pass through unfaulted")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_passthrough(self, fault_proxy, stub_server):
+        """Test forwarding to an upstream server over HTTP"""
+        proxy = fault_proxy(upstream=stub_server.base_url)
+        client = fast_client(proxy)
+
+        response = client.get("/posts/1")
+
+        client.close()
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert response.json()["id"] == 1, "Upstream body should be forwarded"
+
+    @allure.title("Injected errors are retried by the client")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_error_injection(self, fault_proxy):
+        """Test that a failing route exhausts the client's retries"""
+        proxy = fault_proxy("^/users error=1 status=502")
+        client = fast_client(proxy)
+
+        response = client.get("/users/1")
+
+        client.close()
+        assert response.status_code == 502, f"Expected injected 502, got {response.status_code}"
+        assert proxy.stats["errors_injected"] == 4, "Original attempt plus three retries should be faulted"
+
+    @allure.title("Connection resets surface as connection errors")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_reset_injection(self, fault_proxy):
+        """Test that resets reach the client as ConnectionError after retries"""
+        proxy = fault_proxy("^/comments reset=1")
+        client = fast_client(proxy)
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get("/comments/1")
+
+        client.close()
+        assert proxy.stats["resets_injected"] == 4, "Every attempt should be reset"
+
+    @allure.title("Latency and bandwidth caps slow responses down")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_latency_and_bandwidth(self, fault_proxy):
+        """Test that latency delays and bandwidth caps throttle the response"""
+        proxy = fault_proxy("^/posts/1$ latency=fixed:100", "^/posts$ bandwidth=100000")
+        client = fast_client(proxy)
+
+        started = time.monotonic()
+        client.get("/posts/1")
+        delayed = time.monotonic() - started
+        started = time.monotonic()
+        size = len(client.get("/posts").content)
+        throttled = time.monotonic() - started
+
+        client.close()
+        assert delayed >= 0.1, f"Latency should be injected, took {delayed:.3f}s"
+        assert throttled >= size / 100000 * 0.9, f"{size} bytes at 100kB/s took only {throttled:.3f}s"
+
+    @allure.title("Benchmark reports latency percentiles and retries")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_benchmark(self, fault_proxy):
+        """Test the benchmark report under intermittent errors"""
+        proxy = fault_proxy("^/posts error=0.3")
+
+        report = benchmark(proxy, requests_count=30, paths=["/posts/1"], concurrency=2,
+                           retry_policy=RetryPolicy(max_retries=5, base_delay=0.001, max_delay=0.002))
+
+        assert sum(report["outcomes"].values()) == 30, f"Every request should be accounted for: {report}"
+        returned_errors = report["outcomes"].get("503", 0)
+        assert report["retries"] + returned_errors == report["faults"]["errors_injected"], \
+            "Each injected error is either retried or returned to the caller"
+        assert report["retry_amplification"] > 1, "Retries should amplify attempts"
+        assert report["p50_ms"] <= report["p99_ms"], "Percentiles should be ordered"
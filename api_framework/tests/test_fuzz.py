@@ -0,0 +1,83 @@
+"""
+Test cases for schema-driven payload fuzzing
+"""
+import random
+import allure
+from core.api_client import APIClient
+from core.fuzz import KINDS, Fuzzer, FuzzTarget, service_targets, shrink
+from core.validators import POST_SCHEMA, USER_SCHEMA
+from services.posts_service import PostsService
+from services.users_service import UsersService
+from services.comments_service import CommentsService
+
+
+@allure.feature("Core Framework")
+@allure.story("Payload Fuzzing")
+class TestFuzz:
+    """Test class for payload generation, shrinking and fuzz runs against the stand-in"""
+
+    @allure.title("Payloads are generated from the schemas")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_generate(self):
+        """Test that every mutation kind is produced and judged against the write schema"""
+        create = FuzzTarget("create_user", lambda payload: None, USER_SCHEMA)
+        patch = FuzzTarget("patch_user", lambda payload: None, USER_SCHEMA, partial=True)
+        rng = random.Random(5)
+        cases = {kind: [create.generate(index, rng, kind) for index in range(50)] for kind in KINDS}
+
+        assert all(case.valid and "id" not in case.payload for case in cases["valid"]), "Ids are server-assigned"
+        assert all(case.valid for case in cases["boundary"] + cases["unicode"] + cases["extra"]), \
+            "Odd values of the right type and extra fields still satisfy the schema"
+        assert not any(case.valid for case in cases["wrong_type"]), "Wrong types break the schema"
+        assert any("." in case.description for case in cases["missing"]), "Nested fields are mutated too"
+        assert any(not case.valid for case in cases["missing"]), "Missing required fields break it"
+        assert all(patch.generate(index, rng, "missing").valid for index in range(50)), "PATCH fields are optional"
+        assert [case.payload for case in Fuzzer([create]).generate(20, seed=1)] == \
+            [case.payload for case in Fuzzer([create]).generate(20, seed=1)], "Seeds replay the same cases"
+
+    @allure.title("Failures shrink to minimal payloads")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_shrink(self):
+        """Test shrinking a payload that trips a length bug in a nested field"""
+        def fails(payload):
+            return isinstance(payload, dict) and len(payload.get("company", {}).get("bs", "")) > 100
+
+        payload = {"name": "x" * 50, "company": {"name": "c", "bs": "é" * 9000}, "tags": [1, 2, 3]}
+        minimal, attempts = shrink(payload, fails)
+
+        assert list(minimal) == ["company"] and list(minimal["company"]) == ["bs"], f"Unrelated keys go: {minimal}"
+        assert set(minimal["company"]["bs"]) == {"a"}, "Characters are simplified"
+        assert 100 < len(minimal["company"]["bs"]) < 150, f"Length shrinks towards the bound: {minimal}"
+        assert attempts < 200, "Shrinking should stay within its attempt budget"
+
+    @allure.title("Fuzz run finds and shrinks a server bug")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_failures_grouped(self):
+        """Test that failures are grouped by message and reduced to a repro"""
+        def create(payload):
+            too_long = isinstance(payload, dict) and len(str(payload.get("title", ""))) > 255
+            return {"status_code": 500 if too_long else 201, "data": payload}
+
+        report = Fuzzer([FuzzTarget("create_post", create, POST_SCHEMA)], concurrency=4).run(400, seed=11)
+
+        assert report["failed"] > 0 and len(report["failures"]) == 1, "One bug, one failure group"
+        failure = report["failures"][0]
+        assert failure["error"] == "Server error 500" and failure["occurrences"] == report["failed"], failure
+        assert list(failure["payload"]) == ["title"] and len(failure["payload"]["title"]) > 255, failure
+
+    @allure.title("Write endpoints survive fuzzing")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_services(self, stub_server):
+        """Test a concurrent fuzz run through all nine write calls of the services"""
+        client = APIClient(base_url=stub_server.base_url, thread_safe=True, pool_size=8)
+        try:
+            targets = service_targets(PostsService(client), UsersService(client), CommentsService(client))
+            report = Fuzzer(targets, concurrency=8).run(900, seed=7)
+        finally:
+            client.close()
+
+        assert len(targets) == 9, "Create, update and patch for each resource"
+        assert report["failures"] == [], f"Fuzzing found failures: {report['failures']}"
+        assert set(report["by_kind"]) == set(KINDS), report["by_kind"]
+        assert set(report["statuses"]) == {"200", "201"}, report["statuses"]
+        assert report["cases_per_second"] > 100, f"Expected concurrent throughput: {report['cases_per_second']}"
@@ -0,0 +1,114 @@
+"""
+Test cases for hedged GET requests
+"""
+import time
+import asyncio
+import pytest
+import allure
+import requests
+from core.hedging import HedgePolicy, Hedger
+from core.metrics import metrics
+from core.parallel import run_parallel
+from stubs.jsonplaceholder import StubServer
+
+
+class SlowFirstStub:
+    """Delays the first request, answers later ones immediately"""
+    
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+    
+    async def handle(self, method, path, query, body=b"", headers=None):
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(self.delay)
+        return 200, {"Content-Type": "application/json"}, b'{"call": %d}' % self.calls
+
+
+class SlowStub:
+    """Delays every request"""
+    
+    def __init__(self, delay):
+        self.delay = delay
+    
+    async def handle(self, method, path, query, body=b"", headers=None):
+        await asyncio.sleep(self.delay)
+        return 200, {"Content-Type": "application/json"}, b"{}"
+
+
+@pytest.fixture
+def slow_first_server():
+    """Stand-in whose first response takes one second"""
+    server = StubServer(stub=SlowFirstStub(1.0)).start_in_thread()
+    yield server
+    server.stop()
+
+
+@allure.feature("Core Framework")
+@allure.story("Request Hedging")
+class TestHedging:
+    """Test class for hedge policy and hedger"""
+    
+    @allure.title("Hedge wins against a slow primary")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_hedge_wins(self, slow_first_server):
+        """Test that a slow GET is answered by the hedge on a second connection"""
+        hedger = Hedger(HedgePolicy(min_delay_ms=50, max_rate=0.5, burst=1), requests.Session())
+        before = metrics.snapshot()
+        
+        started = time.monotonic()
+        response = hedger.request(requests.Session(), "GET", f"{slow_first_server.base_url}/posts/1")
+        elapsed = time.monotonic() - started
+        
+        used = metrics.delta(before, metrics.snapshot())
+        hedger.close()
+        assert response.json() == {"call": 2}, "The hedged response should be used"
+        assert elapsed < 0.5, f"Hedging should cut the wait, took {elapsed:.2f}s"
+        assert used == {"hedges_sent": 1, "hedge_wins": 1}, f"Unexpected hedge metrics {used}"
+    
+    @allure.title("Hedging does not cap concurrency")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_concurrent_primaries(self):
+        """Test that many concurrent GETs through one hedger are not queued behind each other"""
+        server = StubServer(stub=SlowStub(0.3)).start_in_thread()
+        # No hedge budget: every request is a plain primary
+        hedger = Hedger(HedgePolicy(min_delay_ms=10, max_rate=0, burst=0), requests.Session())
+        session = requests.Session()
+        session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=24))
+        try:
+            started = time.monotonic()
+            responses = run_parallel(lambda _: hedger.request(session, "GET", f"{server.base_url}/posts/1"),
+                                     range(24), max_workers=24)
+            elapsed = time.monotonic() - started
+        finally:
+            hedger.close()
+            session.close()
+            server.stop()
+        
+        assert [response.status_code for response in responses] == [200] * 24, "Every request should succeed"
+        assert elapsed < 0.6, f"24 concurrent 0.3s requests should take about 0.3s, took {elapsed:.2f}s"
+    
+    @allure.title("Hedge rate is capped")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_hedge_rate_cap(self):
+        """Test that hedges stay below the configured fraction of requests"""
+        policy = HedgePolicy(max_rate=0.1, burst=1)
+        hedges = 0
+        for _ in range(100):
+            policy.delay("example.test")
+            hedges += policy.try_hedge("example.test")
+        
+        assert hedges <= 11, f"At most 10% of 100 requests (plus burst) may hedge, got {hedges}"
+    
+    @allure.title("Hedge delay follows observed latency")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_hedge_delay_percentile(self):
+        """Test that the delay tracks the configured percentile once warmed up"""
+        policy = HedgePolicy(percentile=90, min_delay_ms=10, min_samples=10)
+        assert policy.delay("example.test") == 0.01, "Minimum delay should apply before warm-up"
+        
+        for millis in range(1, 101):
+            policy.record("example.test", millis / 1000)
+        
+        assert 0.089 <= policy.delay("example.test") <= 0.092, "Delay should be the p90 latency"
@@ -0,0 +1,83 @@
+"""
+Test cases for the latency histogram
+"""
+import sys
+import random
+import pytest
+import allure
+from core.histogram import LatencyHistogram
+from core.validators import APIValidator
+
+
+@allure.feature("Core Framework")
+@allure.story("Latency Histogram")
+class TestLatencyHistogram:
+    """Test class for LatencyHistogram functionality"""
+    
+    @allure.title("Recorded values keep requested precision")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.parametrize("value_us", [0, 1, 255, 256, 257, 1000, 12345, 999999, 3_599_999_999])
+    def test_value_precision(self, value_us):
+        """Test that a recorded value maps back within 1% precision"""
+        histogram = LatencyHistogram()
+        histogram.record(value_us)
+        
+        reported = histogram.percentile(100)
+        assert value_us <= reported <= value_us * 1.01 + 1, f"{reported} should cover {value_us}"
+        assert histogram.min <= value_us <= histogram.max, "Min and max should bracket the value"
+    
+    @allure.title("Percentiles match exact values")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_percentiles(self):
+        """Test percentiles against exact nearest-rank values"""
+        rng = random.Random(42)
+        values = sorted(int(rng.lognormvariate(10, 1)) for _ in range(10000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        
+        assert histogram.total_count == len(values), "Every sample should be counted"
+        for pct in (50, 90, 99, 99.9):
+            exact = values[int(pct / 100 * len(values)) - 1]
+            assert exact * 0.99 <= histogram.percentile(pct) <= exact * 1.01, f"p{pct} should be within 1%"
+    
+    @allure.title("Memory stays constant")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_constant_memory(self):
+        """Test that recording samples does not grow the store"""
+        histogram = LatencyHistogram()
+        size = sys.getsizeof(histogram.counts)
+        for value in range(0, 100_000_000, 997):
+            histogram.record(value)
+        
+        assert sys.getsizeof(histogram.counts) == size, "Counts store should not grow"
+    
+    @allure.title("Merge and serialization round trip")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_merge_and_serialize(self):
+        """Test merging histograms and restoring them from bytes and text"""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        for value in range(1, 1000):
+            first.record(value)
+            second.record(value * 100)
+        
+        merged = first.copy().add(second)
+        restored = LatencyHistogram.from_bytes(merged.to_bytes())
+        
+        assert merged.total_count == first.total_count + second.total_count, "Counts should add up"
+        assert list(restored.counts) == list(merged.counts), "Binary round trip should be lossless"
+        assert LatencyHistogram.decode(merged.encode()).percentile(99) == merged.percentile(99), \
+            "Text round trip should be lossless"
+        with pytest.raises(ValueError):
+            merged.add(LatencyHistogram(significant_figures=3))
+    
+    @allure.title("Validate latency percentile")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_validate_latency_percentile(self):
+        """Test percentile-based response time validation"""
+        histogram = LatencyHistogram()
+        for seconds in (0.1, 0.2, 0.3, 2.5):
+            histogram.record_seconds(seconds)
+        
+        assert APIValidator.validate_latency_percentile(histogram, 75, 400), "p75 should be within 400ms"
+        assert not APIValidator.validate_latency_percentile(histogram, 99, 2000), "p99 should exceed 2000ms"
@@ -0,0 +1,101 @@
+"""
+Test cases for the HTTP/2 transport
+"""
+import socket
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import allure
+import requests
+from core.api_client import APIClient
+from core.retry_policy import is_pre_send_failure
+from config.settings import settings
+
+pytest.importorskip("h2", reason='HTTP/2 transport needs "httpx[http2]"')
+pytest.importorskip("httpx", reason='HTTP/2 transport needs "httpx[http2]"')
+
+from core.http2_adapter import HTTP2Adapter  # noqa: E402
+from stubs.http2_server import HTTP2StubServer  # noqa: E402
+from load.http2_benchmark import compare_transports  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def http2_server():
+    """HTTP/2 (h2c) JSONPlaceholder stand-in"""
+    server = HTTP2StubServer().start_in_thread()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def http2_client(http2_server, monkeypatch):
+    """APIClient built with the HTTP/2 transport selected in settings"""
+    monkeypatch.setattr(settings, "http2_enabled", True)
+    client = APIClient(base_url=http2_server.base_url)
+    yield client
+    client.close()
+
+
+@allure.feature("Core Framework")
+@allure.story("HTTP/2 Transport")
+class TestHTTP2:
+    """Test class for the HTTP/2 adapter, stand-in and benchmark"""
+
+    @allure.title("Settings select the HTTP/2 transport")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_requests_over_http2(self, http2_client, sample_post_data):
+        """Test reads, writes and streamed bodies over HTTP/2"""
+        assert isinstance(http2_client.session.get_adapter(http2_client.base_url), HTTP2Adapter), \
+            "HTTP2_ENABLED should mount the HTTP/2 adapter"
+
+        response = http2_client.get("/posts/1")
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert response.http_version == "HTTP/2", f"Expected HTTP/2, got {response.http_version}"
+        assert response.json()["id"] == 1, "Body should be decoded"
+
+        created = http2_client.post("/posts", json_data=sample_post_data)
+        assert created.status_code == 201, f"Expected 201, got {created.status_code}"
+        assert created.json()["title"] == sample_post_data["title"], "Request body should be sent"
+
+        streamed = http2_client.get("/comments", stream=True)
+        assert len(b"".join(streamed.iter_content(1024))) == int(streamed.headers["content-length"]), \
+            "Streamed body should be complete"
+
+    @allure.title("Concurrent requests share one connection")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_multiplexing(self, http2_client, http2_server):
+        """Test that concurrent requests are multiplexed over a single connection"""
+        before = http2_server.stats["connections"]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            statuses = list(executor.map(lambda _: http2_client.get("/users").status_code, range(40)))
+
+        assert statuses == [200] * 40, "All requests should succeed"
+        assert http2_server.stats["connections"] - before == 1, "One connection should carry every stream"
+
+    @allure.title("Connection failures keep requests semantics")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_connect_error_translation(self):
+        """Test that refused connections surface as pre-send ConnectionErrors"""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        session = requests.Session()
+        session.mount("http://", HTTP2Adapter())
+
+        with pytest.raises(requests.exceptions.ConnectionError) as error:
+            session.get(f"http://127.0.0.1:{port}/posts", timeout=1)
+
+        session.close()
+        assert is_pre_send_failure(error.value), "Refused connections are safe to replay"
+
+    @allure.title("Transport comparison benchmark")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_compare_transports(self):
+        """Test that the benchmark reports connections, throughput and latency per transport"""
+        http1, http2 = compare_transports(concurrency=8, requests_count=80, latency_ms=5)
+
+        assert http1["errors"] == http2["errors"] == 0, "Both transports should serve every request"
+        assert http2["connections"] == 1, "HTTP/2 should use a single connection"
+        assert http1["connections"] > 1, "Concurrent HTTP/1.1 requests need several connections"
+        assert http2["max_concurrent_streams"] > 1, "Streams should overlap on the HTTP/2 connection"
+        assert all(report["requests_per_second"] > 0 and report["p99_ms"] > 0 for report in (http1, http2))
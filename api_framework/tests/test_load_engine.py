@@ -0,0 +1,120 @@
+"""
+Test cases for the load testing engines
+"""
+import time
+import socket
+import pytest
+import allure
+from load.scenarios import Scenario, ScenarioRunner, Step
+from load.workflows import build_scenarios
+from load.multiprocess_driver import MultiProcessLoadDriver
+from load.shared_histogram import SharedHistogram, merge
+
+
+def _step(name, seconds=0.0, status=200):
+    """Step that takes ``seconds`` and answers ``status`` without any HTTP"""
+    def action(vu):
+        time.sleep(seconds)
+        return {"status_code": status}
+    return Step(name, action)
+
+
+@allure.feature("Load Testing")
+@allure.story("Load Engines")
+class TestLoadEngine:
+    """Test class for scenario engine and multi-process driver"""
+    
+    @allure.title("Closed-loop virtual users run weighted scenarios")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_scenario_engine(self):
+        """Test step latencies, failed iterations and scenario weights without a server"""
+        scenarios = [
+            Scenario("browse", [_step("list", 0.002), _step("open", 0.005)], weight=3),
+            Scenario("broken", [_step("start"), _step("fail", status=500), _step("never")], weight=1),
+        ]
+        runner = ScenarioRunner(scenarios, concurrency=4, duration=0.4, ramp_up=0.1, ramp_down=0.1, seed=3)
+        
+        with allure.step("Run the load profile"):
+            report = runner.run()
+        
+        with allure.step("Verify report contents"):
+            browse, broken = report["scenarios"]["browse"], report["scenarios"]["broken"]
+            assert browse["count"] > broken["count"] > 0, "Both scenarios should run, browse about 3x as often"
+            assert browse["errors"] == 0 and broken["errors"] == broken["count"], "Only broken iterations fail"
+            assert "broken/never" not in report["steps"], "A failed step should end the iteration"
+            assert report["errors"] == report["steps"]["broken/fail"]["count"], "Errors should count failed steps"
+            assert report["requests"] == sum(row["count"] for row in report["steps"].values())
+            opened = report["steps"]["browse/open"]
+            assert 4.5 <= opened["p50_ms"] <= opened["p99_ms"] <= opened["max_ms"], \
+                "Step latency should include the step's own time"
+    
+    @allure.title("Run weighted scenarios against local stand-in")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_scenario_runner_report(self, stub_server):
+        """Test that every scenario step is reported with percentiles"""
+        scenarios = build_scenarios(["user_content_journey:2", "post_write_cycle:1", "comment_write_cycle:1"])
+        runner = ScenarioRunner(scenarios, concurrency=3, duration=0.5, ramp_up=0.2, ramp_down=0.2,
+                                base_url=stub_server.base_url, seed=7)
+        
+        with allure.step("Run the load profile"):
+            report = runner.run()
+        
+        with allure.step("Verify report contents"):
+            assert report["errors"] == 0, f"Expected no errors, got {report['errors']}"
+            assert report["iterations"] > 0, "At least one scenario iteration should complete"
+            assert report["requests_per_second"] > 0, "Throughput should be reported"
+            for name, row in report["steps"].items():
+                assert row["p50_ms"] <= row["p99_ms"] <= row["max_ms"], f"Percentiles of {name} should be ordered"
+    
+    @allure.title("Reject unknown scenario names")
+    @allure.severity(allure.severity_level.MINOR)
+    def test_unknown_scenario(self):
+        """Test that unknown scenarios are rejected"""
+        with pytest.raises(ValueError):
+            build_scenarios(["no_such_scenario"])
+    
+    @allure.title("Merge shared histograms")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_shared_histogram_merge(self):
+        """Test that shared histograms merge counts and errors"""
+        first, second = SharedHistogram(), SharedHistogram()
+        first.record(1000)
+        second.record(2000)
+        second.record_error()
+        
+        merged, errors = merge([first, second])
+        
+        assert merged.total_count == 2, "Both samples should be merged"
+        assert errors == 1, "Errors should be summed"
+        assert first.histogram.total_count == 1, "Merging should not modify the sources"
+    
+    @allure.title("Multi-process driver merges worker histograms")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.slow
+    def test_multiprocess_driver(self, stub_server):
+        """Test that the coordinator merges per-process shared histograms"""
+        driver = MultiProcessLoadDriver(stub_server.base_url, processes=2, connections_per_process=2, duration=0.5)
+        
+        with allure.step("Run the driver"):
+            report = driver.run()
+        
+        with allure.step("Verify merged report"):
+            assert report["errors"] == 0, f"Expected no errors, got {report['errors']}"
+            assert report["requests"] == sum(report["per_process_requests"]), "Merged count should match workers"
+            assert all(count > 0 for count in report["per_process_requests"]), "Every worker should send requests"
+    
+    @allure.title("Multi-process driver backs off from a dead backend")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.slow
+    def test_multiprocess_driver_backoff(self):
+        """Test that refused connections are retried with a backoff rather than in a tight loop"""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        driver = MultiProcessLoadDriver(f"http://127.0.0.1:{port}", processes=1, connections_per_process=4,
+                                        duration=1.0)
+        
+        report = driver.run()
+        
+        assert report["requests"] == 0, "Nothing should succeed against a closed port"
+        assert 0 < report["errors"] <= 60, f"Each connection should retry a few times a second, got {report['errors']}"
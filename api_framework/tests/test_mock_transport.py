@@ -0,0 +1,97 @@
+"""
+Service tests served by the in-memory mock transport
+"""
+import json
+import time
+import pytest
+import allure
+import requests
+from services.posts_service import PostsService
+from services.users_service import UsersService
+from stubs.jsonplaceholder import JSONPlaceholderStub
+from stubs.mock_transport import UnmatchedRequest
+
+
+@allure.feature("Core Framework")
+@allure.story("Mock Transport")
+class TestMockTransport:
+    """Test class for service logic against in-memory responses"""
+
+    @allure.title("Service extracts data from a canned response")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_canned_response(self, mock_transport, mock_api_client):
+        """Test that a canned route is served and the call recorded"""
+        post = {"userId": 1, "id": 7, "title": "canned", "body": "from memory"}
+        mock_transport.get("/posts/{id}", json_body=post)
+        posts_service = PostsService(mock_api_client)
+
+        result = posts_service.get_post_by_id(7)
+
+        assert result["status_code"] == 200, f"Expected 200, got {result['status_code']}"
+        assert result["data"] == post, "Data should be the canned post"
+        assert posts_service.validate_post_schema(result["data"]), "Canned post should match the schema"
+        assert [call.params for call in mock_transport.calls] == [{"id": "7"}], "Call should be recorded"
+
+    @allure.title("Service handles error statuses")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_error_status(self, mock_transport, mock_api_client):
+        """Test that non-success statuses leave data empty"""
+        mock_transport.get("/users/{id}", status=404, json_body={})
+
+        result = UsersService(mock_api_client).get_user_by_id(999)
+
+        assert result["status_code"] == 404, f"Expected 404, got {result['status_code']}"
+        assert result["data"] is None, "Data should be None for a 404"
+
+    @allure.title("Programmatic handler sees the request body")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_handler(self, mock_transport, mock_api_client, sample_post_data):
+        """Test that handlers can build responses from the recorded call"""
+        mock_transport.post("/posts", handler=lambda call: (201, {}, json.dumps(dict(call.json(), id=101)).encode()))
+
+        result = PostsService(mock_api_client).create_post(sample_post_data)
+
+        assert result["status_code"] == 201, f"Expected 201, got {result['status_code']}"
+        assert result["data"] == dict(sample_post_data, id=101), "Handler response should be used"
+        call = mock_transport.calls_to("POST", "/posts")[0]
+        assert call.headers.get("Idempotency-Key"), "Write should carry an idempotency key"
+
+    @allure.title("Retries are served from memory")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_retry_then_success(self, mock_transport, mock_api_client):
+        """Test that a transient 503 is retried without sockets or sleeping"""
+        responses = [(503, {}, b"{}"), (200, {"Content-Type": "application/json"}, b"[]")]
+        mock_transport.get("/posts", handler=lambda call: responses.pop(0))
+
+        result = PostsService(mock_api_client).get_all_posts()
+
+        assert result["status_code"] == 200, "The retry should succeed"
+        assert len(mock_transport.calls) == 2, "Both attempts should be recorded"
+
+    @allure.title("Latency injection and timeouts")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_latency(self, mock_transport, mock_api_client):
+        """Test that injected latency is applied and can exceed the read timeout"""
+        mock_transport.get("/posts/1", json_body={}, latency=0.05)
+        mock_transport.get("/posts/2", json_body={}, latency=5)
+
+        started = time.monotonic()
+        mock_api_client.get("/posts/1")
+        assert time.monotonic() - started >= 0.05, "Latency should be injected"
+
+        mock_api_client.retry_policy.max_retries = 0
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            mock_api_client.get("/posts/2", timeout=0.01)
+
+    @allure.title("Fallback stub and unmatched requests")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_fallback(self, mock_transport, mock_api_client):
+        """Test that the JSONPlaceholder stand-in can serve unrouted requests in memory"""
+        with pytest.raises(UnmatchedRequest):
+            mock_api_client.get("/posts")
+
+        mock_transport.fallback = JSONPlaceholderStub()
+        result = PostsService(mock_api_client).get_posts_by_user(2)
+
+        assert result["status_code"] == 200, f"Expected 200, got {result['status_code']}"
+        assert {post["userId"] for post in result["data"]} == {2}, "Query should reach the stub"
@@ -0,0 +1,105 @@
+"""
+Test cases for the thread-safe client mode and run_parallel
+"""
+import gc
+import time
+import threading
+import pytest
+import allure
+from core.api_client import APIClient
+from core.deadline import deadline, remaining
+from core.parallel import run_parallel
+from services.posts_service import PostsService
+from load.parallel_benchmark import compare
+
+
+@allure.feature("Core Framework")
+@allure.story("Parallel Execution")
+class TestParallel:
+    """Test class for per-thread sessions, ordered parallel calls and the benchmark"""
+
+    @allure.title("Threads get their own session over one pool")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_thread_sessions(self, stub_server):
+        """Test that thread-safe clients hand each thread a session sharing the client's adapter"""
+        client = APIClient(base_url=stub_server.base_url, thread_safe=True)
+        try:
+            sessions = run_parallel(lambda _: (threading.get_ident(), client.session), range(16), max_workers=4)
+            adapter = client.session.get_adapter(stub_server.base_url)
+
+            by_thread = dict(sessions)
+            assert len(set(map(id, by_thread.values()))) == len(by_thread), "Each thread has its own session"
+            assert client.session not in by_thread.values(), "The creating thread keeps its own session"
+            assert all(session.get_adapter(stub_server.base_url) is adapter for session in by_thread.values()), \
+                "Every session should share the client's connection pool"
+        finally:
+            client.close()
+
+        shared = APIClient(base_url=stub_server.base_url)
+        try:
+            assert run_parallel(lambda _: shared.session, range(4)) == [shared.session] * 4, \
+                "Clients are single-session by default"
+        finally:
+            shared.close()
+
+    @allure.title("Sessions of finished threads are released")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_thread_sessions_released(self, stub_server):
+        """Test that repeated run_parallel calls on one client do not accumulate sessions"""
+        client = APIClient(base_url=stub_server.base_url, thread_safe=True)
+        posts = PostsService(client)
+        try:
+            for _ in range(50):
+                run_parallel(posts.get_post_by_id, range(1, 9), max_workers=8)
+            gc.collect()
+
+            assert len(client._sessions) <= 1 + 8, \
+                f"Only the client's own and live threads' sessions should remain, found {len(client._sessions)}"
+        finally:
+            client.close()
+
+    @allure.title("Service calls run in parallel in order")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_run_parallel_services(self, stub_server):
+        """Test that run_parallel drives a sync service from threads and keeps input order"""
+        client = APIClient(base_url=stub_server.base_url, thread_safe=True, pool_size=8)
+        posts = PostsService(client)
+        try:
+            results = run_parallel(posts.get_post_by_id, range(100, 0, -1), max_workers=8)
+        finally:
+            client.close()
+
+        assert [result["status_code"] for result in results] == [200] * 100, "Every call should succeed"
+        assert [result["data"]["id"] for result in results] == list(range(100, 0, -1)), "Results follow input order"
+
+    @allure.title("Failures and deadlines")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_errors_and_context(self):
+        """Test exception handling and that calls see the caller's deadline"""
+        def check(value):
+            if value == 3:
+                raise ValueError(value)
+            return value
+
+        assert run_parallel(check, [1, 3, 5], return_exceptions=True)[0::2] == [1, 5], "Successes keep their place"
+        assert isinstance(run_parallel(check, [1, 3], return_exceptions=True)[1], ValueError), \
+            "Exceptions take the failing item's place"
+        with pytest.raises(ValueError):
+            run_parallel(check, [1, 3, 5])
+
+        with deadline(30):
+            left = run_parallel(lambda _: remaining(), range(4))
+        assert all(value is not None and 0 < value <= 30 for value in left), "Calls should inherit the deadline"
+
+    @allure.title("Parallel benchmark")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_benchmark(self):
+        """Test that run_parallel beats sequential calls on a latency-bound workload"""
+        started = time.monotonic()
+        report = compare(calls=40, workers=8, latency_ms=20)
+
+        assert report["sequential"]["errors"] == report["parallel"]["errors"] == 0, "Every call should succeed"
+        assert report["parallel"]["ordered"], "Parallel results should keep input order"
+        assert report["parallel"]["connections"] <= 8, "Threads should share the pool"
+        assert report["speedup"] > 3, f"Expected a parallel speed-up, got {report}"
+        assert time.monotonic() - started < 10, "Benchmark should stay quick"
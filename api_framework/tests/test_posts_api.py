@@ -4,7 +4,18 @@ Test cases for Posts API endpoints
 import pytest
 import allure
 from services.posts_service import PostsService
-from core.validators import APIValidator
+from core.sweep import Sweep, SweepCase, run_case
+from core.validators import APIValidator, POST_SCHEMA, COMMENT_SCHEMA, list_schema
+
+
+# Status and schema checks, one generated test per row
+ENDPOINTS = Sweep([
+    SweepCase("/posts", schema=list_schema(POST_SCHEMA)),
+    SweepCase("/posts/1", schema=POST_SCHEMA),
+    SweepCase("/posts", params={"userId": 1}, schema=list_schema(POST_SCHEMA)),
+    SweepCase("/posts/1/comments", schema=list_schema(COMMENT_SCHEMA)),
+    SweepCase("/posts/99999", 404, name="non-existent post"),
+])
 
 
 @allure.feature("Posts API")
@@ -144,17 +155,16 @@ class TestPostsAPI:
         with allure.step("Verify response data"):
             assert result["data"] is None, "Response data should be None for DELETE"
     
-    @allure.title("Get non-existent post")
+    @allure.title("Post endpoints return their expected status and schema")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_get_nonexistent_post(self, posts_service):
-        """Test retrieving a non-existent post"""
-        non_existent_id = 99999
-        
-        with allure.step(f"Make GET request to /posts/{non_existent_id}"):
-            result = posts_service.get_post_by_id(non_existent_id)
-        
-        with allure.step("Verify response status code"):
-            assert result["status_code"] == 404, f"Expected 404, got {result['status_code']}"
+    @pytest.mark.parametrize("case", ENDPOINTS.params())
+    def test_api_endpoints(self, posts_service, case):
+        """Test each row of the ENDPOINTS sweep table, including the 404 for a non-existent post"""
+        with allure.step(f"Make {case.method} request to {case.path}"):
+            result = run_case(posts_service.api_client, case)
+        
+        with allure.step(f"Verify response status code is {case.expected_status}"):
+            assert result.ok, result.error
     
     @allure.title("Validate post response time")
     @allure.severity(allure.severity_level.NORMAL)
@@ -0,0 +1,117 @@
+"""
+Test cases for the shared client-side rate limiter
+"""
+import os
+import time
+import multiprocessing
+import pytest
+import allure
+from core.deadline import deadline, DeadlineExceeded
+from core.rate_limiter import SharedTokenBucket, state_path, remove_run_state
+from config.settings import settings
+
+
+def _drain(path, count, results):
+    bucket = SharedTokenBucket(path, rate=20, burst=1)
+    for _ in range(count):
+        bucket.acquire()
+    results.put(time.time())
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    """Fresh bucket state file"""
+    return str(tmp_path / "bucket.json")
+
+
+@allure.feature("Core Framework")
+@allure.story("Rate Limiting")
+class TestRateLimiter:
+    """Test class for the file-backed token bucket"""
+    
+    @allure.title("Burst is served immediately, then the rate applies")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_rate_applies_after_burst(self, state_file):
+        """Test that acquisitions beyond the burst are paced at the configured rate"""
+        bucket = SharedTokenBucket(state_file, rate=50, burst=5)
+        
+        started = time.monotonic()
+        waits = [bucket.acquire() for _ in range(15)]
+        elapsed = time.monotonic() - started
+        
+        assert sum(waits[:5]) == 0, "Burst tokens should not wait"
+        assert 0.17 <= elapsed <= 0.5, f"Ten paced tokens at 50/s should take ~0.2s, took {elapsed:.2f}s"
+    
+    @allure.title("Budget is shared across processes")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_shared_across_processes(self, state_file):
+        """Test that two worker processes draw from a single budget"""
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_drain, args=(state_file, 5, results)) for _ in range(2)]
+        
+        started = time.time()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        finished = max(results.get() for _ in workers)
+        
+        assert finished - started >= 0.4, "Ten tokens at 20/s shared by both workers should take ~0.45s"
+    
+    @allure.title("429 lowers the rate and pauses takers")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_penalize(self, state_file):
+        """Test that a 429 halves the rate and honours Retry-After"""
+        bucket = SharedTokenBucket(state_file, rate=100, burst=10, recovery_seconds=60)
+        bucket.acquire()
+        
+        bucket.penalize(retry_after=0.2)
+        
+        assert 0.49 <= bucket.rate_factor <= 0.51, "Rate factor should be halved"
+        assert bucket.acquire() >= 0.19, "Takers should wait for Retry-After"
+    
+    @allure.title("Rate recovers after a 429")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_recovery(self, state_file):
+        """Test that the rate factor recovers linearly"""
+        bucket = SharedTokenBucket(state_file, rate=100, burst=1, min_factor=0.1, recovery_seconds=0.2)
+        bucket.penalize(retry_after=0)
+        bucket.penalize(retry_after=0)
+        
+        time.sleep(0.25)
+        
+        assert bucket.rate_factor == 1.0, "Rate factor should be fully recovered"
+    
+    @allure.title("Waiting for a token stops at the deadline")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_wait_bounded_by_deadline(self, state_file):
+        """Test that a taker raises DeadlineExceeded instead of sleeping past the deadline"""
+        bucket = SharedTokenBucket(state_file, rate=100, burst=1)
+        bucket.acquire()
+        bucket.penalize(retry_after=2.0)
+        
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            with deadline(0.2):
+                bucket.acquire()
+        
+        assert time.monotonic() - started < 0.1, "Taker should give up without sleeping"
+    
+    @allure.title("State files are scoped to one run and removed after it")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_state_scoped_to_run(self, tmp_path, monkeypatch):
+        """Test that serial runs get their own state file and only the finished run's files are deleted"""
+        monkeypatch.setattr(settings, "rate_limit_state_dir", str(tmp_path))
+        monkeypatch.delenv("PYTEST_XDIST_TESTRUNUID", raising=False)
+        serial = state_path("api.example.com")
+        monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "run1")
+        shared = state_path("api.example.com")
+        other = str(tmp_path / "run2-api.example.com.json")
+        for path in (serial, shared, other):
+            SharedTokenBucket(path, rate=10, burst=1).penalize(retry_after=30)
+        
+        assert os.path.basename(serial) == f"pid{os.getpid()}-api.example.com.json", \
+            f"Serial runs should not share a state file: {serial}"
+        assert remove_run_state("run1") == 1, "Only the finished run's file should be removed"
+        assert not os.path.exists(shared), "The finished run's state should be gone"
+        assert os.path.exists(serial) and os.path.exists(other), "Other runs' state should be kept"
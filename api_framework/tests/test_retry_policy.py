@@ -0,0 +1,206 @@
+"""
+Test cases for adaptive retries
+"""
+import os
+import sys
+import time
+import random
+import subprocess
+import pytest
+import allure
+import requests
+from email.utils import formatdate
+from core.api_client import APIClient
+from core.metrics import metrics
+from core.retry_policy import RetryPolicy, RetryBudget, parse_retry_after
+from core import retry_policy
+from config.settings import settings
+from stubs.jsonplaceholder import StubServer
+
+
+class FlakyStub:
+    """Answers with the queued statuses first, then 200"""
+    
+    def __init__(self, statuses, retry_after=None):
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.calls = 0
+        self.idempotency_keys = []
+    
+    def handle(self, method, path, query, body=b"", headers=None):
+        self.calls += 1
+        self.idempotency_keys.append((headers or {}).get("idempotency-key"))
+        if self.statuses:
+            headers = {"Retry-After": self.retry_after} if self.retry_after else {}
+            return self.statuses.pop(0), headers, b"{}"
+        return 200, {"Content-Type": "application/json"}, b'{"ok": true}'
+
+
+@pytest.fixture
+def flaky_client(monkeypatch):
+    """Client pointed at a flaky stand-in with fast, fresh retry settings"""
+    monkeypatch.setattr(retry_policy, "_budgets", {})
+    servers = []
+    
+    def make(statuses, retry_after=None, policy=None):
+        server = StubServer(stub=FlakyStub(statuses, retry_after)).start_in_thread()
+        servers.append(server)
+        client = APIClient(base_url=server.base_url)
+        client.retry_policy = policy or RetryPolicy(max_retries=3, base_delay=0.01, max_delay=0.05)
+        return client, server.stub
+    
+    yield make
+    for server in servers:
+        server.stop()
+
+
+@allure.feature("Core Framework")
+@allure.story("Adaptive Retries")
+class TestRetryPolicy:
+    """Test class for retry policy and client retry loop"""
+    
+    @allure.title("Full-jitter backoff stays within the exponential cap")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_full_jitter_backoff(self):
+        """Test that backoff is uniform in [0, min(max_delay, base * 2**attempt)]"""
+        policy = RetryPolicy(base_delay=1, max_delay=5, rng=random.Random(1))
+        for attempt in range(6):
+            delays = [policy.backoff(attempt) for _ in range(200)]
+            assert all(0 <= delay <= min(5, 2 ** attempt) for delay in delays), "Backoff should respect the cap"
+            assert max(delays) > min(5, 2 ** attempt) / 2, "Backoff should be spread across the range"
+    
+    @allure.title("Parse Retry-After header")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_parse_retry_after(self):
+        """Test delta-seconds and HTTP-date forms of Retry-After"""
+        assert parse_retry_after("7") == 7
+        assert 55 <= parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+    
+    @allure.title("Retry server errors until success")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_retries_until_success(self, flaky_client):
+        """Test that 503s are retried and counted"""
+        client, stub = flaky_client([503, 503])
+        before = metrics.snapshot()
+        
+        response = client.get("/anything")
+        
+        used = metrics.delta(before, metrics.snapshot())
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert stub.calls == 3, "Two retries should be made"
+        assert used["retries"] == 2, "Retries should be reported in metrics"
+        assert used["retry_seconds"] > 0, "Time spent retrying should be reported"
+    
+    @allure.title("Honour Retry-After")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_retry_after_honoured(self, flaky_client):
+        """Test that a Retry-After beyond the cap returns the response instead of waiting"""
+        policy = RetryPolicy(max_retries=3, base_delay=0.01, retry_after_max=1)
+        client, stub = flaky_client([429], retry_after="120", policy=policy)
+        
+        response = client.get("/anything")
+        
+        assert response.status_code == 429, "Response should be returned without retrying"
+        assert stub.calls == 1, "No retry should be made"
+    
+    @allure.title("Retry budget limits retries per host")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_retry_budget(self, flaky_client):
+        """Test that an exhausted budget stops retries"""
+        client, stub = flaky_client([503, 503, 503])
+        host = client.base_url.split("://", 1)[1]
+        retry_policy._budgets[host] = RetryBudget(ratio=0.0, burst=1)
+        
+        response = client.get("/anything")
+        
+        assert response.status_code == 503, "Second failure should be returned once the budget is spent"
+        assert stub.calls == 2, "Only one retry should be allowed"
+    
+    @allure.title("Budget refills with traffic")
+    @allure.severity(allure.severity_level.MINOR)
+    def test_budget_refill(self):
+        """Test that deposits accumulate into retry tokens"""
+        budget = RetryBudget(ratio=0.5, burst=2)
+        assert budget.try_withdraw() and budget.try_withdraw(), "Burst should allow two retries"
+        assert not budget.try_withdraw(), "Empty budget should deny retries"
+        budget.deposit()
+        budget.deposit()
+        assert budget.try_withdraw(), "Two requests at 0.5 should fund one retry"
+
+    @allure.title("Replay POST only with an idempotency key")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_post_retried_with_same_key(self, flaky_client):
+        """Test that a POST is retried with one key reused across attempts"""
+        client, stub = flaky_client([503])
+        before = metrics.snapshot()
+        
+        response = client.post("/posts", json_data={"title": "x"})
+        
+        used = metrics.delta(before, metrics.snapshot())
+        assert response.status_code == 200, "POST should be retried to success"
+        assert stub.calls == 2, "One retry should be made"
+        assert stub.idempotency_keys[0] and len(set(stub.idempotency_keys)) == 1, \
+            "Every attempt should carry the same idempotency key"
+        assert metrics.retry_amplification(used) == 2, "Amplification should count both attempts"
+    
+    @allure.title("Do not replay POST without an idempotency key")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_post_not_retried_without_key(self, flaky_client, monkeypatch):
+        """Test that a keyless POST is not replayed after reaching the server"""
+        monkeypatch.setattr(settings, "idempotency_keys_enabled", False)
+        client, stub = flaky_client([503])
+        before = metrics.snapshot()
+        
+        response = client.post("/posts", json_data={"title": "x"})
+        
+        used = metrics.delta(before, metrics.snapshot())
+        assert response.status_code == 503, "Failure should be returned"
+        assert stub.calls == 1, "POST should not be replayed"
+        assert stub.idempotency_keys == [None], "No key should be sent"
+        assert used["retries_unsafe_skipped"] == 1, "Skipped replay should be visible in metrics"
+    
+    @allure.title("Replay keyless POST after a connect failure")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_post_retried_after_connect_failure(self, monkeypatch):
+        """Test that connection-level failures before sending allow a keyless replay"""
+        monkeypatch.setattr(settings, "idempotency_keys_enabled", False)
+        monkeypatch.setattr(retry_policy, "_budgets", {})
+        client = APIClient(base_url="http://127.0.0.1:9")
+        client.retry_policy = RetryPolicy(max_retries=2, base_delay=0.01)
+        before = metrics.snapshot()
+        
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.post("/posts", json_data={"title": "x"})
+        
+        used = metrics.delta(before, metrics.snapshot())
+        assert used["attempts"] == 3, "Refused connections should be retried"
+    
+    @allure.title("Merge request metrics from several processes")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_metrics_merge(self):
+        """Test that counters from another process are added, not replaced"""
+        totals = {"requests": 3, "retries": 1}
+        metrics.merge(totals, {"requests": 2, "attempts": 4})
+        assert totals == {"requests": 5, "retries": 1, "attempts": 4}, totals
+    
+    @allure.title("Request metrics summary covers xdist workers")
+    @allure.severity(allure.severity_level.NORMAL)
+    @pytest.mark.slow
+    def test_metrics_summary_with_xdist(self):
+        """Test that totals and per-test retries reach the controller's summary"""
+        pytest.importorskip("xdist")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        selected = "test_retries_until_success or test_post_retried_with_same_key"
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "-n", "2",
+             "tests/test_retry_policy.py", "-k", selected],
+            cwd=root, capture_output=True, text=True, timeout=300,
+        )
+        
+        assert result.returncode == 0, result.stdout[-2000:]
+        summary = result.stdout.split("request metrics", 1)[-1]
+        assert "\nrequests: 2\n" in summary, f"Totals should include both workers' requests:\n{summary}"
+        for name in selected.split(" or "):
+            assert f"::{name}: " in summary, f"{name} retried and should be listed:\n{summary}"
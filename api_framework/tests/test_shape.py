@@ -0,0 +1,128 @@
+"""
+Test cases for response shape fingerprints and baselines
+"""
+import copy
+import json
+import time
+import allure
+from jsonschema import validate
+from core.api_client import APIClient
+from core.shape import ShapeBaselines, fingerprint
+from core.sweep import Sweep, SweepCase
+from core.validators import POST_SCHEMA, USER_SCHEMA
+
+
+POSTS_SCHEMA = {"type": "array", "items": POST_SCHEMA}
+
+
+@allure.feature("Core Framework")
+@allure.story("Response Shapes")
+class TestShape:
+    """Test class for structural fingerprints, per-endpoint baselines and sweeps using them"""
+
+    @allure.title("Fingerprints follow structure, not values")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_fingerprint(self, sample_user_data):
+        """Test that key sets, types, nesting and array element shapes change the fingerprint"""
+        user = dict(sample_user_data, id=1)
+        renamed = dict(user, name="Someone Else", id=2, address=dict(user["address"], city="Elsewhere"))
+        extra_key = dict(user, nickname="x")
+        retyped = dict(user, id="1")
+        nested = dict(user, address=dict(user["address"], geo={"lat": 1.5, "lng": 2.5}))
+
+        assert fingerprint(user) == fingerprint(renamed), "Values alone should not change the shape"
+        assert len({fingerprint(value) for value in (user, extra_key, retyped, nested)}) == 4, \
+            "Keys, types and nesting should each change the shape"
+        assert fingerprint({"flag": True}) != fingerprint({"flag": 1}), "Booleans are not integers"
+        assert fingerprint([user] * 3) == fingerprint([renamed] * 40), "Array length does not matter"
+        assert fingerprint([user, extra_key]) == fingerprint([extra_key, user]), "Nor does element order"
+        assert fingerprint([user] * 3) != fingerprint([user, user, extra_key]), "Sampled element shapes do"
+        assert fingerprint([]) != fingerprint([user]), "Empty arrays have their own shape"
+
+    @allure.title("Schema runs only when the shape changes")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_baselines(self, sample_post_data, tmp_path):
+        """Test new, match, drift and invalid outcomes and that baselines persist"""
+        path = str(tmp_path / "shapes.json")
+        post = dict(sample_post_data, id=1)
+        baselines = ShapeBaselines(path)
+
+        assert baselines.check("GET /posts/{id}", post, POST_SCHEMA).status == "new", "First shape is recorded"
+        assert baselines.check("GET /posts/{id}", dict(post, id=2), POST_SCHEMA).status == "match", \
+            "Same shape should match"
+        assert baselines.check("GET /posts/{id}", dict(post, id=3), {"type": "string"}).status == "match", \
+            "A match should not run the schema"
+        drift = baselines.check("GET /posts/{id}", dict(post, tags=["a"]), POST_SCHEMA)
+        assert drift.status == "drift" and drift.ok, "A new shape passing the schema is accepted drift"
+        invalid = baselines.check("GET /posts/{id}", dict(post, id="1"), POST_SCHEMA)
+        assert invalid.status == "invalid" and "Schema mismatch" in invalid.error, "A failing shape is reported"
+        assert baselines.check("GET /posts/{id}", dict(post, id="2"), POST_SCHEMA).status == "invalid", \
+            "Failing shapes are never accepted"
+        summary = baselines.summary()
+        assert summary["checks"] == 6 and summary["match"] == 2, summary
+        assert [entry["status"] for entry in summary["changes"]] == ["drift", "invalid", "invalid"], summary
+
+        baselines.save()
+        reloaded = ShapeBaselines(path)
+        assert reloaded.fingerprints("GET /posts/{id}") == baselines.fingerprints("GET /posts/{id}"), \
+            "Accepted shapes should persist"
+        assert reloaded.check("GET /posts/{id}", dict(post, tags=["b"]), POST_SCHEMA).status == "match", \
+            "Accepted drift should match on the next run"
+
+        reloaded.check("GET /users/{id}", {"id": 1})
+        reloaded.save()
+        rerecorded = ShapeBaselines(path, update=True)
+        assert rerecorded.check("GET /posts/{id}", post, POST_SCHEMA).status == "new", "Updating starts over"
+        rerecorded.save()
+        with open(path) as f:
+            stored = json.load(f)
+        assert stored["GET /posts/{id}"]["fingerprints"] == [fingerprint(post)], \
+            "Updating should replace the endpoint's variants"
+        assert "GET /users/{id}" in stored, "Endpoints not checked while updating are kept"
+
+    @allure.title("Sweeps validate each endpoint shape once")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_sweep_with_shapes(self, stub_server, tmp_path):
+        """Test that a sweep against the stand-in validates only new shapes and catches drift"""
+        table = Sweep([SweepCase("/posts", schema=POSTS_SCHEMA)]
+                      + [SweepCase(f"/posts/{post_id}", schema=POST_SCHEMA) for post_id in range(1, 51)]
+                      + [SweepCase(f"/users/{user_id}", schema=USER_SCHEMA) for user_id in range(1, 11)])
+        baselines = ShapeBaselines(str(tmp_path / "shapes.json"))
+        client = APIClient(base_url=stub_server.base_url, thread_safe=True, pool_size=8)
+        try:
+            results = table.run(client, concurrency=8, shapes=baselines)
+            again = table.run(client, concurrency=8, shapes=baselines)
+        finally:
+            client.close()
+
+        assert all(result.ok for result in results + again), [r.to_dict() for r in results if not r.ok]
+        summary = baselines.summary()
+        assert summary["endpoints"] == 3, f"Ids should fold into one endpoint each: {summary}"
+        assert summary["new"] + summary["drift"] <= 6, f"Only new shapes should be validated: {summary}"
+        assert summary["match"] >= 2 * len(table) - 6, summary
+
+        stale = ShapeBaselines()
+        stale.check(f"GET {stub_server.base_url.split('://')[1]}/posts/{{id}}", {"id": 1}, POST_SCHEMA)
+        client = APIClient(base_url=stub_server.base_url)
+        try:
+            drift = Sweep([SweepCase("/posts/1", schema={"type": "array"})]).run(client, 1, shapes=stale)
+        finally:
+            client.close()
+        assert not drift[0].ok and "Schema mismatch" in drift[0].error, "Drift is validated against the schema"
+
+    @allure.title("Fingerprinting is cheaper than validating")
+    @allure.severity(allure.severity_level.MINOR)
+    def test_cost(self, sample_post_data):
+        """Test that hashing a collection's shape costs less than validating it"""
+        posts = [dict(copy.deepcopy(sample_post_data), id=post_id) for post_id in range(1, 501)]
+
+        started = time.perf_counter()
+        for _ in range(20):
+            fingerprint(posts)
+        hashing = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(20):
+            validate(instance=posts, schema=POSTS_SCHEMA)
+        validating = time.perf_counter() - started
+
+        assert hashing * 10 < validating, f"Fingerprint {hashing:.4f}s vs validation {validating:.4f}s"
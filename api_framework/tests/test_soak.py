@@ -0,0 +1,100 @@
+"""
+Test cases for soak mode resource sampling and trend detection
+"""
+import time
+import random
+import allure
+from load import soak
+from core.api_client import APIClient, connection_pool_stats
+from load.soak import ResourceSampler, SoakRunner, sample_resources, trend
+from load.workflows import build_scenarios
+
+
+@allure.feature("Load Testing")
+@allure.story("Soak Mode")
+class TestSoak:
+    """Test class for the trend test, the sampler and the soak runner"""
+
+    @allure.title("Trend test separates growth from noise")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_trend(self):
+        """Test that steady growth is flagged and noise, small growth and short series are not"""
+        rng = random.Random(7)
+        rising = [(t, 1000 + 5 * t + rng.gauss(0, 20)) for t in range(120)]
+        flat = [(t, 1000 + rng.gauss(0, 20)) for t in range(120)]
+        stepped = [(t, 10 if t < 60 else 11) for t in range(120)]
+
+        assert trend(rising, min_growth=100)["growing"], "Noisy linear growth is a leak"
+        assert trend(rising, min_growth=100)["slope_per_hour"] > 15000, "Sen's slope tracks the growth rate"
+        assert not trend(flat, min_growth=100)["growing"], "Noise around a level is not"
+        assert not trend(stepped, min_growth=10)["growing"], "A one-off step below the threshold is not"
+        assert not trend(rising[:5])["growing"], "Too few samples to decide"
+        assert trend([(t, 5000 - t) for t in range(50)])["z"] < 0, "Shrinking series trend down"
+
+    @allure.title("Sampler catches leaked connections")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_connection_leak(self, stub_server):
+        """Test that clients left open show up as growing sockets and pooled connections"""
+        sampler = ResourceSampler(interval=0.02).start()
+        leaked = []
+        try:
+            deadline = time.monotonic() + 1.0
+            while time.monotonic() < deadline:
+                client = APIClient(base_url=stub_server.base_url)
+                client.get("/posts/1")
+                leaked.append(client)  # never closed
+                time.sleep(0.01)
+            during = connection_pool_stats()
+        finally:
+            sampler.stop()
+            for client in leaked:
+                client.close()
+
+        trends = sampler.trends()
+        assert during["idle_connections"] >= len(leaked), "Every leaked client holds a pooled connection"
+        assert trends["idle_connections"]["growing"], f"Pooled connections should trend up: {trends}"
+        assert trends["sockets"]["growing"], f"Sockets should trend up: {trends}"
+        assert connection_pool_stats()["idle_connections"] < during["idle_connections"], "Closing releases them"
+
+    @allure.title("Soak run reports samples and trends")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_soak_run(self, stub_server):
+        """Test a short soak of the scenario mix with allocation tracing"""
+        soak = SoakRunner(build_scenarios(["user_content_journey", "post_write_cycle"]), concurrency=3,
+                          duration=2, interval=0.1, warmup=0.5, trace_allocations=True,
+                          base_url=stub_server.base_url, seed=3)
+        report = soak.run()
+
+        assert report["load"]["requests"] > 0 and report["load"]["errors"] == 0, "The mix should run cleanly"
+        assert len(report["samples"]) >= 10, "Resources should be sampled throughout"
+        assert set(report["trends"]) >= {"rss_kb", "traced_kb", "open_fds", "idle_connections"}, report["trends"]
+        assert not {"open_fds", "sockets", "idle_connections"} & set(report["leaks"]), \
+            f"Closed clients should not leak: {report['leaks']}"
+        assert all(allocation["location"] for allocation in report["top_allocators"]), "Allocators are located"
+        assert set(sample_resources()) >= {"rss_kb", "open_fds", "sockets", "pools"}, "Sample fields"
+
+    @allure.title("Sampling copes with the available APIs")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_sampling_fallbacks(self, monkeypatch):
+        """Test psutil's old and new connection APIs, and that peak RSS is never sampled"""
+        class OldProcess:
+            def num_fds(self):
+                return 7
+
+            def connections(self, kind):
+                return [None] * 2
+
+        class NewProcess(OldProcess):
+            def net_connections(self, kind):
+                return [None] * 3
+
+        for process, sockets in ((OldProcess, 2), (NewProcess, 3)):
+            monkeypatch.setattr(soak, "psutil", type("psutil", (), {"Process": process}))
+            assert soak._descriptors() == (7, sockets), f"{process.__name__} should report {sockets} sockets"
+
+        def no_proc(*args, **kwargs):
+            raise OSError("no /proc")
+
+        monkeypatch.setattr(soak, "psutil", None)
+        monkeypatch.setattr(soak, "open", no_proc, raising=False)
+        assert soak._rss_kb() == -1, "Without /proc, RSS should be left out rather than read as the peak"
@@ -0,0 +1,99 @@
+"""
+Test cases for the table-driven endpoint sweep engine
+"""
+import time
+import pytest
+import allure
+from core.api_client import APIClient
+from core.sweep import Sweep, SweepCase, run_case, format_results
+from core.validators import POST_SCHEMA, USER_SCHEMA, COMMENT_SCHEMA, list_schema
+
+
+# Status and schema checks shared by the posts, users and comments suites
+RESOURCE_ENDPOINTS = Sweep([
+    SweepCase("/posts", schema=list_schema(POST_SCHEMA)),
+    SweepCase("/posts/1", schema=POST_SCHEMA),
+    SweepCase("/posts", params={"userId": 1}, schema=list_schema(POST_SCHEMA)),
+    SweepCase("/posts/1/comments", schema=list_schema(COMMENT_SCHEMA)),
+    SweepCase("/posts/999", 404),
+    SweepCase("/posts", 201, method="POST", body={"title": "t", "body": "b", "userId": 1}),
+    SweepCase("/posts/1", 200, method="PUT", body={"title": "t", "body": "b", "userId": 1}, schema=POST_SCHEMA),
+    SweepCase("/posts/1", 200, method="PATCH", body={"title": "patched"}, schema=POST_SCHEMA),
+    SweepCase("/posts/1", 200, method="DELETE"),
+    SweepCase("/users", schema=list_schema(USER_SCHEMA)),
+    SweepCase("/users/1", schema=USER_SCHEMA),
+    SweepCase("/users/1/posts", schema=list_schema(POST_SCHEMA)),
+    SweepCase("/users/999", 404),
+    SweepCase("/comments", schema=list_schema(COMMENT_SCHEMA)),
+    SweepCase("/comments", params={"postId": 1}, schema=list_schema(COMMENT_SCHEMA)),
+    SweepCase("/comments/999", 404),
+    SweepCase("/todos", 404, name="unknown resource"),
+])
+
+
+def full_table() -> Sweep:
+    """Every item, nested collection and missing id across the three resources"""
+    cases = []
+    for resource, schema, count in (("posts", POST_SCHEMA, 100), ("users", USER_SCHEMA, 10),
+                                    ("comments", COMMENT_SCHEMA, 500)):
+        cases.extend(SweepCase(f"/{resource}/{item_id}", schema=schema) for item_id in range(1, min(count, 100) + 1))
+        cases.append(SweepCase(f"/{resource}/{count + 1}", 404))
+    cases.extend(SweepCase(f"/posts/{post_id}/comments", schema=list_schema(COMMENT_SCHEMA)) for post_id in range(1, 101))
+    return Sweep(cases)
+
+
+@pytest.fixture(scope="module")
+def sweep_client(stub_server):
+    """Thread-safe client for concurrent sweeps against the stand-in"""
+    client = APIClient(base_url=stub_server.base_url, thread_safe=True, pool_size=16)
+    yield client
+    client.close()
+
+
+@allure.feature("Core Framework")
+@allure.story("Endpoint Sweeps")
+class TestSweep:
+    """Test class for sweep tables as generated tests and as concurrent runs"""
+
+    @pytest.mark.parametrize("case", RESOURCE_ENDPOINTS.params())
+    def test_resource_endpoints(self, sweep_client, case):
+        """One generated test per table row"""
+        result = run_case(sweep_client, case)
+        assert result.ok, result.error
+
+    @allure.title("Whole table runs concurrently")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_concurrent_sweep(self, sweep_client):
+        """Test hundreds of rows in one concurrent run with per-row latency, in table order"""
+        table = full_table()
+        started = time.monotonic()
+        results = table.run(sweep_client, concurrency=16)
+        summary = Sweep.summary(results, time.monotonic() - started)
+        allure.attach(format_results(results), name="Endpoint sweep", attachment_type=allure.attachment_type.TEXT)
+
+        assert len(table) > 300 and summary["passed"] == len(table), summary["failed"]
+        assert [result.case for result in results] == table.cases, "Results follow the table"
+        assert all(result.elapsed_ms > 0 for result in results), "Each row reports its latency"
+        assert summary["elapsed_s"] < 30, f"Sweep should take seconds, took {summary['elapsed_s']}s"
+
+    @allure.title("Failures explain themselves")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_failures(self, sweep_client, stub_server):
+        """Test status, schema and transport failures per row"""
+        results = Sweep([
+            SweepCase("/posts/1", 201),
+            SweepCase("/posts/1", schema=USER_SCHEMA),
+            SweepCase("/posts/1", [200, 304]),
+        ]).run(sweep_client, concurrency=3)
+
+        assert results[0].error == "Expected status 201, got 200", results[0].error
+        assert results[1].error.startswith("Schema mismatch"), results[1].error
+        assert results[2].ok, "Lists of statuses are accepted"
+        assert "Schema mismatch" in format_results(results), "The table shows each row's outcome"
+
+        single = APIClient(base_url=stub_server.base_url)
+        try:
+            with pytest.raises(ValueError):
+                Sweep([SweepCase("/posts")]).run(single, concurrency=4)
+        finally:
+            single.close()
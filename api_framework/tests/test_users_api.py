@@ -4,7 +4,17 @@ Test cases for Users API endpoints
 import pytest
 import allure
 from services.users_service import UsersService
-from core.validators import APIValidator
+from core.sweep import Sweep, SweepCase, run_case
+from core.validators import APIValidator, USER_SCHEMA, POST_SCHEMA, list_schema
+
+
+# Status and schema checks, one generated test per row
+ENDPOINTS = Sweep([
+    SweepCase("/users", schema=list_schema(USER_SCHEMA)),
+    SweepCase("/users/1", schema=USER_SCHEMA),
+    SweepCase("/users/1/posts", schema=list_schema(POST_SCHEMA)),
+    SweepCase("/users/99999", 404, name="non-existent user"),
+])
 
 
 @allure.feature("Users API")
@@ -124,17 +134,16 @@ class TestUsersAPI:
         with allure.step("Verify response data"):
             assert result["data"] is None, "Response data should be None for DELETE"
     
-    @allure.title("Get non-existent user")
+    @allure.title("User endpoints return their expected status and schema")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_get_nonexistent_user(self, users_service):
-        """Test retrieving a non-existent user"""
-        non_existent_id = 99999
-        
-        with allure.step(f"Make GET request to /users/{non_existent_id}"):
-            result = users_service.get_user_by_id(non_existent_id)
-        
-        with allure.step("Verify response status code"):
-            assert result["status_code"] == 404, f"Expected 404, got {result['status_code']}"
+    @pytest.mark.parametrize("case", ENDPOINTS.params())
+    def test_api_endpoints(self, users_service, case):
+        """Test each row of the ENDPOINTS sweep table, including the 404 for a non-existent user"""
+        with allure.step(f"Make {case.method} request to {case.path}"):
+            result = run_case(users_service.api_client, case)
+        
+        with allure.step(f"Verify response status code is {case.expected_status}"):
+            assert result.ok, result.error
     
     @allure.title("Validate user address structure")
     @allure.severity(allure.severity_level.NORMAL)
@@ -14,6 +14,13 @@ class Settings(BaseSettings):
     headless: bool = False
     window_width: int = 1920
     window_height: int = 1080
+    driver_pool_enabled: bool = True  # reuse browsers between tests, resetting their state
+    driver_max_uses: int = 50  # tests a pooled browser serves before it is relaunched
+    
+    # Driver binaries
+    driver_cache_file: str = "~/.cache/selenium-drivers/drivers.json"  # shared by every project on the machine
+    driver_offline: bool = False  # never download; use cached binaries or the one on PATH
+    driver_binary_path: str = ""  # skip resolution and use this driver binary
     
     # Test settings
     implicit_wait: int = 10
@@ -7,13 +7,11 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from config.settings import settings
+from core.driver_resolver import resolver
 
 
 class DriverManager:
@@ -54,7 +52,7 @@ class DriverManager:
         options.add_argument("--disable-web-security")
         options.add_argument("--allow-running-insecure-content")
         
-        service = ChromeService(ChromeDriverManager().install())
+        service = ChromeService(resolver.resolve("chrome"))
         return webdriver.Chrome(service=service, options=options)
     
     def _create_firefox_driver(self) -> webdriver.Firefox:
@@ -67,7 +65,7 @@ class DriverManager:
         options.add_argument(f"--width={settings.window_width}")
         options.add_argument(f"--height={settings.window_height}")
         
-        service = FirefoxService(GeckoDriverManager().install())
+        service = FirefoxService(resolver.resolve("firefox"))
         return webdriver.Firefox(service=service, options=options)
     
     def _create_edge_driver(self) -> webdriver.Edge:
@@ -81,7 +79,7 @@ class DriverManager:
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         
-        service = EdgeService(EdgeChromiumDriverManager().install())
+        service = EdgeService(resolver.resolve("edge"))
         return webdriver.Edge(service=service, options=options)
     
     def _configure_driver(self):
@@ -0,0 +1,131 @@
+"""
+Pool of warm WebDriver instances reused across tests
+"""
+from typing import Dict, List
+from selenium import webdriver
+from core.driver_manager import DriverManager
+from config.settings import settings
+
+
+# Storage is per origin, so this clears what the current page can see
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class PooledDriver:
+    """A browser owned by the pool, with the manager that launched it, its own window and its use count"""
+
+    def __init__(self, manager: DriverManager):
+        self.manager = manager
+        self.driver = manager.create_driver()
+        self.handle = self.driver.current_window_handle
+        self.uses = 0
+
+
+class DriverPool:
+    """Keeps browsers running between tests and resets their state instead of relaunching them
+
+    Each pytest process (each xdist worker) holds its own pool, so browsers are never
+    shared between processes. ``acquire`` hands out an idle browser that passes a health
+    check, launching one if none does. ``release`` resets it: windows other than the one it
+    launched with closed, cookies, localStorage and sessionStorage cleared, timeouts restored,
+    the window maximized again and about:blank loaded. A
+    browser that fails the reset or has served ``max_uses`` tests is quit and replaced on
+    the next acquire.
+    """
+
+    def __init__(self, max_uses: int = 50):
+        self.max_uses = max_uses
+        self._idle: List[PooledDriver] = []
+        self._in_use: Dict[int, PooledDriver] = {}
+        self.stats = {"launched": 0, "reused": 0, "recycled": 0, "crashed": 0}
+
+    def acquire(self) -> webdriver.Remote:
+        """Return a healthy browser, reusing an idle one when possible"""
+        while self._idle:
+            pooled = self._idle.pop()
+            if self._is_alive(pooled.driver):
+                self.stats["reused"] += 1
+                return self._lend(pooled)
+            self.stats["crashed"] += 1
+            self._quit(pooled)
+        self.stats["launched"] += 1
+        return self._lend(PooledDriver(DriverManager()))
+
+    def release(self, driver: webdriver.Remote, healthy: bool = True):
+        """Take a browser back, resetting it for the next test or retiring it"""
+        pooled = self._in_use.pop(id(driver), None)
+        if pooled is None:
+            return
+        if not healthy:
+            self.stats["crashed"] += 1
+            self._quit(pooled)
+        elif pooled.uses >= self.max_uses:
+            self.stats["recycled"] += 1
+            self._quit(pooled)
+        else:
+            try:
+                pooled.handle = self.reset(driver, pooled.handle)
+            except Exception:  # WebDriverException, or a connection error once the driver process is gone
+                self.stats["crashed"] += 1
+                self._quit(pooled)
+            else:
+                self._idle.append(pooled)
+
+    def close(self):
+        """Quit every browser the pool owns"""
+        for pooled in self._idle + list(self._in_use.values()):
+            self._quit(pooled)
+        self._idle.clear()
+        self._in_use.clear()
+
+    def _lend(self, pooled: PooledDriver) -> webdriver.Remote:
+        pooled.uses += 1
+        self._in_use[id(pooled.driver)] = pooled
+        return pooled.driver
+
+    @staticmethod
+    def reset(driver: webdriver.Remote, handle: str) -> str:
+        """Return a browser to a blank state without relaunching it; returns the window kept
+
+        ``window_handles`` is not ordered by creation, so the window to keep is the one the
+        browser launched with, or any remaining one if the test closed it.
+        """
+        handles = driver.window_handles
+        keep = handle if handle in handles else handles[0]
+        for other in handles:
+            if other != keep:
+                driver.switch_to.window(other)
+                driver.close()
+        driver.switch_to.window(keep)
+        # Cookies and storage are cleared while still on the test's page: WebDriver
+        # only reaches those of the current document
+        driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        driver.delete_all_cookies()
+        if hasattr(driver, "execute_cdp_cmd"):
+            # Chromium can also drop cookies set by other domains the test visited
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.implicitly_wait(settings.implicit_wait)
+        driver.set_page_load_timeout(settings.page_load_timeout)
+        # As DriverManager configures a new browser, in case the test resized the window
+        driver.maximize_window()
+        driver.get("about:blank")
+        return keep
+
+    @staticmethod
+    def _is_alive(driver: webdriver.Remote) -> bool:
+        """Cheap round trip to the browser; False once it or its driver process has died"""
+        try:
+            driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(pooled: PooledDriver):
+        try:
+            pooled.manager.quit_driver()
+        except Exception:
+            pooled.manager.driver = None  # already gone
@@ -3,21 +3,41 @@ Pytest configuration and fixtures for Selenium tests
 """
 import pytest
 import allure
+from config.settings import settings
 from core.driver_manager import DriverManager
+from core.driver_pool import DriverPool
 from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 
 
+@pytest.fixture(scope="session")
+def driver_pool():
+    """Warm browsers for this process (one pool per xdist worker)"""
+    pool = DriverPool(max_uses=settings.driver_max_uses)
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(scope="function")
-def driver():
-    """Create and manage WebDriver instance"""
-    driver_manager = DriverManager()
-    driver = driver_manager.create_driver()
+def driver(request, driver_pool):
+    """Provide a WebDriver instance, reset from the pool unless the test needs a fresh browser"""
+    if not settings.driver_pool_enabled or request.node.get_closest_marker("fresh_driver"):
+        driver_manager = DriverManager()
+        driver = driver_manager.create_driver()
+        
+        yield driver
+        
+        # Cleanup
+        driver_manager.quit_driver()
+        return
     
+    driver = driver_pool.acquire()
     yield driver
     
-    # Cleanup
-    driver_manager.quit_driver()
+    # A browser that saw a failure may be stuck in a dialog or odd state; don't lend it out again
+    reports = (getattr(request.node, f"rep_{when}", None) for when in ("setup", "call"))
+    failed = any(report is not None and report.failed for report in reports)
+    driver_pool.release(driver, healthy=not failed)
 
 
 @pytest.fixture(scope="function")
@@ -49,6 +69,8 @@ def pytest_runtest_makereport(item, call):
     """Hook to capture screenshots on test failure"""
     outcome = yield
     rep = outcome.get_result()
+    # Let fixtures see how the test went during their teardown
+    setattr(item, f"rep_{rep.when}", rep)
     
     if rep.when == "call" and rep.failed:
         # Get the driver from the test item
@@ -74,3 +96,6 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "slow: mark test as slow running"
     )
+    config.addinivalue_line(
+        "markers", "fresh_driver: launch a dedicated browser instead of a pooled one"
+    )
@@ -0,0 +1,196 @@
+"""
+Test cases for the WebDriver pool, using fake browsers
+"""
+import pytest
+import allure
+from core import driver_pool as driver_pool_module
+from core.driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        self._driver.current = handle
+
+
+class FakeDriver:
+    """Records the calls a reset makes; ``alive`` and ``fail_reset`` simulate crashes"""
+
+    def __init__(self):
+        self.handles = ["main"]
+        self.current = "main"
+        self.switch_to = FakeSwitchTo(self)
+        self.calls = []
+        self.alive = True
+        self.fail_reset = False
+
+    @property
+    def current_window_handle(self):
+        if not self.alive:
+            raise ConnectionError("driver process is gone")
+        return self.current
+
+    @property
+    def window_handles(self):
+        return list(self.handles)
+
+    def close(self):
+        self.handles.remove(self.current)
+
+    def execute_script(self, script):
+        if self.fail_reset:
+            raise RuntimeError("unexpected alert open")
+        self.calls.append("clear storage")
+
+    def delete_all_cookies(self):
+        self.calls.append("delete cookies")
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def maximize_window(self):
+        self.calls.append("maximize")
+
+    def get(self, url):
+        self.calls.append(url)
+
+
+class FakeManager:
+    """Stands in for DriverManager, counting launches and quits"""
+
+    launched = []
+
+    def __init__(self):
+        self.driver = None
+        self.quits = 0
+
+    def create_driver(self):
+        self.driver = FakeDriver()
+        FakeManager.launched.append(self)
+        return self.driver
+
+    def quit_driver(self):
+        self.quits += 1
+        self.driver = None
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Pool that launches fake browsers instead of real ones"""
+    FakeManager.launched = []
+    monkeypatch.setattr(driver_pool_module, "DriverManager", FakeManager)
+    pool = DriverPool(max_uses=3)
+    yield pool
+    pool.close()
+
+
+@allure.feature("Core Framework")
+@allure.story("Driver Pool")
+class TestDriverPool:
+    """Test class for lending, resetting and retiring pooled browsers"""
+
+    @allure.title("Released browsers are reset and reused")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_reuse(self, pool):
+        """Test that a released browser is reset and handed out again instead of relaunched"""
+        driver = pool.acquire()
+        driver.handles.append("popup")
+        driver.current = "popup"
+
+        pool.release(driver)
+
+        assert driver.window_handles == ["main"], "Extra windows should be closed"
+        assert driver.calls == ["clear storage", "delete cookies", "maximize", "about:blank"], \
+            f"Storage and cookies should be cleared and the window maximized before about:blank: {driver.calls}"
+        assert pool.acquire() is driver, "The idle browser should be reused"
+        assert pool.stats == {"launched": 1, "reused": 1, "recycled": 0, "crashed": 0}, pool.stats
+
+    @allure.title("Reset keeps the browser's original window")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_reset_keeps_original_window(self, pool):
+        """Test that reset switches back to the launch window even when it is not listed first"""
+        driver = pool.acquire()
+        driver.handles.insert(0, "popup")
+        driver.current = "popup"
+
+        pool.release(driver)
+
+        assert driver.window_handles == ["main"] and driver.current == "main", \
+            f"Only the original window should remain, focused: {driver.window_handles}"
+
+        driver = pool.acquire()
+        driver.handles = ["tab", "popup"]
+        driver.current = "popup"
+        pool.release(driver)
+
+        assert driver.window_handles == ["tab"], "If the test closed the original window, one other should remain"
+
+    @allure.title("Browsers are relaunched after max_uses tests")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_max_uses(self, pool):
+        """Test that a browser is quit once it has served max_uses tests"""
+        drivers = []
+        for _ in range(4):
+            drivers.append(pool.acquire())
+            pool.release(drivers[-1])
+
+        assert drivers[:3] == [drivers[0]] * 3, "The first browser should serve max_uses tests"
+        assert drivers[3] is not drivers[0], "A new browser should be launched afterwards"
+        assert FakeManager.launched[0].quits == 1, "The worn browser should be quit"
+        assert pool.stats["recycled"] == 1 and pool.stats["launched"] == 2, pool.stats
+
+    @allure.title("Browsers that fail their reset are replaced")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_failed_reset(self, pool):
+        """Test that a browser whose reset raises is quit instead of returned to the pool"""
+        driver = pool.acquire()
+        driver.fail_reset = True
+
+        pool.release(driver)
+
+        assert FakeManager.launched[0].quits == 1, "The browser should be quit"
+        assert pool.acquire() is not driver, "A new browser should be launched"
+        assert pool.stats["crashed"] == 1, pool.stats
+
+    @allure.title("Browsers from failed tests are replaced")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_unhealthy_release(self, pool):
+        """Test that a browser released as unhealthy is quit without being reset"""
+        driver = pool.acquire()
+
+        pool.release(driver, healthy=False)
+
+        assert driver.calls == [], "An unhealthy browser should not be reset"
+        assert FakeManager.launched[0].quits == 1, "The browser should be quit"
+        assert pool.acquire() is not driver, "A new browser should be launched"
+
+    @allure.title("Dead idle browsers are not lent out")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_dead_idle_driver(self, pool):
+        """Test that an idle browser that died since its release is quit and replaced"""
+        driver = pool.acquire()
+        pool.release(driver)
+        driver.alive = False
+
+        replacement = pool.acquire()
+
+        assert replacement is not driver, "A dead browser should not be handed out"
+        assert FakeManager.launched[0].quits == 1, "The dead browser should be quit"
+        assert pool.stats == {"launched": 2, "reused": 0, "recycled": 0, "crashed": 1}, pool.stats
+
+    @allure.title("Closing the pool quits every browser")
+    @allure.severity(allure.severity_level.MINOR)
+    def test_close(self, pool):
+        """Test that close quits idle and lent-out browsers alike"""
+        idle = pool.acquire()
+        pool.acquire()
+        pool.release(idle)
+
+        pool.close()
+
+        assert [manager.quits for manager in FakeManager.launched] == [1, 1], "Every browser should be quit"
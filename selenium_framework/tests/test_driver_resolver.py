@@ -0,0 +1,132 @@
+"""
+Test cases for cached, offline-capable driver binary resolution
+"""
+import os
+import json
+import pytest
+import allure
+from core import driver_resolver
+from core.driver_resolver import DriverResolver, DriverResolutionError
+from config.settings import settings
+
+
+class FakeOSManager:
+    """Reports a fixed platform and a browser version the test can change"""
+
+    version = "120.0.6099.109"
+    lookups = 0
+
+    def get_os_type(self):
+        return "linux64"
+
+    def get_browser_version_from_os(self, browser_type):
+        FakeOSManager.lookups += 1
+        return FakeOSManager.version
+
+
+class FakeInstaller:
+    """Stands in for ChromeDriverManager: 'downloads' an executable per browser version"""
+
+    directory = None
+    installs = 0
+    fail = False
+
+    def install(self):
+        if FakeInstaller.fail:
+            raise ConnectionError("no network")
+        FakeInstaller.installs += 1
+        return executable(FakeInstaller.directory, f"chromedriver-{FakeOSManager.version}")
+
+
+def executable(directory, name):
+    path = os.path.join(str(directory), name)
+    with open(path, "w") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(path, 0o755)
+    return path
+
+
+@pytest.fixture
+def fakes(tmp_path, monkeypatch):
+    """Fake browser version lookup and installer, an empty PATH and no binary override"""
+    FakeOSManager.version = "120.0.6099.109"
+    FakeOSManager.lookups = 0
+    FakeInstaller.directory = tmp_path
+    FakeInstaller.installs = 0
+    FakeInstaller.fail = False
+    monkeypatch.setattr(driver_resolver, "OperationSystemManager", FakeOSManager)
+    browser_types, executable_name, _ = driver_resolver.BROWSERS["chrome"]
+    monkeypatch.setitem(driver_resolver.BROWSERS, "chrome", (browser_types, executable_name, FakeInstaller))
+    monkeypatch.setattr(settings, "driver_binary_path", "")
+    monkeypatch.setenv("PATH", str(tmp_path / "bin"))
+    return tmp_path
+
+
+def new_resolver(directory, offline=False):
+    """A resolver as a fresh process would create it, sharing the on-disk cache"""
+    return DriverResolver(cache_file=str(directory / "cache" / "drivers.json"), offline=offline)
+
+
+@allure.feature("Core Framework")
+@allure.story("Driver Resolution")
+class TestDriverResolver:
+    """Test class for the driver binary cache, offline fallback and overrides"""
+
+    @allure.title("Drivers are installed once per browser major version")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_cache_miss_then_hit(self, fakes):
+        """Test that the first resolution installs and later processes reuse the cached binary"""
+        first = new_resolver(fakes).resolve("chrome")
+        with open(fakes / "cache" / "drivers.json") as f:
+            cache = json.load(f)
+
+        assert FakeInstaller.installs == 1, "A cache miss should install the driver"
+        assert cache["chrome-linux64-120"]["path"] == first, f"The binary should be pinned to its version: {cache}"
+
+        FakeOSManager.version = "120.0.6099.200"
+        assert new_resolver(fakes).resolve("chrome") == first, "A patch update should reuse the cached binary"
+        assert FakeInstaller.installs == 1, "A cache hit should not install"
+
+        FakeOSManager.version = "121.0.6167.85"
+        assert new_resolver(fakes).resolve("chrome") != first, "A new major version should get its own binary"
+        assert FakeInstaller.installs == 2, "A new major version should install once"
+
+    @allure.title("Offline runs fall back to cached or PATH binaries")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_offline_fallback(self, fakes):
+        """Test offline and failed-install resolution from the cache, then PATH, then an error"""
+        with pytest.raises(DriverResolutionError):
+            new_resolver(fakes, offline=True).resolve("chrome")
+
+        os.makedirs(fakes / "bin")
+        on_path = executable(fakes / "bin", "chromedriver")
+        assert new_resolver(fakes, offline=True).resolve("chrome") == on_path, "PATH is the last resort"
+
+        cached = new_resolver(fakes).resolve("chrome")
+        FakeOSManager.version = "121.0.6167.85"
+        assert new_resolver(fakes, offline=True).resolve("chrome") == cached, \
+            "Offline, the most recent cached binary should be used even for another version"
+        FakeInstaller.fail = True
+        assert new_resolver(fakes).resolve("chrome") == cached, "A failed install should fall back too"
+        assert FakeInstaller.installs == 1, "Only the online resolution should have installed"
+
+    @allure.title("DRIVER_BINARY_PATH overrides resolution")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_binary_path_override(self, fakes, monkeypatch):
+        """Test that a configured binary is used without looking up versions or installing"""
+        monkeypatch.setattr(settings, "driver_binary_path", "/opt/drivers/chromedriver")
+
+        assert new_resolver(fakes).resolve("chrome") == "/opt/drivers/chromedriver", "The override should win"
+        assert FakeInstaller.installs == 0 and FakeOSManager.lookups == 0, "Nothing else should run"
+
+    @allure.title("Resolution is memoised per process")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_memoised(self, fakes):
+        """Test that repeated resolutions in one process skip the browser version lookup"""
+        resolver = new_resolver(fakes)
+        paths = {resolver.resolve("chrome"), resolver.resolve("Chrome"), resolver.resolve("chrome")}
+
+        assert len(paths) == 1, f"Every call should return the same binary: {paths}"
+        assert FakeOSManager.lookups == 1, "The browser version should be read once"
+        with pytest.raises(ValueError):
+            resolver.resolve("safari")
@@ -16,6 +16,11 @@ class Settings(BaseSettings):
     mobile_emulation: bool = False
     device_name: str = "iPhone 12 Pro"  # Default mobile device
     
+    # Driver binaries
+    driver_cache_file: str = "~/.cache/selenium-drivers/drivers.json"  # shared by every project on the machine
+    driver_offline: bool = False  # never download; use cached binaries or the one on PATH
+    driver_binary_path: str = ""  # skip resolution and use this driver binary
+    
     # Mobile viewport settings
     mobile_width: int = 390
     mobile_height: int = 844
@@ -6,8 +6,8 @@ from typing import Optional
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options as ChromeOptions
-from webdriver_manager.chrome import ChromeDriverManager
 from config.settings import settings
+from core.driver_resolver import resolver
 
 
 class MobileDriverManager:
@@ -62,7 +62,7 @@ class MobileDriverManager:
         # Set window size for mobile viewport
         options.add_argument(f"--window-size={settings.mobile_width},{settings.mobile_height}")
         
-        service = ChromeService(ChromeDriverManager().install())
+        service = ChromeService(resolver.resolve("chrome"))
         driver = webdriver.Chrome(service=service, options=options)
         
         # Execute script to remove webdriver property
@@ -0,0 +1,147 @@
+"""
+Driver binary resolution cached per machine and browser version, usable offline
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from typing import Dict, Optional
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.firefox import GeckoDriverManager
+from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+from config.settings import settings
+
+
+# browser -> (webdriver-manager browser types to read the local version from, driver executable, installer)
+BROWSERS = {
+    "chrome": ((ChromeType.GOOGLE, ChromeType.CHROMIUM), "chromedriver", ChromeDriverManager),
+    "firefox": (("firefox",), "geckodriver", GeckoDriverManager),
+    "edge": ((ChromeType.MSEDGE,), "msedgedriver", EdgeChromiumDriverManager),
+}
+
+
+class DriverResolutionError(RuntimeError):
+    """No driver binary could be found for the browser without going online"""
+
+
+class DriverResolver:
+    """Resolves driver binaries once and pins them to the installed browser version
+
+    The first resolution for a browser version runs webdriver-manager and records the
+    binary's path in a JSON cache keyed by browser, platform and browser major version.
+    Later runs read the local browser version (a subprocess, no network) and use the
+    pinned binary. After the first call in a process, resolution costs nothing. With
+    ``offline`` set, or when the install fails, a cached binary or one on PATH is used.
+    Upgrading the browser to a new major version triggers one new install.
+    """
+
+    def __init__(self, cache_file: Optional[str] = None, offline: Optional[bool] = None):
+        self.cache_file = os.path.expanduser(cache_file or settings.driver_cache_file)
+        self.offline = settings.driver_offline if offline is None else offline
+        self._resolved: Dict[str, str] = {}
+        self._os_manager = OperationSystemManager()
+
+    def resolve(self, browser: str) -> str:
+        """Path to the driver binary for ``browser``"""
+        browser = browser.lower()
+        if browser not in self._resolved:
+            self._resolved[browser] = self._resolve(browser)
+        return self._resolved[browser]
+
+    def browser_version(self, browser: str) -> Optional[str]:
+        """Installed browser version read from the local system, or None if not found"""
+        for browser_type in BROWSERS[browser][0]:
+            version = self._os_manager.get_browser_version_from_os(browser_type)
+            if version:
+                return version
+        return None
+
+    def _key(self, browser: str, version: Optional[str]) -> str:
+        major = version.split(".")[0] if version else "unknown"
+        return f"{browser}-{self._os_manager.get_os_type()}-{major}"
+
+    def _resolve(self, browser: str) -> str:
+        if browser not in BROWSERS:
+            raise ValueError(f"Unsupported browser: {browser}")
+        if settings.driver_binary_path:
+            return settings.driver_binary_path
+        version = self.browser_version(browser)
+        key = self._key(browser, version)
+        cache = self._load()
+        entry = cache.get(key)
+        if entry and _is_executable(entry["path"]):
+            return entry["path"]
+        if not self.offline:
+            try:
+                path = BROWSERS[browser][2]().install()
+            except Exception as e:
+                fallback = self._fallback(browser, cache)
+                if fallback is None:
+                    raise DriverResolutionError(f"Could not install a driver for {browser}: {e}") from e
+                return fallback
+            self._store(key, {"path": path, "browser_version": version, "resolved_at": time.time()})
+            return path
+        fallback = self._fallback(browser, cache)
+        if fallback is None:
+            raise DriverResolutionError(
+                f"No cached driver for {browser} {version or '(version unknown)'} in {self.cache_file} "
+                f"and no {BROWSERS[browser][1]} on PATH; resolve once online or set DRIVER_BINARY_PATH"
+            )
+        return fallback
+
+    def _fallback(self, browser: str, cache: Dict[str, Dict]) -> Optional[str]:
+        """Most recently resolved binary for this browser and platform, else the one on PATH"""
+        prefix = self._key(browser, None)[:-len("unknown")]
+        entries = sorted((entry for key, entry in cache.items() if key.startswith(prefix)),
+                         key=lambda entry: -entry.get("resolved_at", 0))
+        for entry in entries:
+            if _is_executable(entry["path"]):
+                return entry["path"]
+        return shutil.which(BROWSERS[browser][1])
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, key: str, entry: Dict):
+        """Merge an entry into the cache file, replacing it atomically for concurrent workers"""
+        directory = os.path.dirname(self.cache_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        cache = self._load()
+        cache[key] = entry
+        descriptor, temporary = tempfile.mkstemp(dir=directory, prefix=".drivers-")
+        try:
+            with os.fdopen(descriptor, "w") as f:
+                json.dump(cache, f, indent=2)
+            os.replace(temporary, self.cache_file)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+def _is_executable(path: str) -> bool:
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+# Shared by every driver created in this process
+resolver = DriverResolver()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve and cache driver binaries, e.g. when building a CI image")
+    parser.add_argument("browsers", nargs="*", default=[settings.browser], choices=sorted(BROWSERS),
+                        help="Browsers to resolve drivers for")
+    args = parser.parse_args()
+    for browser in args.browsers:
+        print(f"{browser} {resolver.browser_version(browser) or '(version unknown)'}: {resolver.resolve(browser)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())